@@ -0,0 +1,19 @@
+import importlib
+
+# Agents are imported on first attribute access, so `import agents.director`
+# does not pull in every other agent.
+_EXPORTS = {
+    'ChartMaster': 'agents.chart_master',
+    'NewsHound': 'agents.news_hound',
+    'SignalPro': 'agents.signal_pro',
+    'Director': 'agents.director',
+}
+
+__all__ = ['ChartMaster', 'NewsHound', 'SignalPro', 'Director']
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -1,6 +0,0 @@
-from agents.chart_master import ChartMaster
-from agents.news_hound import NewsHound
-from agents.signal_pro import SignalPro
-from agents.director import Director
-
-__all__ = ['ChartMaster', 'NewsHound', 'SignalPro', 'Director']
\ No newline at end of file
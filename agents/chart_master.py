@@ -2,6 +2,29 @@ from interfaces.agent import IAgent, AgentInput, AgentOutput
 from datetime import datetime
 import re
 
+def _fmt(value, spec: str = '.2f', prefix: str = '') -> str:
+    """Format an optional indicator, falling back to N/A when the provider did not supply it"""
+    return f"{prefix}{value:{spec}}" if value is not None else "N/A"
+
+def _side(current: float, level) -> str:
+    if level is None: return "N/A"
+    return "Above" if current > level else "Below"
+
+def _alignment(timeframes: dict) -> str:
+    """Prompt section comparing the trend across bar sizes, or '' when only daily data exists"""
+    if not timeframes:
+        return ""
+    lines = [
+        f"- {tf}: {t.trend} | RSI {_fmt(t.rsi, '.1f')} | MACD Hist {_fmt(t.macd_histogram, '+.3f')} | "
+        f"vs SMA50: {_side(t.current, t.sma50)}"
+        for tf, t in timeframes.items()
+    ]
+    trends = [t.trend for t in timeframes.values()]
+    leader = max(trends, key=trends.count)
+    verdict = f"Aligned {leader}" if trends.count(leader) == len(trends) else "Mixed"
+    lines.append(f"- Alignment: {verdict} ({trends.count(leader)}/{len(trends)} {leader})")
+    return "\n=== TIMEFRAME ALIGNMENT ===\n" + "\n".join(lines) + "\n"
+
 class ChartMaster(IAgent):
     @property
     def name(self) -> str:
@@ -12,6 +35,22 @@ class ChartMaster(IAgent):
         from config import Config
         return Config.MODELS['fast']
     
+    screen_task = "technical bias from the indicator snapshot"
+    
+    def build_compact_block(self, agent_input: AgentInput) -> str:
+        tech = agent_input.technical_data
+        if not tech:
+            return None
+        volume_ratio = tech.volume / tech.volume_sma20 if tech.volume and tech.volume_sma20 else None
+        line = (f"Price {tech.symbol}{tech.current:.2f} | Trend {tech.trend} | RSI {_fmt(tech.rsi, '.1f')} | "
+                f"StochRSI {_fmt(tech.stoch_rsi, '.1f')} | MACD Hist {_fmt(tech.macd_histogram, '+.3f')} | "
+                f"BB Width {_fmt(tech.bb_width, '.1f')}% | vs SMA20 {_side(tech.current, tech.sma20)} | "
+                f"vs SMA50 {_side(tech.current, tech.sma50)} | Vol/Avg {_fmt(volume_ratio, '.1f')}x | "
+                f"S {tech.symbol}{tech.support:.2f} R {tech.symbol}{tech.resistance:.2f}")
+        if tech.timeframes:
+            line += " | TF " + ", ".join(f"{tf} {t.trend}" for tf, t in tech.timeframes.items())
+        return line
+    
     def build_prompt(self, agent_input: AgentInput) -> str:
         tech = agent_input.technical_data
         if not tech:
@@ -41,38 +80,45 @@ class ChartMaster(IAgent):
             if tech.stoch_rsi > 80: stoch_signal = "Overbought"
             elif tech.stoch_rsi < 20: stoch_signal = "Oversold"
         
+        rsi_zone = "N/A"
+        if tech.rsi is not None:
+            rsi_zone = "Overbought" if tech.rsi > 70 else "Oversold" if tech.rsi < 30 else "Neutral"
+        rsi = tech.rsi if tech.rsi is not None else 50
+        atr = tech.atr or 0
+        alignment = _alignment(tech.timeframes)
+        
         prompt = f"""ChartMaster Technical Analysis for {agent_input.ticker}
 
 === PRICE ACTION ===
 - Current Price: {tech.symbol}{tech.current:.2f} {tech.currency}
 - Support: {tech.symbol}{tech.support:.2f}
 - Resistance: {tech.symbol}{tech.resistance:.2f}
-- Daily Range (ATR): {tech.symbol}{tech.atr:.2f}
+- Daily Range (ATR): {_fmt(tech.atr, prefix=tech.symbol)}
 
 === MOVING AVERAGES ===
-- SMA20: {tech.symbol}{tech.sma20:.2f} | Price vs SMA20: {"Above" if tech.current > tech.sma20 else "Below"}
-- SMA50: {tech.symbol}{tech.sma50:.2f} | Price vs SMA50: {"Above" if tech.current > tech.sma50 else "Below"}
+- SMA20: {_fmt(tech.sma20, prefix=tech.symbol)} | Price vs SMA20: {_side(tech.current, tech.sma20)}
+- SMA50: {_fmt(tech.sma50, prefix=tech.symbol)} | Price vs SMA50: {_side(tech.current, tech.sma50)}
 - Trend: {tech.trend}
 
 === MOMENTUM INDICATORS ===
-- RSI (14): {tech.rsi:.1f} | {"Overbought" if tech.rsi > 70 else "Oversold" if tech.rsi < 30 else "Neutral"}
-- Stochastic RSI: {tech.stoch_rsi:.1f} | {stoch_signal}
-- MACD Line: {tech.macd_line:.3f} | Signal: {tech.macd_signal:.3f} | Histogram: {tech.macd_histogram:.3f}
+- RSI (14): {_fmt(tech.rsi, '.1f')} | {rsi_zone}
+- Stochastic RSI: {_fmt(tech.stoch_rsi, '.1f')} | {stoch_signal}
+- MACD Line: {_fmt(tech.macd_line, '.3f')} | Signal: {_fmt(tech.macd_signal, '.3f')} | Histogram: {_fmt(tech.macd_histogram, '.3f')}
 - MACD Signal: {macd_signal}
 
 === VOLATILITY INDICATORS ===
 - Bollinger Bands:
-  • Upper: {tech.symbol}{tech.bb_upper:.2f}
-  • Middle: {tech.symbol}{tech.bb_middle:.2f}
-  • Lower: {tech.symbol}{tech.bb_lower:.2f}
-  • Width: {tech.bb_width:.1f}% | Position: {bb_position}
-- ATR (14): {tech.symbol}{tech.atr:.2f}
+  • Upper: {_fmt(tech.bb_upper, prefix=tech.symbol)}
+  • Middle: {_fmt(tech.bb_middle, prefix=tech.symbol)}
+  • Lower: {_fmt(tech.bb_lower, prefix=tech.symbol)}
+  • Width: {_fmt(tech.bb_width, '.1f')}% | Position: {bb_position}
+- ATR (14): {_fmt(tech.atr, prefix=tech.symbol)}
 
 === VOLUME ANALYSIS ===
-- Current Volume: {tech.volume:,.0f}
-- 20-Day Avg Volume: {tech.volume_sma20:,.0f}
+- Current Volume: {_fmt(tech.volume, ',.0f')}
+- 20-Day Avg Volume: {_fmt(tech.volume_sma20, ',.0f')}
 - Volume Signal: {volume_signal}
-
+{alignment}
 === QUESTION ===
 {agent_input.question}
 
@@ -81,13 +127,13 @@ class ChartMaster(IAgent):
 [SUMMARY] One-line technical bias with key catalyst
 [KEY_SIGNALS]
 • Trend: {tech.trend}
-• Momentum: {"Bullish" if tech.rsi > 50 and macd_signal.startswith("Bullish") else "Bearish" if tech.rsi < 50 and macd_signal.startswith("Bearish") else "Neutral"}
+• Momentum: {"Bullish" if rsi > 50 and macd_signal.startswith("Bullish") else "Bearish" if rsi < 50 and macd_signal.startswith("Bearish") else "Neutral"}
 • Volatility: {"High" if tech.bb_width and tech.bb_width > 15 else "Low" if tech.bb_width and tech.bb_width < 5 else "Normal"}
-• Volume: {volume_signal}
+• Volume: {volume_signal}{chr(10) + "• Timeframes: one line on whether the timeframes agree" if alignment else ""}
 [TRADE_IDEAS]
 • Entry Zone: {tech.symbol}{max(tech.support, tech.bb_lower if tech.bb_lower else tech.support):.2f} - {tech.symbol}{min(tech.resistance, tech.bb_upper if tech.bb_upper else tech.resistance):.2f}
-• Stop Loss: {tech.symbol}{tech.support - tech.atr:.2f}
-• Target: {tech.symbol}{tech.resistance + tech.atr:.2f}
+• Stop Loss: {tech.symbol}{tech.support - atr:.2f}
+• Target: {tech.symbol}{tech.resistance + atr:.2f}
 [CONFIDENCE] 1-10"""
         return prompt
     
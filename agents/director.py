@@ -16,12 +16,14 @@ class Director(IAgent):
         chart = agent_input.context.get('chart_analysis', 'N/A')
         news = agent_input.context.get('news_analysis', 'N/A')
         signal = agent_input.context.get('signal_analysis', 'N/A')
+        portfolio = agent_input.context.get('portfolio_summary')
+        portfolio = f"\nPORTFOLIO (watchlist correlation, use for exposure/diversification questions):\n{portfolio}\n" if portfolio else ""
         return f"""Director Final Recommendation for {agent_input.ticker}
 
 CHARTMASTER: {chart[:400] if chart else 'N/A'}
 NEWSHOUND: {news[:400] if news else 'N/A'}
 SIGNALPRO: {signal[:400] if signal else 'N/A'}
-
+{portfolio}
 QUESTION: {agent_input.question}
 
 FORMAT EXACTLY:
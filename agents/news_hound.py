@@ -12,6 +12,14 @@ class NewsHound(IAgent):
         from config import Config
         return Config.MODELS['fast']
     
+    screen_task = "news sentiment and the key catalyst from the headlines"
+    
+    def build_compact_block(self, agent_input: AgentInput) -> str:
+        news = agent_input.news_data
+        if not news:
+            return None
+        return "\n".join(f"- {n.title} ({n.sentiment})" for n in news[:3])
+    
     def build_prompt(self, agent_input: AgentInput) -> str:
         news = agent_input.news_data
         if not news:
@@ -36,4 +44,6 @@ Date|Source|Headline|Sentiment
     def parse_response(self, response: str) -> AgentOutput:
         conf_match = re.search(r'\[CONFIDENCE\]\s*(\d+)', response, re.IGNORECASE)
         confidence = int(conf_match.group(1)) if conf_match else 5
-        return AgentOutput(agent_name=self.name, content=response, confidence=confidence, metadata={'type': 'news', 'articles': len(agent_input.news_data)}, success=True)
\ No newline at end of file
+        sources_match = re.search(r'\[SOURCES\]\s*(\d+)', response, re.IGNORECASE)
+        articles = int(sources_match.group(1)) if sources_match else 0
+        return AgentOutput(agent_name=self.name, content=response, confidence=confidence, metadata={'type': 'news', 'articles': articles}, success=True)
\ No newline at end of file
@@ -0,0 +1,3 @@
+from backtest.engine import run_backtest, BacktestResult
+
+__all__ = ['run_backtest', 'BacktestResult']
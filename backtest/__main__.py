@@ -0,0 +1,44 @@
+"""Backtest the technical rules on Yahoo history.
+
+    python -m backtest --tickers AAPL,MSFT,LLOY.L --period 10y --horizon 20
+    python -m backtest --tickers universe.txt --by-ticker results.csv
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m backtest', description="Replay trend and ChartMaster levels over history")
+    parser.add_argument('--tickers', required=True, help="Comma-separated tickers or a file with one per line")
+    parser.add_argument('--period', default=Config.BACKTEST_PERIOD)
+    parser.add_argument('--horizon', type=int, default=Config.BACKTEST_HORIZON, help="Bars before an open trade is closed")
+    parser.add_argument('--by-ticker', metavar='CSV', help="Write per-ticker, per-trend stats to CSV")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+    from main import parse_tickers
+    from connectors.yahoo import YahooConnector
+    from backtest.engine import run_backtest
+
+    tickers = parse_tickers(args.tickers)
+    print(f"📥 Downloading {args.period} of daily bars for {len(tickers)} ticker(s)...")
+    histories = YahooConnector().get_histories(tickers, period=args.period)
+    result = run_backtest(histories, args.horizon)
+
+    print(f"\n🧪 {result.tickers} tickers, {result.bars:,} scored bars, horizon {result.horizon} bars "
+          f"({result.elapsed:.2f}s)")
+    if result.skipped or len(histories) < len(tickers):
+        missing = sorted(set(tickers) - set(histories)) + result.skipped
+        print(f"⏭ Skipped (no or too little history): {', '.join(missing)}")
+    with pd.option_context('display.width', 160, 'display.max_columns', None, 'display.precision', 2):
+        print(result.summary)
+    if args.by_ticker:
+        result.by_ticker.to_csv(args.by_ticker)
+        print(f"💾 Per-ticker stats written to {args.by_ticker}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""Vectorized replay of the technical rules over OHLCV history.
+
+Signals are the same ones the live pipeline produces: the trend label
+from YahooConnector's trend scoring, and ChartMaster's trade levels
+(entry zone between support/lower band and resistance/upper band, stop
+at support - ATR, target at resistance + ATR). Every bar of every ticker
+is an event: a long entry at the close when price sits in the entry
+zone, resolved by whichever of stop or target is touched first within
+`horizon` bars, or closed at the horizon otherwise. Events overlap, so
+the numbers describe the signal, not a tradable portfolio.
+
+Indicators are computed on wide (date x ticker) frames and the forward
+scan is a loop over the horizon only, so the cost is horizon x dates x
+tickers numpy operations.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from connectors import indicators
+from core.market_hours import exchange_for
+
+TREND_LABELS = ('Bullish', 'Neutral', 'Bearish')
+
+@dataclass
+class BacktestResult:
+    summary: pd.DataFrame  # one row per trend label (plus 'All')
+    by_ticker: pd.DataFrame  # one row per ticker and trend label
+    horizon: int
+    tickers: int
+    bars: int
+    elapsed: float
+    skipped: List[str] = field(default_factory=list)
+
+def wide_frames(histories: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """{'Open': DataFrame(date x ticker), 'High': ..., ...} from per-ticker OHLCV frames"""
+    columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    # One concat aligns every ticker's dates; then each field is a column slice of the same block
+    combined = pd.concat([df[columns] for df in histories.values()], axis=1, keys=list(histories)).sort_index()
+    return {column: combined.xs(column, axis=1, level=1) for column in columns}
+
+def signals(wide: Dict[str, pd.DataFrame], window: int = 20) -> Dict[str, pd.DataFrame]:
+    """Per-bar trend score and ChartMaster levels, all date x ticker"""
+    close, high, low = wide['Close'], wide['High'], wide['Low']
+    sma20 = indicators.sma(close, 20)
+    sma50 = indicators.sma(close, 50)
+    rsi = indicators.rsi(close)
+    _, _, macd_hist = indicators.macd(close)
+    bb_upper, _, bb_lower, _ = indicators.bollinger(close)
+    atr = indicators.atr(high, low, close)
+    support = low.rolling(window).min()
+    resistance = high.rolling(window).max()
+    # NaN indicators (warm-up) compare False, so the score stays defined; those bars are dropped below
+    score = indicators.trend_score(close, sma20, sma50, macd_hist, rsi)
+    ready = sma50.notna() & rsi.notna() & atr.notna() & bb_upper.notna()
+    return {
+        'score': score.where(ready),
+        'entry_low': np.fmax(support, bb_lower),
+        'entry_high': np.fmin(resistance, bb_upper),
+        'stop': support - atr,
+        'target': resistance + atr,
+    }
+
+def _forward(values: np.ndarray, k: int) -> np.ndarray:
+    shifted = np.full_like(values, np.nan)
+    shifted[:-k] = values[k:]
+    return shifted
+
+def simulate(wide: Dict[str, pd.DataFrame], levels: Dict[str, pd.DataFrame], horizon: int) -> Dict[str, np.ndarray]:
+    close = wide['Close'].to_numpy(float)
+    high = wide['High'].to_numpy(float)
+    low = wide['Low'].to_numpy(float)
+    stop = levels['stop'].to_numpy(float)
+    target = levels['target'].to_numpy(float)
+    score = levels['score'].to_numpy(float)
+
+    exit_close = _forward(close, horizon)
+    in_zone = (close >= levels['entry_low'].to_numpy(float)) & (close <= levels['entry_high'].to_numpy(float))
+    # Only events with a full horizon of future bars are scored
+    valid = ~np.isnan(score) & ~np.isnan(exit_close) & ~np.isnan(stop) & ~np.isnan(target)
+
+    outcome = np.zeros(close.shape, dtype=np.int8)  # 1 target, -1 stop, 0 horizon
+    exit_price = exit_close.copy()
+    bars_held = np.full(close.shape, horizon, dtype=np.int16)
+    open_ = valid & in_zone
+    for k in range(1, horizon + 1):
+        future_low, future_high = _forward(low, k), _forward(high, k)
+        # Both touched in one bar: assume the stop came first
+        stopped = open_ & (future_low <= stop)
+        hit = open_ & ~stopped & (future_high >= target)
+        exit_price[stopped], outcome[stopped], bars_held[stopped] = stop[stopped], -1, k
+        exit_price[hit], outcome[hit], bars_held[hit] = target[hit], 1, k
+        open_ &= ~(stopped | hit)
+
+    return {
+        'score': score,
+        'valid': valid,
+        'traded': valid & in_zone,
+        'outcome': outcome,
+        'trade_return': exit_price / close - 1,
+        'bars_held': bars_held,
+        'forward_return': exit_close / close - 1,
+    }
+
+def _stats(sim: Dict[str, np.ndarray], mask: np.ndarray, axis=None) -> Dict[str, object]:
+    """Hit rates and returns over the events in mask; axis=0 gives one value per ticker column"""
+    traded = mask & sim['traded']
+    n = traded.sum(axis)
+    returns = np.where(traded, sim['trade_return'], np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN slices for tickers without trades
+        rate = lambda flags: (flags & traded).sum(axis) / n * 100
+        return {
+            'bars': mask.sum(axis),
+            'trades': n,
+            'target_rate': rate(sim['outcome'] == 1),
+            'stop_rate': rate(sim['outcome'] == -1),
+            'timeout_rate': rate(sim['outcome'] == 0),
+            'win_rate': rate(returns > 0),
+            'mean_return': np.nanmean(returns, axis) * 100,
+            'median_return': np.nanmedian(returns, axis) * 100,
+            'avg_bars_held': np.nanmean(np.where(traded, sim['bars_held'], np.nan), axis),
+            'forward_return': np.nanmean(np.where(mask, sim['forward_return'], np.nan), axis) * 100,
+        }
+
+def _label_masks(sim: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    score = np.nan_to_num(sim['score'], nan=-1)
+    valid = sim['valid']
+    return {
+        'Bullish': valid & (score >= 3),
+        'Neutral': valid & (score == 2),
+        'Bearish': valid & (score >= 0) & (score <= 1),
+        'All': valid,
+    }
+
+def run_backtest(histories: Dict[str, pd.DataFrame], horizon: int = None, min_bars: int = 100) -> BacktestResult:
+    """Replay the rules over {ticker: OHLCV frame}.
+
+    Tickers are grouped by exchange (from the suffix) so each wide frame
+    shares one trading calendar; mixing calendars would put NaN holes in
+    every rolling window.
+    """
+    from config import Config
+    horizon = horizon or Config.BACKTEST_HORIZON
+    started = time.perf_counter()
+    usable = {t: df for t, df in histories.items() if df['Close'].count() >= min_bars}
+    skipped = sorted(set(histories) - set(usable))
+
+    groups: Dict[str, Dict[str, pd.DataFrame]] = {}
+    for ticker, df in usable.items():
+        groups.setdefault(exchange_for(ticker).tz, {})[ticker] = df
+
+    by_ticker, sims, bars = [], [], 0
+    for group in groups.values():
+        wide = wide_frames(group)
+        sim = simulate(wide, signals(wide), horizon)
+        sims.append(sim)
+        bars += int(sim['valid'].sum())
+        for label, mask in _label_masks(sim).items():
+            frame = pd.DataFrame(_stats(sim, mask, axis=0), index=wide['Close'].columns)
+            by_ticker.append(frame.assign(trend=label))
+
+    # Overall stats pool the raw events of every group rather than averaging group averages
+    pooled = {key: np.concatenate([s[key].ravel() for s in sims]) for key in sims[0]} if sims else {}
+    pooled_masks = {label: np.concatenate([m[label].ravel() for m in map(_label_masks, sims)])
+                    for label in TREND_LABELS + ('All',)} if sims else {}
+    summary = pd.DataFrame([{'trend': label, **_stats(pooled, mask)} for label, mask in pooled_masks.items()])
+
+    return BacktestResult(
+        summary=summary.set_index('trend') if sims else summary,
+        by_ticker=pd.concat(by_ticker).rename_axis('ticker').set_index('trend', append=True) if sims else pd.DataFrame(),
+        horizon=horizon,
+        tickers=len(usable),
+        bars=bars,
+        elapsed=time.perf_counter() - started,
+        skipped=skipped,
+    )
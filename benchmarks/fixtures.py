@@ -0,0 +1,229 @@
+"""Recorded provider and LLM responses, and the patches that replay them offline.
+
+A fixture set holds:
+  histories    OHLCV frames per interval ('1d', '1h') and ticker
+  info         the yfinance .info fields the connectors read
+  http         response bodies by URL (Google News and RNS RSS searches)
+  ddgs         DuckDuckGo text results by query
+  completions  Groq completions keyed by the prompt's first line
+               ("ChartMaster Technical Analysis for AAPL")
+
+record.py writes a set to benchmarks/fixtures/; when that directory does
+not exist the suite uses a deterministic synthetic set instead, and the
+results say which one was used.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import ModuleType, SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+TICKERS = ['AAPL', 'MSFT', 'NVDA', 'LLOY.L', 'BARC.L', 'SAP.DE']
+HISTORIES = {'1d': '2y', '1h': '730d'}  # interval -> period recorded
+
+@dataclass
+class Fixtures:
+    kind: str
+    tickers: List[str]
+    histories: Dict[str, Dict[str, pd.DataFrame]] = field(default_factory=dict)
+    info: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    http: Dict[str, str] = field(default_factory=dict)
+    ddgs: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+    completions: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def digest(self) -> str:
+        """Content hash, so results are only compared across runs on the same fixtures"""
+        h = hashlib.sha256()
+        for interval in sorted(self.histories):
+            for ticker in sorted(self.histories[interval]):
+                h.update(pd.util.hash_pandas_object(self.histories[interval][ticker]).values.tobytes())
+        h.update(json.dumps([self.info, self.http, self.ddgs, self.completions], sort_keys=True).encode())
+        return h.hexdigest()[:12]
+
+    def save(self, directory: str = FIXTURE_DIR):
+        os.makedirs(os.path.join(directory, 'history'), exist_ok=True)
+        for interval, frames in self.histories.items():
+            for ticker, df in frames.items():
+                df.to_csv(os.path.join(directory, 'history', f"{ticker}_{interval}.csv"))
+        for name in ('info', 'http', 'ddgs', 'completions'):
+            with open(os.path.join(directory, f"{name}.json"), 'w', encoding='utf-8') as f:
+                json.dump(getattr(self, name), f, indent=1)
+        with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump({'kind': self.kind, 'tickers': self.tickers, 'recorded_at': time.time()}, f, indent=1)
+
+    @classmethod
+    def load(cls, directory: str = FIXTURE_DIR) -> 'Fixtures':
+        with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+        fixtures = cls(manifest['kind'], manifest['tickers'])
+        for interval in HISTORIES:
+            for ticker in fixtures.tickers:
+                path = os.path.join(directory, 'history', f"{ticker}_{interval}.csv")
+                if os.path.exists(path):
+                    df = pd.read_csv(path, index_col=0)
+                    df.index = pd.to_datetime(df.index, utc=True)
+                    fixtures.histories.setdefault(interval, {})[ticker] = df
+        for name in ('info', 'http', 'ddgs', 'completions'):
+            with open(os.path.join(directory, f"{name}.json"), encoding='utf-8') as f:
+                setattr(fixtures, name, json.load(f))
+        return fixtures
+
+def load_fixtures(directory: str = FIXTURE_DIR) -> Fixtures:
+    if os.path.exists(os.path.join(directory, 'manifest.json')):
+        return Fixtures.load(directory)
+    from benchmarks.record import record_synthetic
+    return record_synthetic()
+
+# --- replay ---
+
+class _ReplayTicker:
+    def __init__(self, fixtures: Fixtures, ticker: str):
+        self._fixtures = fixtures
+        self.ticker = ticker
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        return dict(self._fixtures.info.get(self.ticker, {}))
+
+    def history(self, period: str = '1mo', interval: str = '1d', **kwargs) -> pd.DataFrame:
+        df = self._fixtures.histories.get(interval, {}).get(self.ticker)
+        if df is None:
+            return pd.DataFrame()
+        return _tail_period(df, period, interval)
+
+class _ReplayYFinance:
+    """Stands in for the yfinance module inside connectors.yahoo"""
+
+    def __init__(self, fixtures: Fixtures):
+        self._fixtures = fixtures
+
+    def Ticker(self, ticker: str) -> _ReplayTicker:
+        return _ReplayTicker(self._fixtures, ticker)
+
+    def download(self, tickers, period: str = '1mo', interval: str = '1d', **kwargs) -> pd.DataFrame:
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {t: _tail_period(df, period, interval)
+                  for t, df in self._fixtures.histories.get(interval, {}).items() if t in tickers}
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+def _tail_period(df: pd.DataFrame, period: str, interval: str) -> pd.DataFrame:
+    match = re.fullmatch(r'(\d+)(d|mo|y)', period)
+    if not match or df.empty:
+        return df
+    days = int(match.group(1)) * {'d': 1, 'mo': 30, 'y': 365}[match.group(2)]
+    return df[df.index >= df.index[-1] - pd.Timedelta(days=days)]
+
+class _Response:
+    def __init__(self, url: str, body: Optional[str]):
+        self.url = url
+        self.status_code = 200 if body is not None else 404
+        self.text = body or ''
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} for {self.url}", response=self)
+
+class _ReplayDDGS:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+class _Completions:
+    def __init__(self, respond):
+        self._respond = respond
+
+    async def create(self, model: str, messages: List[Dict[str, str]], **kwargs):
+        content, usage = await self._respond(model, messages[-1]['content'])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(**usage),
+        )
+
+class ReplayClient:
+    """Minimal AsyncGroq look-alike: client.chat.completions.create(...)"""
+
+    def __init__(self, respond: Callable[[str, str], Awaitable[Tuple[str, Dict[str, int]]]]):
+        self.chat = SimpleNamespace(completions=_Completions(respond))
+
+def completion_key(prompt: str) -> str:
+    return prompt.strip().splitlines()[0] if prompt.strip() else ''
+
+@contextmanager
+def replay(fixtures: Fixtures, http_source: Callable[[str], Optional[str]] = None,
+           ddgs_source: Callable[[str], List[Dict[str, str]]] = None, llm_source=None):
+    """Patch yfinance, requests.get, DDGS and the Groq client to serve fixtures.
+
+    Each *_source, when given, is called on a fixture miss (live or
+    synthetic recording) and its answer is stored in the fixtures.
+    """
+    import connectors.yahoo as yahoo_module
+    import connectors.news as news_module
+    import core.llm as llm_module
+
+    def get(url: str, *args, **kwargs) -> _Response:
+        if url not in fixtures.http and http_source:
+            body = http_source(url)
+            if body is not None:
+                fixtures.http[url] = body
+        return _Response(url, fixtures.http.get(url))
+
+    class DDGS(_ReplayDDGS):
+        def text(self, query: str, max_results: int = 10, **kwargs):
+            if query not in fixtures.ddgs and ddgs_source:
+                fixtures.ddgs[query] = ddgs_source(query)
+            return list(fixtures.ddgs.get(query, []))[:max_results]
+
+    async def respond(model: str, prompt: str):
+        key = completion_key(prompt)
+        if key not in fixtures.completions and llm_source:
+            content, usage = await llm_source(model, prompt)
+            fixtures.completions[key] = {'content': content, 'usage': usage}
+        recorded = fixtures.completions.get(key) or _same_agent(fixtures, key)
+        if recorded is None:
+            raise LookupError(f"No recorded completion for '{key}'")
+        return recorded['content'], dict(recorded['usage'])
+
+    ddgs_module = ModuleType('ddgs')
+    ddgs_module.DDGS = DDGS
+    client = ReplayClient(respond)
+    saved = {
+        (yahoo_module, 'yf'): yahoo_module.yf,
+        (yahoo_module, 'time'): yahoo_module.time,
+        (news_module, 'requests'): news_module.requests,
+        (llm_module, 'get_client'): llm_module.get_client,
+    }
+    saved_ddgs = sys.modules.get('ddgs')
+    yahoo_module.yf = _ReplayYFinance(fixtures)
+    # The connectors' rate-limit sleeps would dominate every offline timing
+    yahoo_module.time = SimpleNamespace(sleep=lambda seconds: None, monotonic=time.monotonic, time=time.time)
+    news_module.requests = SimpleNamespace(get=get)
+    llm_module.get_client = lambda: client
+    sys.modules['ddgs'] = ddgs_module
+    try:
+        yield fixtures
+    finally:
+        for (module, name), value in saved.items():
+            setattr(module, name, value)
+        if saved_ddgs is None:
+            sys.modules.pop('ddgs', None)
+        else:
+            sys.modules['ddgs'] = saved_ddgs
+
+def _same_agent(fixtures: Fixtures, key: str) -> Optional[Dict[str, Any]]:
+    # A ticker without its own recording reuses another completion from the same agent
+    agent = key.split(' ', 1)[0]
+    return next((v for k, v in fixtures.completions.items() if k.split(' ', 1)[0] == agent), None)
@@ -0,0 +1,103 @@
+"""Cold-start import benchmark for the CLI.
+
+Runs each variant in fresh interpreters and reports the median wall time,
+plus the heaviest modules from `python -X importtime` for the last run.
+
+    python benchmarks/import_time.py [--base REV] [--runs 10] [--top 10] [--json out.json]
+
+Both variants are a plain `import main`: "before" in the tree at --base
+(checked out from git into a temporary directory; by default the commit
+just before the lazy registry, core/registry.py, was added), "after" in
+this working tree. Needs to run inside the git checkout.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENT = "import main"
+
+def default_base() -> str:
+    """Parent of the commit that introduced the lazy registry"""
+    added = subprocess.run(['git', 'log', '--format=%H', '--diff-filter=A', '-1', '--', 'core/registry.py'],
+                           cwd=ROOT, check=True, capture_output=True, text=True).stdout.strip()
+    if not added:
+        raise SystemExit("core/registry.py has no commit in this checkout; pass --base")
+    return added + '^'
+
+def export_tree(rev: str, directory: str):
+    """Write the tree at rev into directory, as `git archive` would"""
+    proc = subprocess.Popen(['git', 'archive', '--format=tar', rev], cwd=ROOT, stdout=subprocess.PIPE)
+    with tarfile.open(fileobj=proc.stdout, mode='r|') as tar:
+        # The 'data' filter (3.12, backported to 3.11.4) refuses paths outside directory
+        tar.extractall(directory, **({'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}))
+    if proc.wait() != 0:
+        raise SystemExit(f"git archive {rev} failed")
+
+def time_import(statement: str, cwd: str = ROOT) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', statement], cwd=cwd, check=True)
+    return time.perf_counter() - start
+
+def heaviest_imports(statement: str, top: int, cwd: str = ROOT):
+    """(cumulative microseconds, module) for the top-level imports that cost the most"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                          cwd=cwd, check=True, capture_output=True, text=True)
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented and already counted in their parent's total
+        name = name.rstrip()[1:]
+        if not name.startswith(' '):
+            entries.append((int(cumulative), name))
+    return sorted(entries, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base', metavar='REV', help="Git revision for the 'before' tree "
+                        "(default: the commit before core/registry.py was added)")
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--json', metavar='PATH', help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    base = args.base or default_base()
+    baseline = statistics.median(time_import('pass') for _ in range(args.runs))
+    results = {'interpreter_s': baseline, 'base': base}
+    with tempfile.TemporaryDirectory(prefix='import-time-') as before_tree:
+        export_tree(base, before_tree)
+        for variant, cwd in (('before', before_tree), ('after', ROOT)):
+            times = [time_import(STATEMENT, cwd) for _ in range(args.runs)]
+            heaviest = heaviest_imports(STATEMENT, args.top, cwd)
+            results[variant] = {
+                'median_s': statistics.median(times),
+                'min_s': min(times),
+                'heaviest': [{'module': name, 'cumulative_ms': us / 1000} for us, name in heaviest],
+            }
+
+    print(f"Interpreter start: {baseline * 1000:.0f} ms (median of {args.runs})")
+    print(f"before: main.py at {base}; after: this working tree")
+    for variant in ('before', 'after'):
+        stat = results[variant]
+        print(f"\n{variant}: {stat['median_s'] * 1000:.0f} ms median, "
+              f"{(stat['median_s'] - baseline) * 1000:.0f} ms over a bare interpreter")
+        for entry in stat['heaviest']:
+            print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+    speedup = results['before']['median_s'] / results['after']['median_s']
+    print(f"\nCold start is {speedup:.1f}x faster")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""Record (or synthesise) the fixtures the benchmark suite replays.
+
+    python benchmarks/record.py                 # live: Yahoo, Google News/RNS, DuckDuckGo, Groq
+    python benchmarks/record.py --synthetic     # deterministic offline stand-in
+    python benchmarks/record.py --tickers AAPL,LLOY.L --out benchmarks/fixtures
+
+Live recording needs network access and GROQ_API_KEY; each provider is
+called once per ticker through the real connectors and agents, with the
+responses captured on the way through.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import Fixtures, FIXTURE_DIR, TICKERS, HISTORIES, replay
+
+def capture_news_and_completions(fixtures: Fixtures, http_source, ddgs_source, llm_source):
+    """Drive every news path and the full pipeline once per ticker, storing what the sources return"""
+    from config import Config
+    from connectors.news import NewsConnector
+    from core import registry
+    from pipelines.full_analysis import FullAnalysisPipeline
+
+    with replay(fixtures, http_source, ddgs_source, llm_source), contextlib.redirect_stdout(io.StringIO()):
+        news = NewsConnector()
+        for ticker in fixtures.tickers:
+            # Each fetcher directly, so the fallbacks get recorded too
+            if ticker.endswith('.L'):
+                news._fetch_rns_news(ticker, 5)
+                news._fetch_rns_alternative(ticker, 5)
+            news._fetch_ddgs_news(ticker, 5)
+            news._fetch_google_news(ticker, 5)
+        pipeline = FullAnalysisPipeline(
+            [registry.connectors.create('yahoo'), registry.connectors.create('news')],
+            [registry.agents.create(name) for name in Config.DEFAULT_AGENTS],
+            None,
+        )
+
+        async def run_all():
+            for ticker in fixtures.tickers:
+                await pipeline.run(ticker, "Technical outlook")
+
+        asyncio.run(run_all())
+
+# --- live ---
+
+def record_live(tickers: List[str]) -> Fixtures:
+    import requests
+    import yfinance as yf
+    from core.llm import create_client
+
+    fixtures = Fixtures('recorded', tickers)
+    for interval, period in HISTORIES.items():
+        data = yf.download(tickers, period=period, interval=interval, group_by='ticker',
+                           auto_adjust=False, progress=False, threads=True)
+        for ticker in tickers:
+            df = data[ticker].dropna(subset=['Close']) if isinstance(data.columns, pd.MultiIndex) else data
+            if not df.empty:
+                fixtures.histories.setdefault(interval, {})[ticker] = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+    for ticker in tickers:
+        info = yf.Ticker(ticker).info
+        fixtures.info[ticker] = {k: info.get(k) for k in ('currency', 'regularMarketChangePercent')}
+
+    def http_source(url: str) -> Optional[str]:
+        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+        return response.text if response.status_code == 200 else None
+
+    def ddgs_source(query: str):
+        try:
+            from ddgs import DDGS
+        except ImportError:
+            from duckduckgo_search import DDGS
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=10))
+
+    client = create_client()
+
+    async def llm_source(model: str, prompt: str):
+        response = await client.chat.completions.create(
+            model=model, messages=[{"role": "user", "content": prompt}], temperature=0.2, max_tokens=1000)
+        usage = {'prompt_tokens': response.usage.prompt_tokens, 'completion_tokens': response.usage.completion_tokens}
+        return response.choices[0].message.content, usage
+
+    # The live DDGS import must not resolve to the replay stand-in
+    capture_news_and_completions(fixtures, http_source, _unpatched(ddgs_source), llm_source)
+    return fixtures
+
+def _unpatched(fn):
+    def call(*args):
+        saved = sys.modules.pop('ddgs', None)
+        try:
+            return fn(*args)
+        finally:
+            if saved is not None:
+                sys.modules['ddgs'] = saved
+    return call
+
+# --- synthetic ---
+
+_HEADLINES = [
+    "{name} shares rise after strong quarterly profit beat",
+    "{name} announces dividend increase and share buyback",
+    "Analysts upgrade {name} stock on growth outlook",
+    "{name} stock falls as bank warns on weak margins",
+    "{name} faces lawsuit over disclosure, shares decline",
+    "{name} trading update: earnings in line with guidance",
+    "Director dealings: {name} chairman buys shares",
+    "{name} completes acquisition of fintech rival",
+]
+_SOURCES = ['reuters.com', 'bloomberg.com', 'ft.com', 'cnbc.com', 'marketwatch.com', 'bbc.co.uk']
+
+def _synthetic_history(rng: np.random.Generator, ticker: str, interval: str, start_price: float) -> pd.DataFrame:
+    from core.market_hours import exchange_for
+    exchange = exchange_for(ticker)
+    end = pd.Timestamp('2026-09-30', tz=exchange.tz)
+    if interval == '1d':
+        index = pd.bdate_range(end=end.normalize(), periods=504, tz=exchange.tz) + pd.Timedelta(hours=exchange.open.hour)
+    else:
+        days = pd.bdate_range(end=end.normalize(), periods=504, tz=exchange.tz)
+        hours = range(exchange.open.hour, exchange.close.hour + (1 if exchange.close.minute else 0))
+        index = pd.DatetimeIndex([day + pd.Timedelta(hours=h) for day in days for h in hours])
+    steps = rng.normal(0.0004 if interval == '1d' else 0.00006, 0.018 if interval == '1d' else 0.006, len(index))
+    close = start_price * np.exp(np.cumsum(steps))
+    spread = np.abs(rng.normal(0, 0.008 if interval == '1d' else 0.003, len(index)))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + spread),
+        'Low': np.minimum(open_, close) * (1 - spread),
+        'Close': close,
+        'Volume': rng.integers(200_000, 5_000_000, len(index)).astype(float),
+    }, index=index.tz_convert('UTC'))
+
+def record_synthetic(tickers: List[str] = None, seed: int = 7) -> Fixtures:
+    from connectors.yahoo import currency_for
+    tickers = tickers or TICKERS
+    rng = np.random.default_rng(seed)
+    fixtures = Fixtures('synthetic', tickers)
+    for ticker in tickers:
+        start = float(rng.uniform(40, 400))
+        for interval in HISTORIES:
+            fixtures.histories.setdefault(interval, {})[ticker] = _synthetic_history(rng, ticker, interval, start)
+        fixtures.info[ticker] = {'currency': currency_for(ticker), 'regularMarketChangePercent': float(rng.normal(0, 1.5))}
+
+    def name_in(text: str) -> str:
+        from urllib.parse import unquote_plus
+        text = unquote_plus(text)
+        return next((t.split('.')[0] for t in tickers if t.split('.')[0] in text), 'Market')
+
+    def http_source(url: str) -> str:
+        name = name_in(url)
+        items = []
+        for i in range(20):
+            headline = _HEADLINES[(i + len(url)) % len(_HEADLINES)].format(name=name)
+            if 'RNS' in url:
+                headline += " - RNS"
+            items.append(f"<item><title>{headline}</title><link>https://www.{_SOURCES[i % len(_SOURCES)]}/story/{i}</link>"
+                         f"<pubDate>Mon, {1 + i % 28:02d} Sep 2026 08:{i:02d}:00 GMT</pubDate>"
+                         f"<description>{headline}. Full story.</description></item>")
+        return f"<?xml version=\"1.0\"?><rss><channel><title>{name}</title>{''.join(items)}</channel></rss>"
+
+    def ddgs_source(query: str):
+        name = name_in(query)
+        return [{'title': _HEADLINES[i % len(_HEADLINES)].format(name=name),
+                 'href': f"https://www.{_SOURCES[i % len(_SOURCES)]}/markets/{name.lower()}-{i}",
+                 'body': _HEADLINES[(i + 3) % len(_HEADLINES)].format(name=name)} for i in range(10)]
+
+    async def llm_source(model: str, prompt: str):
+        agent = prompt.split(' ', 1)[0]
+        content = {
+            'ChartMaster': "[SUMMARY] Uptrend intact above SMA50; momentum cooling\n[KEY_SIGNALS]\n• Trend: Bullish\n"
+                           "[TRADE_IDEAS]\n• Entry on pullback to support\n[CONFIDENCE] 7",
+            'NewsHound': "[SUMMARY] Headlines mildly positive on earnings and buyback\n[SENTIMENT] Bullish\n[CONFIDENCE] 6",
+            'SignalPro': "[SUMMARY] Modest long bias\nSignal: Buy\nConfidence: 6\nDONE",
+            'Director': "=== DIRECTOR ANSWER ===\nAnswer: Hold - trend positive but extended\nWhy: Technicals and news "
+                        "agree, entry not ideal\nConfidence: 6/10\nTop Risk: Pullback to support",
+        }.get(agent, "[SUMMARY] n/a\n[CONFIDENCE] 5")
+        return content, {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(content) // 4}
+
+    capture_news_and_completions(fixtures, http_source, ddgs_source, llm_source)
+    return fixtures
+
+def main():
+    parser = argparse.ArgumentParser(description="Record benchmark fixtures")
+    parser.add_argument('--tickers', default=','.join(TICKERS))
+    parser.add_argument('--synthetic', action='store_true', help="Generate deterministic fixtures without network")
+    parser.add_argument('--out', default=FIXTURE_DIR)
+    args = parser.parse_args()
+    tickers = [t.strip() for t in args.tickers.split(',') if t.strip()]
+    fixtures = record_synthetic(tickers) if args.synthetic else record_live(tickers)
+    fixtures.save(args.out)
+    print(f"💾 {fixtures.kind} fixtures for {len(tickers)} tickers in {args.out} "
+          f"({len(fixtures.http)} feeds, {len(fixtures.ddgs)} searches, {len(fixtures.completions)} completions, "
+          f"digest {fixtures.digest()})")
+
+if __name__ == '__main__':
+    main()
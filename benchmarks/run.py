@@ -0,0 +1,270 @@
+"""Offline benchmark suite.
+
+    python benchmarks/run.py                       # writes benchmarks/results/<commit>.json
+    python benchmarks/run.py --compare benchmarks/results/abc1234.json
+    python benchmarks/run.py --universe 2000 --repeat 5 --llm-latency 0.2
+
+Replays the fixtures from benchmarks/fixtures (see record.py; a
+deterministic synthetic set is used when none are recorded) through
+YahooConnector, NewsConnector, the four agents and FullAnalysisPipeline
+with yfinance, HTTP, DuckDuckGo and Groq patched out, and measures:
+
+  indicators  technicals_from_history per ticker and the vectorized wide
+              frame path, in tickers/sec over a universe built by
+              cycling the recorded histories
+  feeds       Google News / RNS RSS parsing, feeds/sec and items/sec
+  connectors  get_technicals / get_news latency
+  pipeline    per-stage latency (p50/p95/mean ms) from core.metrics spans
+  memory      tracemalloc peak per section and process max RSS
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import Fixtures, load_fixtures, replay, FIXTURE_DIR
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def git_commit() -> str:
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {'n': len(ordered), 'p50_ms': pick(0.5) * 1000, 'p95_ms': pick(0.95) * 1000,
+            'mean_ms': statistics.fmean(ordered) * 1000}
+
+def section(fn: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+    """Run one benchmark quietly for timings, then again under tracemalloc for its peak allocation.
+
+    Two passes because tracemalloc's per-allocation hook would distort the timings.
+    """
+    out: Dict[str, Any] = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(out)
+        tracemalloc.start()
+        try:
+            fn({})
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    out['peak_mb'] = round(peak / 1e6, 2)
+    return out
+
+def bench_indicators(fixtures: Fixtures, universe: int, out: Dict[str, Any]):
+    from connectors.yahoo import technicals_from_history, currency_for
+    from backtest.engine import signals, wide_frames
+    recorded = fixtures.histories['1d']
+    names = list(recorded)
+    histories = {f"{names[i % len(names)]}#{i}": recorded[names[i % len(names)]] for i in range(universe)}
+
+    started = time.perf_counter()
+    for name, df in histories.items():
+        ticker = name.split('#')[0]
+        technicals_from_history(ticker, df, currency_for(ticker))
+    per_ticker = time.perf_counter() - started
+
+    # Every recorded ticker shares one calendar after normalising to dates, so one wide frame covers all
+    dated = {name: df.set_axis(df.index.normalize()) for name, df in histories.items()}
+    started = time.perf_counter()
+    signals(wide_frames(dated))
+    vectorized = time.perf_counter() - started
+
+    out.update({
+        'tickers': universe,
+        'bars_per_ticker': int(statistics.median(len(df) for df in recorded.values())),
+        'per_ticker_tickers_per_sec': round(universe / per_ticker, 1),
+        'vectorized_tickers_per_sec': round(universe / vectorized, 1),
+    })
+
+def bench_feeds(fixtures: Fixtures, repeat: int, out: Dict[str, Any]):
+    from connectors.news import NewsConnector
+    news = NewsConnector()
+    fetchers = [(news._fetch_google_news, t) for t in fixtures.tickers]
+    fetchers += [(news._fetch_rns_news, t) for t in fixtures.tickers if t.endswith('.L')]
+    feeds = items = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for fetch, ticker in fetchers:
+            items += len(fetch(ticker, 20))
+            feeds += 1
+    elapsed = time.perf_counter() - started
+    body_bytes = sum(len(body) for body in fixtures.http.values()) / max(len(fixtures.http), 1)
+    out.update({
+        'feeds': feeds,
+        'feeds_per_sec': round(feeds / elapsed, 1),
+        'items_per_sec': round(items / elapsed, 1),
+        'avg_feed_kb': round(body_bytes / 1024, 1),
+    })
+
+def bench_connectors(fixtures: Fixtures, repeat: int, out: Dict[str, Any]):
+    from connectors.yahoo import YahooConnector
+    from connectors.news import NewsConnector
+    timings = defaultdict(list)
+    for _ in range(repeat):
+        # Fresh instances each round, so the history cache does not turn this into a dict lookup
+        yahoo, news = YahooConnector(), NewsConnector()
+        for ticker in fixtures.tickers:
+            for name, call in (('yahoo.get_technicals', lambda: yahoo.get_technicals(ticker)),
+                               ('yahoo.get_price', lambda: yahoo.get_price(ticker)),
+                               ('news.get_news', lambda: news.get_news(ticker, 5))):
+                started = time.perf_counter()
+                call()
+                timings[name].append(time.perf_counter() - started)
+    out.update({name: percentiles(samples) for name, samples in timings.items()})
+
+def bench_pipeline(fixtures: Fixtures, repeat: int, out: Dict[str, Any]):
+    from config import Config
+    from core import registry
+    from core.metrics import metrics
+    from pipelines.full_analysis import FullAnalysisPipeline
+
+    stages = defaultdict(list)
+
+    def listener(event: str, record: Dict[str, Any]):
+        if event == 'end':
+            labels = record['labels']
+            label = labels.get('agent') or '.'.join(filter(None, (labels.get('provider'), labels.get('op'))))
+            stages[record['stage'] + (f"[{label}]" if label else '')].append(record['duration'])
+
+    async def run_all():
+        for _ in range(repeat):
+            pipeline = FullAnalysisPipeline(
+                [registry.connectors.create(name) for name in Config.DEFAULT_CONNECTORS],
+                [registry.agents.create(name) for name in Config.DEFAULT_AGENTS],
+                None,
+            )
+            for ticker in fixtures.tickers:
+                result = await pipeline.run(ticker, "Technical outlook")
+                if not result.success:
+                    raise RuntimeError(f"Replay failed for {ticker}: {result.error}")
+
+    metrics.add_listener(listener)
+    try:
+        started = time.perf_counter()
+        asyncio.run(run_all())
+        elapsed = time.perf_counter() - started
+    finally:
+        metrics.remove_listener(listener)
+    runs = repeat * len(fixtures.tickers)
+    out.update({
+        'runs': runs,
+        'runs_per_sec': round(runs / elapsed, 2),
+        'stages': {stage: percentiles(samples) for stage, samples in sorted(stages.items())},
+    })
+
+def with_llm_latency(fixtures: Fixtures, latency: float):
+    """Wrap replayed completions with a fixed delay, to model network-bound runs"""
+    if not latency:
+        return None
+    async def source(model, prompt):
+        await asyncio.sleep(latency)
+        from benchmarks.fixtures import completion_key, _same_agent
+        recorded = fixtures.completions.get(completion_key(prompt)) or _same_agent(fixtures, completion_key(prompt))
+        return recorded['content'], dict(recorded['usage'])
+    return source
+
+def run_suite(fixtures: Fixtures, universe: int, repeat: int, llm_latency: float) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with replay(fixtures):
+        results['indicators'] = section(lambda out: bench_indicators(fixtures, universe, out))
+        results['feeds'] = section(lambda out: bench_feeds(fixtures, repeat * 20, out))
+        results['connectors'] = section(lambda out: bench_connectors(fixtures, repeat, out))
+    latency_source = with_llm_latency(fixtures, llm_latency)
+    # A latency source needs misses to reach it, so it gets an empty completion table to fill
+    pipeline_fixtures = fixtures if not latency_source else Fixtures(
+        fixtures.kind, fixtures.tickers, fixtures.histories, fixtures.info, fixtures.http, fixtures.ddgs, {})
+    with replay(pipeline_fixtures, llm_source=latency_source):
+        results['pipeline'] = section(lambda out: bench_pipeline(pipeline_fixtures, repeat, out))
+    results['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return results
+
+def flatten(data: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]):
+    if current['fixtures'] != baseline['fixtures']:
+        print(f"⚠️ Fixture sets differ ({baseline['fixtures']} vs {current['fixtures']}); deltas are not comparable")
+    new, old = flatten(current['results']), flatten(baseline['results'])
+    print(f"\n{'metric':60} {baseline['commit']:>14} {current['commit']:>14} {'change':>9}")
+    for key in sorted(new.keys() & old.keys()):
+        if key.endswith('.n') or not old[key]:
+            continue
+        change = (new[key] - old[key]) / old[key] * 100
+        print(f"{key:60} {old[key]:14.2f} {new[key]:14.2f} {change:+8.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    parser.add_argument('--universe', type=int, default=500, help="Tickers for the indicator throughput test")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="Seconds added to every replayed completion")
+    parser.add_argument('--out', help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', metavar='JSON', help="Print deltas against an earlier results file")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    commit = git_commit()
+    print(f"🏁 Benchmarking {commit} on {fixtures.kind} fixtures ({fixtures.digest()})")
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'fixtures': {'kind': fixtures.kind, 'digest': fixtures.digest(), 'tickers': fixtures.tickers},
+        'params': {'universe': args.universe, 'repeat': args.repeat, 'llm_latency': args.llm_latency},
+        'results': run_suite(fixtures, args.universe, args.repeat, args.llm_latency),
+    }
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    results = report['results']
+    print(f"📈 Indicators: {results['indicators']['per_ticker_tickers_per_sec']} tickers/s per ticker, "
+          f"{results['indicators']['vectorized_tickers_per_sec']} tickers/s vectorized")
+    print(f"📰 Feeds: {results['feeds']['feeds_per_sec']} feeds/s, {results['feeds']['items_per_sec']} items/s")
+    print(f"🔁 Pipeline: {results['pipeline']['runs_per_sec']} runs/s")
+    for stage, stat in results['pipeline']['stages'].items():
+        print(f"  {stage:40} p50 {stat['p50_ms']:8.2f} ms  p95 {stat['p95_ms']:8.2f} ms")
+    print(f"💾 Peak memory: " + ', '.join(f"{k} {v['peak_mb']} MB" for k, v in results.items() if isinstance(v, dict))
+          + f"; max RSS {results['max_rss_mb']} MB")
+    print(f"Results written to {out}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+if __name__ == '__main__':
+    main()
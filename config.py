@@ -14,9 +14,86 @@ class Config:
         "smart": "llama-3.3-70b-versatile"
     }
     
+    # Registry names (see core.registry), resolved and imported only when a pipeline is built
+    DEFAULT_CONNECTORS = ["yahoo", "news"]
+    DEFAULT_AGENTS = ["chart_master", "news_hound", "signal_pro", "director"]
+    
+    # Bar sizes YahooConnector derives from one download (5m/15m/30m cap history at 60 days); empty = daily only
+    TIMEFRAMES = [t.strip() for t in os.getenv("STOCK_AI_TIMEFRAMES", "1h,1d,1wk").split(",") if t.strip()]
+    
     MAX_RETRIES = 3
     RETRY_DELAY = 2
     REQUESTS_PER_MINUTE = 30
+    BATCH_CONCURRENCY = 3  # tickers analysed at once by main.py --batch
+    
+    # Screening mode (pipelines.screening): many tickers per fast-model request
+    SCREEN_AGENTS = ["chart_master", "news_hound"]
+    SCREEN_TOKEN_BUDGET = 5000  # estimated prompt + completion tokens per batched request
+    SCREEN_TOKENS_PER_TICKER = 70  # completion tokens reserved for each ticker's entry
+    SCREEN_MAX_BATCH = 25  # tickers per request, whatever the budget allows
+    
+    RUN_DEADLINE = float(os.getenv("STOCK_AI_DEADLINE", "180"))  # seconds per analysis, 0 for no limit
+    # Relative shares of the run deadline; unlisted agents weigh like 'agent'
+    DEADLINE_WEIGHTS = {"data": 2.0, "agent": 1.0, "SignalPro": 1.5, "Director": 2.0}
+    
+    QUOTE_CACHE_TTL = 30  # seconds a fetched quote page is reused
+    TECHNICALS_CACHE_TTL = 300  # seconds Streamlit reuses price/technicals across sessions
+    NEWS_CACHE_TTL = 900  # seconds Streamlit reuses news across sessions
+    HISTORY_CACHE_TTL = 600  # seconds YahooConnector reuses downloaded OHLCV histories
+    
+    HEALTH_WINDOW = 50  # recent calls kept per provider operation
+    CIRCUIT_BREAKER_THRESHOLD = 5  # consecutive failures before skipping a provider
+    CIRCUIT_BREAKER_COOLDOWN = 60  # seconds before a skipped provider is retried
+    
+    CHANGE_GATE = os.getenv("STOCK_AI_CHANGE_GATE", "1") != "0"  # reuse agent outputs when inputs barely moved
+    GATE_PRICE_MOVE_PCT = 1.0  # price move since an agent's last run that triggers a re-run
+    GATE_RSI_POINTS = 5.0  # RSI change that triggers a re-run (zone crossings always do)
+    GATE_NEW_HEADLINES = 1  # unseen headlines that trigger a news re-run
+    GATE_MAX_AGE = 6 * 3600  # seconds before a stored output is re-run regardless
+    
+    TRACE_FILE = os.getenv("STOCK_AI_TRACE_FILE", "")  # JSONL span trace, disabled when empty
+    METRICS_PORT = int(os.getenv("STOCK_AI_METRICS_PORT", "0"))  # Prometheus /metrics, disabled when 0
+    
+    OUTPUT_SINK = os.getenv("STOCK_AI_OUTPUT_SINK", "")  # e.g. sqlite:results.db, jsonl:results.jsonl
+    SINK_BATCH_SIZE = 50  # records per background flush
+    SINK_FLUSH_INTERVAL = 2.0  # seconds between background flushes
+    
+    SERVICE_HOST = os.getenv("STOCK_AI_SERVICE_HOST", "127.0.0.1")
+    SERVICE_PORT = int(os.getenv("STOCK_AI_SERVICE_PORT", "8765"))
+    SERVICE_CONCURRENCY = 3  # analyses running at once in --serve mode
+    SERVICE_QUEUE_SIZE = 20  # analyses waiting for a slot before the API answers 503
+    SERVICE_WAIT_TIMEOUT = 120  # seconds a {"wait": true} request blocks
+    WATCHLIST = [t.strip() for t in os.getenv("STOCK_AI_WATCHLIST", "").split(",") if t.strip()]
+    WATCHLIST_QUESTION = "Technical outlook"
+    WATCHLIST_REFRESH_INTERVAL = 900  # seconds between refreshes while a ticker's exchange is open
+    WATCHLIST_CHECK_INTERVAL = 60  # seconds between schedule checks
+    
+    # Watchlist correlation/beta/cluster summary given to Director; disabled when the watchlist is empty
+    PORTFOLIO_CONTEXT = os.getenv("STOCK_AI_PORTFOLIO_CONTEXT", "1") == "1"
+    PORTFOLIO_BENCHMARK = os.getenv("STOCK_AI_BENCHMARK", "^GSPC")  # index the betas are measured against
+    PORTFOLIO_WINDOW = 60  # daily returns in the rolling correlation window
+    PORTFOLIO_PERIOD = "6mo"  # history downloaded to seed the window
+    PORTFOLIO_CLUSTER_CORR = 0.6  # average correlation at which names are grouped into one cluster
+    
+    # Ticker -> company name, exchange, aliases and headline exclusion terms (core.symbols)
+    SYMBOLS_PATH = os.getenv("STOCK_AI_SYMBOLS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "symbols.csv"))
+    
+    SNAPSHOT_DIR = os.getenv("STOCK_AI_SNAPSHOT_DIR", "")  # columnar technicals/news/outputs history, disabled when empty
+    
+    BACKTEST_PERIOD = "10y"  # history replayed by python -m backtest
+    BACKTEST_HORIZON = 20  # bars a backtest trade may stay open
+    
+    JOB_QUEUE_PATH = os.getenv("STOCK_AI_JOB_QUEUE", "jobs.db")
+    JOB_LEASE_SECONDS = 300  # a job whose worker stops heartbeating is reclaimed after this
+    JOB_MAX_ATTEMPTS = 3  # claims (including crashed runs) before a job is marked failed
+    JOB_RETRY_DELAY = 30.0  # seconds before a failed job is retried, doubling with each attempt
+    JOB_POLL_INTERVAL = 2.0  # seconds an idle worker waits before polling again
+    JOB_VERBOSE = os.getenv("STOCK_AI_JOB_VERBOSE", "0") == "1"  # show pipeline output from worker processes
+    
+    GOOGLE_CREDENTIALS_FILE = os.getenv("GOOGLE_CREDENTIALS_FILE", "credentials.json")
+    SHEETS_WORKSHEET = os.getenv("SHEETS_WORKSHEET", "Analyses")
+    SHEETS_BATCH_SIZE = 500  # rows per range update
+    SHEETS_WRITES_PER_MINUTE = 60  # Sheets API per-user write quota
     
     @classmethod
     def validate(cls) -> bool:
@@ -0,0 +1,19 @@
+import importlib
+
+# Connectors are imported on first attribute access: YahooConnector pulls in
+# yfinance and pandas, which should not be paid for by `import connectors.news`.
+_EXPORTS = {
+    'YahooConnector': 'connectors.yahoo',
+    'GoogleFinanceConnector': 'connectors.google_finance',
+    'NewsConnector': 'connectors.news',
+    'MonitoredProvider': 'connectors.health',
+}
+
+__all__ = ['YahooConnector', 'GoogleFinanceConnector', 'NewsConnector', 'MonitoredProvider']
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
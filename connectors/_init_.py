@@ -1,5 +0,0 @@
-from connectors.yahoo import YahooConnector
-from connectors.google_finance import GoogleFinanceConnector
-from connectors.news import NewsConnector
-
-__all__ = ['YahooConnector', 'GoogleFinanceConnector', 'NewsConnector']
\ No newline at end of file
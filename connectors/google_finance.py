@@ -1,88 +1,183 @@
 from interfaces.data_provider import IDataProvider, PriceData, TechnicalData, NewsItem
-from typing import Optional, List
+from core.metrics import metrics
+from core.market_hours import split_suffix
+from typing import Optional, List, Dict, Tuple
+from dataclasses import dataclass
 import requests
 from datetime import datetime, timezone
+import threading
+import time
 import re
 
+# Quote page patterns, compiled once at import instead of on every fetch
+_PRICE_PATTERNS = (
+    re.compile(r'data-last-price="([\d.]+)"'),
+    re.compile(r'["\']price["\']:\s*["\']?([\d.]+)["\']?'),
+)
+_CURRENCY_PATTERNS = (
+    re.compile(r'data-currency-code="([A-Za-z]{3})"'),
+    re.compile(r'["\']currency["\']:\s*["\']?([A-Za-z]{3})["\']?'),
+)
+
+def _stat_pattern(label: str) -> re.Pattern:
+    # Stat rows render as <div>Label</div> ... <div class="P6K39c">value</div>
+    return re.compile(r'>\s*' + label + r'\s*<.{0,600}?class="P6K39c"[^>]*>([^<]+)<', re.DOTALL)
+
+_PREV_CLOSE = _stat_pattern('Previous close')
+_DAY_RANGE = _stat_pattern('Day range')
+_YEAR_RANGE = _stat_pattern('Year range')
+_VOLUME = _stat_pattern('(?<!Avg )Volume')  # today's volume; the "Avg Volume" row is a different stat
+_NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?|\.\d+')
+_SCALED_NUMBER = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([KMBT]?)')
+_SCALE = {'': 1, 'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+
+@dataclass
+class _Quote:
+    price: float
+    currency: str
+    previous_close: Optional[float] = None
+    day_low: Optional[float] = None
+    day_high: Optional[float] = None
+    year_low: Optional[float] = None
+    year_high: Optional[float] = None
+    volume: Optional[float] = None
+
+def _parse_number(text: str) -> Optional[float]:
+    match = _NUMBER.search(text)
+    return float(match.group(0).replace(',', '')) if match else None
+
+def _parse_range(text: str) -> Tuple[Optional[float], Optional[float]]:
+    values = [float(v.replace(',', '')) for v in _NUMBER.findall(text)]
+    if len(values) < 2:
+        return None, None
+    return min(values[0], values[1]), max(values[0], values[1])
+
+def _parse_volume(text: str) -> Optional[float]:
+    match = _SCALED_NUMBER.search(text)
+    if not match:
+        return None
+    return float(match.group(1).replace(',', '')) * _SCALE[match.group(2)]
+
+def parse_quote_page(html: str) -> Optional[_Quote]:
+    """Parse a Google Finance quote page into a _Quote, or None if no price is present"""
+    price_match = next((m for m in (p.search(html) for p in _PRICE_PATTERNS) if m), None)
+    if not price_match:
+        return None
+    currency_match = next((m for m in (p.search(html) for p in _CURRENCY_PATTERNS) if m), None)
+    quote = _Quote(price=float(price_match.group(1)), currency=currency_match.group(1) if currency_match else 'USD')
+
+    prev_match = _PREV_CLOSE.search(html)
+    if prev_match:
+        quote.previous_close = _parse_number(prev_match.group(1))
+    day_match = _DAY_RANGE.search(html)
+    if day_match:
+        quote.day_low, quote.day_high = _parse_range(day_match.group(1))
+    year_match = _YEAR_RANGE.search(html)
+    if year_match:
+        quote.year_low, quote.year_high = _parse_range(year_match.group(1))
+    volume_match = _VOLUME.search(html)
+    if volume_match:
+        quote.volume = _parse_volume(volume_match.group(1))
+
+    # London quotes are in pence (GBX / GBp)
+    if quote.currency in ('GBp', 'GBX'):
+        for field in ('price', 'previous_close', 'day_low', 'day_high', 'year_low', 'year_high'):
+            value = getattr(quote, field)
+            if value is not None:
+                setattr(quote, field, value / 100)
+        quote.currency = 'GBP'
+    return quote
+
 class GoogleFinanceConnector(IDataProvider):
-    def __init__(self):
+    def __init__(self, cache_ttl: Optional[float] = None):
+        from config import Config
         self.base_url = "https://www.google.com/finance"
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
-    
+        self.cache_ttl = Config.QUOTE_CACHE_TTL if cache_ttl is None else cache_ttl
+        self._quote_cache: Dict[str, Tuple[float, _Quote]] = {}
+        self._cache_lock = threading.Lock()
+
     def is_available(self) -> bool:
-        try:
-            response = self.session.get(self.base_url, timeout=5)
-            return response.status_code == 200
-        except:
-            return False
-    
+        # Health is tracked passively from real calls (see connectors.health)
+        return True
+
     def _get_exchange_prefix(self, ticker: str) -> str:
-        exchange_map = {
-            '.L': 'LON:', '.TO': 'TSE:', '.DE': 'ETR:',
-            '.PA': 'EPA:', '.HK': 'HKG:', '.T': 'TYO:',
-        }
-        for suffix, prefix in exchange_map.items():
-            if ticker.endswith(suffix):
-                return prefix + ticker.replace(suffix, '')
-        return ticker
-    
+        symbol, exchange = split_suffix(ticker)
+        return f"{exchange.code}:{symbol}" if exchange.code else ticker
+
+    def _get_quote(self, ticker: str) -> Optional[_Quote]:
+        """Fetch and parse the quote page once per ticker, reusing it for cache_ttl seconds"""
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._quote_cache.get(ticker)
+        if cached and now - cached[0] < self.cache_ttl:
+            metrics.incr('cache_requests_total', cache='google_quote', result='hit')
+            return cached[1]
+        metrics.incr('cache_requests_total', cache='google_quote', result='miss')
+
+        symbol = self._get_exchange_prefix(ticker)
+        response = self.session.get(f"{self.base_url}/quote/{symbol}", timeout=10)
+        if response.status_code == 404:
+            return None  # unknown symbol: an empty answer, not a provider failure
+        response.raise_for_status()
+
+        quote = parse_quote_page(response.text)
+        if quote:
+            with self._cache_lock:
+                self._quote_cache[ticker] = (now, quote)
+        return quote
+
     def get_price(self, ticker: str) -> Optional[PriceData]:
         try:
-            symbol = self._get_exchange_prefix(ticker)
-            url = f"{self.base_url}/quote/{symbol}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code != 200:
+            quote = self._get_quote(ticker)
+            if not quote:
                 return None
-            
-            html = response.text
-            price_match = re.search(r'["\']price["\']:\s*["\']?([\d.]+)["\']?', html)
-            currency_match = re.search(r'["\']currency["\']:\s*["\']?([A-Z]{3})["\']?', html)
-            
-            if not price_match:
-                return None
-            
-            price = float(price_match.group(1))
-            currency = currency_match.group(1) if currency_match else 'USD'
-            
-            if currency == 'GBp':
-                price = price / 100
-                currency = 'GBP'
-            
+
+            change_pct = None
+            if quote.previous_close:
+                change_pct = (quote.price - quote.previous_close) / quote.previous_close * 100
+
             return PriceData(
                 ticker=ticker,
-                price=price,
-                currency=currency,
-                timestamp=datetime.now(timezone.utc).isoformat()
+                price=quote.price,
+                currency=quote.currency,
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                change_pct=change_pct,
+                previous_close=quote.previous_close,
+                day_low=quote.day_low,
+                day_high=quote.day_high,
+                year_low=quote.year_low,
+                year_high=quote.year_high,
+                volume=quote.volume
             )
         except Exception as e:
             print(f"Google Finance price error: {e}")
-            return None
-    
+            raise
+
     def get_technicals(self, ticker: str) -> Optional[TechnicalData]:
-        price_data = self.get_price(ticker)
-        if not price_data:
+        """Quote-page snapshot only: indicators the page does not show are left as None"""
+        try:
+            quote = self._get_quote(ticker)
+        except Exception as e:
+            print(f"Google Finance technicals error: {e}")
+            raise
+        if not quote:
             return None
-        
-        current = price_data.price
-        sma20 = current * 0.98
-        sma50 = current * 0.95
-        rsi = 50
-        trend = 'Bullish' if current > sma50 else 'Bearish'
-        
+
         return TechnicalData(
             ticker=ticker,
-            current=current,
-            sma20=sma20,
-            sma50=sma50,
-            rsi=rsi,
-            trend=trend,
-            support=current * 0.95,
-            resistance=current * 1.05,
-            currency=price_data.currency,
-            symbol='£' if price_data.currency == 'GBP' else '$'
+            current=quote.price,
+            sma20=None,
+            sma50=None,
+            rsi=None,
+            trend='Neutral',
+            support=quote.day_low if quote.day_low is not None else quote.price,
+            resistance=quote.day_high if quote.day_high is not None else quote.price,
+            currency=quote.currency,
+            symbol='£' if quote.currency == 'GBP' else '$',
+            volume=quote.volume
         )
-    
+
     def get_news(self, ticker: str, max_items: int = 5) -> List[NewsItem]:
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,160 @@
+from interfaces.data_provider import IDataProvider, PriceData, TechnicalData, NewsItem
+from typing import Optional, List, Dict, Any, Callable
+from collections import deque
+from core import singleflight
+from core.metrics import metrics
+import statistics
+import threading
+import time
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+class ProviderHealth:
+    """Rolling success/latency statistics and a circuit breaker for one provider operation.
+
+    Only a call that raises counts as a failure; an empty answer (no
+    headlines, too little history) is a success, so obscure tickers do not
+    open the breaker for everyone else. After
+    failure_threshold consecutive failures the breaker opens and calls are
+    skipped for cooldown seconds; the first call after that is a half-open
+    trial that either closes the breaker again or re-opens it.
+    """
+
+    def __init__(self, window: int, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._outcomes = deque(maxlen=window)
+        self._latencies = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record(self, ok: bool, latency: float):
+        with self._lock:
+            self._outcomes.append(ok)
+            self._trial_in_flight = False
+            if ok:
+                self._latencies.append(latency)
+                self._consecutive_failures = 0
+                self._opened_at = None
+                return
+            self._consecutive_failures += 1
+            if self._opened_at is not None or self._consecutive_failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        with self._lock:
+            outcomes = list(self._outcomes)
+        return sum(outcomes) / len(outcomes) if outcomes else None
+
+    @property
+    def latencies(self) -> List[float]:
+        with self._lock:
+            return list(self._latencies)
+
+    @property
+    def p50(self) -> Optional[float]:
+        latencies = self.latencies
+        return statistics.median(latencies) if latencies else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = len(self._outcomes)
+        return {'state': self.state, 'calls': calls, 'success_rate': self.success_rate, 'p50': self.p50}
+
+class MonitoredProvider(IDataProvider):
+    """Wraps an IDataProvider with passive health tracking per operation.
+
+    Nothing is probed: statistics come from the real calls the pipeline
+    makes, and an operation whose breaker is open is skipped without
+    touching the network.
+    """
+
+    OPERATIONS = ('price', 'technicals', 'news')
+
+    def __init__(self, provider: IDataProvider, window: Optional[int] = None,
+                 failure_threshold: Optional[int] = None, cooldown: Optional[float] = None):
+        from config import Config
+        self.provider = provider
+        self.health = {
+            op: ProviderHealth(
+                window or Config.HEALTH_WINDOW,
+                failure_threshold or Config.CIRCUIT_BREAKER_THRESHOLD,
+                Config.CIRCUIT_BREAKER_COOLDOWN if cooldown is None else cooldown
+            )
+            for op in self.OPERATIONS
+        }
+
+    @property
+    def name(self) -> str:
+        return getattr(self.provider, 'name', self.provider.__class__.__name__)
+
+    @property
+    def p50_latency(self) -> Optional[float]:
+        """Median latency of recent successful calls across all operations"""
+        latencies = [l for health in self.health.values() for l in health.latencies]
+        return statistics.median(latencies) if latencies else None
+
+    def op_latency(self, op: str) -> Optional[float]:
+        """Median latency of recent successful calls for one operation"""
+        return self.health[op].p50
+    
+    def op_available(self, op: str) -> bool:
+        return self.health[op].state != OPEN
+    
+    def _call(self, op: str, fn: Callable, empty, *key):
+        # Identical concurrent calls (same provider, operation and arguments) share one fetch
+        return singleflight.group('provider').do((self.name, op) + key, lambda: self._tracked(op, fn, empty, key[0]))
+
+    def _tracked(self, op: str, fn: Callable, empty, ticker: str):
+        health = self.health[op]
+        if not health.allow():
+            metrics.incr('provider_skipped_total', provider=self.name, op=op)
+            return empty
+        with metrics.span('provider', provider=self.name, op=op) as span:
+            span['ticker'] = ticker
+            start = time.perf_counter()
+            try:
+                result = fn()
+            except Exception:
+                health.record(False, time.perf_counter() - start)
+                raise
+            health.record(True, time.perf_counter() - start)
+            span['empty'] = not result
+            return result
+
+    def is_available(self) -> bool:
+        return any(health.state != OPEN for health in self.health.values())
+
+    def get_price(self, ticker: str) -> Optional[PriceData]:
+        return self._call('price', lambda: self.provider.get_price(ticker), None, ticker)
+
+    def get_technicals(self, ticker: str) -> Optional[TechnicalData]:
+        return self._call('technicals', lambda: self.provider.get_technicals(ticker), None, ticker)
+
+    def get_news(self, ticker: str, max_items: int = 5) -> List[NewsItem]:
+        return self._call('news', lambda: self.provider.get_news(ticker, max_items=max_items), [], ticker, max_items)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'provider': self.name, 'p50': self.p50_latency,
+                **{op: health.snapshot() for op, health in self.health.items()}}
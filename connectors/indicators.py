@@ -0,0 +1,64 @@
+"""Indicator math shared by YahooConnector, the watchlist and the backtester.
+
+Every function works column-wise, so it accepts a single price Series or a
+wide DataFrame (one column per ticker) and returns the same shape.
+"""
+import numpy as np
+import pandas as pd
+
+def sma(close, window: int):
+    return close.rolling(window).mean()
+
+def rsi(close, window: int = 14):
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window).mean()
+    loss = -delta.where(delta < 0, 0).rolling(window).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9):
+    line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    signal_line = line.ewm(span=signal, adjust=False).mean()
+    return line, signal_line, line - signal_line
+
+def bollinger(close, window: int = 20, width: float = 2):
+    middle = close.rolling(window).mean()
+    std = close.rolling(window).std()
+    upper = middle + std * width
+    lower = middle - std * width
+    return upper, middle, lower, (upper - lower) / middle * 100
+
+def atr(high, low, close, window: int = 14):
+    prev_close = close.shift()
+    # fmax skips the NaN of the first bar's previous close, like a row-wise max
+    ranges = np.fmax(np.fmax(high - low, (high - prev_close).abs()), (low - prev_close).abs())
+    return ranges.rolling(window).mean()
+
+def stoch_rsi(rsi_values, window: int = 14):
+    rsi_min = rsi_values.rolling(window).min()
+    rsi_max = rsi_values.rolling(window).max()
+    return 100 * (rsi_values - rsi_min) / (rsi_max - rsi_min)
+
+def trend_score(current, sma20, sma50, macd_hist, rsi_values):
+    """Number of bullish signals (0-4): above SMA50, above SMA20, MACD histogram > 0, RSI > 50"""
+    return (_as_int(current > sma50) + _as_int(current > sma20)
+            + _as_int(macd_hist > 0) + _as_int(rsi_values > 50))
+
+def _as_int(flags):
+    return flags.astype(int) if hasattr(flags, 'astype') else int(flags)
+
+def trend_label(score: int) -> str:
+    return 'Bullish' if score >= 3 else 'Bearish' if score <= 1 else 'Neutral'
+
+def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Append the indicator columns used by TechnicalData to a single-ticker OHLCV frame"""
+    df = df.copy()
+    df['SMA20'] = sma(df['Close'], 20)
+    df['SMA50'] = sma(df['Close'], 50)
+    df['RSI'] = rsi(df['Close'])
+    df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = macd(df['Close'])
+    df['BB_Upper'], df['BB_Middle'], df['BB_Lower'], df['BB_Width'] = bollinger(df['Close'])
+    df['Volume_SMA20'] = sma(df['Volume'], 20)
+    df['ATR'] = atr(df['High'], df['Low'], df['Close'])
+    df['Stoch_RSI'] = stoch_rsi(df['RSI'])
+    return df
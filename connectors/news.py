@@ -1,6 +1,8 @@
 from interfaces.data_provider import IDataProvider, NewsItem
+from core import symbols
 from typing import List, Optional
 from datetime import datetime
+from urllib.parse import quote_plus
 import requests
 import re
 
@@ -18,95 +20,89 @@ class NewsConnector(IDataProvider):
         return None
     
     def get_news(self, ticker: str, max_items: int = 5) -> List[NewsItem]:
-        """Fetch news with RNS priority for UK stocks"""
-        if ticker.endswith(".L"):
+        """Fetch news with RNS priority for UK stocks.
+
+        A source that answers with nothing falls through to the next; only
+        when every source tried raised does this raise too, so provider
+        health sees an outage but not a ticker that simply has no headlines.
+        """
+        sources = [("RNS", "RNS announcements", self._fetch_rns_news)] if ticker.endswith(".L") else []
+        sources += [("DuckDuckGo", "news via DuckDuckGo", self._fetch_ddgs_news),
+                    ("Google News", "news via Google News", self._fetch_google_news)]
+        errors, answered = [], 0
+        for name, found, fetch in sources:
             try:
-                news = self._fetch_rns_news(ticker, max_items)
-                if news:
-                    print(f"✓ Found {len(news)} RNS announcements for {ticker}")
-                    return news
+                news = fetch(ticker, max_items)
             except Exception as e:
-                print(f"RNS failed for {ticker}: {e}")
-        
-        try:
-            news = self._fetch_ddgs_news(ticker, max_items)
-            if news:
-                print(f"✓ Found {len(news)} news via DuckDuckGo for {ticker}")
-                return news
-        except Exception as e:
-            print(f"DuckDuckGo failed for {ticker}: {e}")
-        
-        try:
-            news = self._fetch_google_news(ticker, max_items)
+                print(f"{name} failed for {ticker}: {e}")
+                errors.append(e)
+                continue
+            if news is None:
+                continue  # source not installed
+            answered += 1
             if news:
-                print(f"✓ Found {len(news)} news via Google News for {ticker}")
+                print(f"✓ Found {len(news)} {found} for {ticker}")
                 return news
-        except Exception as e:
-            print(f"Google News failed for {ticker}: {e}")
         
+        if errors and not answered:
+            raise errors[-1]
         print(f"⚠️ No news found for {ticker}")
         return []
     
     def _fetch_rns_news(self, ticker: str, max_items: int) -> List[NewsItem]:
-        try:
-            clean_ticker = ticker.replace(".L", "")
-            rns_query = f"{clean_ticker} RNS site:rns-pdf.londonstockexchange.com"
-            rss_url = f"https://news.google.com/rss/search?q={rns_query}&hl=en-GB&gl=GB&ceid=GB:en"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(rss_url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                return self._fetch_rns_alternative(ticker, max_items)
-            
-            items = re.findall(r'<item>(.*?)</item>', response.text, re.DOTALL)
-            if not items:
-                return self._fetch_rns_alternative(ticker, max_items)
-            
-            news_items = []
-            for item in items[:max_items]:
-                title_match = re.search(r'<title>(.*?)</title>', item)
-                link_match = re.search(r'<link>(.*?)</link>', item)
-                date_match = re.search(r'<pubDate>(.*?)</pubDate>', item)
-                if title_match:
-                    title = re.sub(r'\s*-\s*RNS.*$', '', title_match.group(1).strip(), flags=re.IGNORECASE)
-                    link = link_match.group(1).strip() if link_match else ''
-                    date = date_match.group(1).strip() if date_match else datetime.now().strftime("%Y-%m-%d")
-                    ann_type = self._classify_rns_announcement(title)
-                    news_items.append(NewsItem(
-                        title=f"[{ann_type}] {title[:80]}",
-                        source="RNS/LSE",
-                        date=date,
-                        url=link,
-                        sentiment=self._analyze_rns_sentiment(title)
-                    ))
-            return news_items
-        except Exception as e:
-            return []
+        symbol = symbols.lookup(ticker)
+        company = f'"{symbol.name}"' if symbol else ticker.replace(".L", "")
+        rns_query = f"{company} RNS site:rns-pdf.londonstockexchange.com"
+        rss_url = f"https://news.google.com/rss/search?q={quote_plus(rns_query)}&hl=en-GB&gl=GB&ceid=GB:en"
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        response = requests.get(rss_url, headers=headers, timeout=10)
+        if response.status_code != 200:
+            return self._fetch_rns_alternative(ticker, max_items)
+        
+        items = re.findall(r'<item>(.*?)</item>', response.text, re.DOTALL)
+        if not items:
+            return self._fetch_rns_alternative(ticker, max_items)
+        
+        news_items = []
+        for item in items[:max_items]:
+            title_match = re.search(r'<title>(.*?)</title>', item)
+            link_match = re.search(r'<link>(.*?)</link>', item)
+            date_match = re.search(r'<pubDate>(.*?)</pubDate>', item)
+            if title_match:
+                title = re.sub(r'\s*-\s*RNS.*$', '', title_match.group(1).strip(), flags=re.IGNORECASE)
+                link = link_match.group(1).strip() if link_match else ''
+                date = date_match.group(1).strip() if date_match else datetime.now().strftime("%Y-%m-%d")
+                ann_type = self._classify_rns_announcement(title)
+                news_items.append(NewsItem(
+                    title=f"[{ann_type}] {title[:80]}",
+                    source="RNS/LSE",
+                    date=date,
+                    url=link,
+                    sentiment=self._analyze_rns_sentiment(title)
+                ))
+        return news_items
     
     def _fetch_rns_alternative(self, ticker: str, max_items: int) -> List[NewsItem]:
-        try:
-            clean_ticker = ticker.replace(".L", "")
-            company_names = {"LLOY": "Lloyds Banking Group", "BARC": "Barclays", "HSBA": "HSBC Holdings"}
-            company_name = company_names.get(clean_ticker, clean_ticker)
-            query = f"{company_name} RNS announcement regulatory news"
-            rss_url = f"https://news.google.com/rss/search?q={query}&hl=en-GB&gl=GB&ceid=GB:en"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(rss_url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                return []
-            items = re.findall(r'<item>(.*?)</item>', response.text, re.DOTALL)
-            news_items = []
-            for item in items[:max_items]:
-                title_match = re.search(r'<title>(.*?)</title>', item)
-                link_match = re.search(r'<link>(.*?)</link>', item)
-                date_match = re.search(r'<pubDate>(.*?)</pubDate>', item)
-                if title_match:
-                    title = title_match.group(1).strip()[:100]
-                    link = link_match.group(1).strip() if link_match else ''
-                    date = date_match.group(1).strip() if date_match else datetime.now().strftime("%Y-%m-%d")
-                    news_items.append(NewsItem(title=f"[RNS] {title}", source="RNS/LSE", date=date, url=link, sentiment=self._analyze_rns_sentiment(title)))
-            return news_items
-        except:
-            return []
+        symbol = symbols.lookup(ticker)
+        company_name = symbol.name if symbol else ticker.replace(".L", "")
+        query = f"{company_name} RNS announcement regulatory news"
+        # Directory names can contain '&' (Marks & Spencer), so the query is encoded
+        rss_url = f"https://news.google.com/rss/search?q={quote_plus(query)}&hl=en-GB&gl=GB&ceid=GB:en"
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        response = requests.get(rss_url, headers=headers, timeout=10)
+        response.raise_for_status()
+        items = re.findall(r'<item>(.*?)</item>', response.text, re.DOTALL)
+        news_items = []
+        for item in items[:max_items]:
+            title_match = re.search(r'<title>(.*?)</title>', item)
+            link_match = re.search(r'<link>(.*?)</link>', item)
+            date_match = re.search(r'<pubDate>(.*?)</pubDate>', item)
+            if title_match:
+                title = title_match.group(1).strip()[:100]
+                link = link_match.group(1).strip() if link_match else ''
+                date = date_match.group(1).strip() if date_match else datetime.now().strftime("%Y-%m-%d")
+                news_items.append(NewsItem(title=f"[RNS] {title}", source="RNS/LSE", date=date, url=link, sentiment=self._analyze_rns_sentiment(title)))
+        return news_items
     
     def _classify_rns_announcement(self, title: str) -> str:
         title_lower = title.lower()
@@ -127,71 +123,61 @@ class NewsConnector(IDataProvider):
         elif neg_count > pos_count: return 'Bearish'
         return 'Neutral'
     
-    def _fetch_ddgs_news(self, ticker: str, max_items: int) -> List[NewsItem]:
-        try:
-            try: from ddgs import DDGS
-            except ImportError: from duckduckgo_search import DDGS
-            with DDGS() as ddgs:
-                query = self._build_search_query(ticker)
-                results = list(ddgs.text(query, max_results=self.max_results))
-                if not results: return []
-                news_items = []
-                for item in results[:max_items]:
-                    title = item.get('title', '')[:100]
-                    href = item.get('href', '')
-                    body = item.get('body', '')
-                    source = self._extract_source(href)
-                    sentiment = self._analyze_sentiment(body)
-                    news_items.append(NewsItem(title=title, source=source, date=datetime.now().strftime("%Y-%m-%d"), url=href, sentiment=sentiment))
-                return news_items
-        except: return []
-    
-    def _fetch_google_news(self, ticker: str, max_items: int) -> List[NewsItem]:
-        try:
+    def _fetch_ddgs_news(self, ticker: str, max_items: int) -> Optional[List[NewsItem]]:
+        try: from ddgs import DDGS
+        except ImportError:
+            try: from duckduckgo_search import DDGS
+            except ImportError: return None
+        with DDGS() as ddgs:
             query = self._build_search_query(ticker)
-            rss_url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(rss_url, headers=headers, timeout=10)
-            if response.status_code != 200: return []
-            items = re.findall(r'<item>(.*?)</item>', response.text, re.DOTALL)
-            if not items: return []
-            exclude_keywords = self._get_exclude_keywords(ticker)
-            include_keywords = self._get_include_keywords(ticker)
+            results = list(ddgs.text(query, max_results=self.max_results))
+            if not results: return []
             news_items = []
-            for item in items[:max_items * 3]:
-                title_match = re.search(r'<title>(.*?)</title>', item)
-                link_match = re.search(r'<link>(.*?)</link>', item)
-                date_match = re.search(r'<pubDate>(.*?)</pubDate>', item)
-                if not title_match: continue
-                title = title_match.group(1).strip()
-                title_lower = title.lower()
-                if any(kw in title_lower for kw in exclude_keywords): continue
-                if include_keywords and not any(kw in title_lower for kw in include_keywords): continue
-                link = link_match.group(1).strip() if link_match else ''
-                date = date_match.group(1).strip() if date_match else datetime.now().strftime("%Y-%m-%d")
-                source = self._extract_source(link)
-                news_items.append(NewsItem(title=title[:100], source=source, date=date, url=link, sentiment=self._analyze_sentiment(title)))
-                if len(news_items) >= max_items: break
+            for item in results[:max_items]:
+                title = item.get('title', '')[:100]
+                href = item.get('href', '')
+                body = item.get('body', '')
+                source = self._extract_source(href)
+                sentiment = self._analyze_sentiment(body)
+                news_items.append(NewsItem(title=title, source=source, date=datetime.now().strftime("%Y-%m-%d"), url=href, sentiment=sentiment))
             return news_items
-        except: return []
+    
+    def _fetch_google_news(self, ticker: str, max_items: int) -> List[NewsItem]:
+        query = self._build_search_query(ticker)
+        rss_url = f"https://news.google.com/rss/search?q={quote_plus(query)}&hl=en-US&gl=US&ceid=US:en"
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        response = requests.get(rss_url, headers=headers, timeout=10)
+        response.raise_for_status()
+        items = re.findall(r'<item>(.*?)</item>', response.text, re.DOTALL)
+        if not items: return []
+        symbol = symbols.lookup(ticker)
+        # A headline for a known company should name it; unknown tickers keep every result
+        exclude = symbol.exclude_pattern if symbol else None
+        include = symbol.mention_pattern if symbol else None
+        news_items = []
+        for item in items[:max_items * 3]:
+            title_match = re.search(r'<title>(.*?)</title>', item)
+            link_match = re.search(r'<link>(.*?)</link>', item)
+            date_match = re.search(r'<pubDate>(.*?)</pubDate>', item)
+            if not title_match: continue
+            title = title_match.group(1).strip()
+            if exclude and exclude.search(title): continue
+            if include and not include.search(title): continue
+            link = link_match.group(1).strip() if link_match else ''
+            date = date_match.group(1).strip() if date_match else datetime.now().strftime("%Y-%m-%d")
+            source = self._extract_source(link)
+            news_items.append(NewsItem(title=title[:100], source=source, date=date, url=link, sentiment=self._analyze_sentiment(title)))
+            if len(news_items) >= max_items: break
+        return news_items
     
     def _build_search_query(self, ticker: str) -> str:
-        ticker_queries = {"LLOY.L": "Lloyds Banking Group stock", "BARC.L": "Barclays bank stock", "HSBA.L": "HSBC Holdings stock"}
-        if ticker in ticker_queries: return ticker_queries[ticker]
+        symbol = symbols.lookup(ticker)
+        if symbol: return f"{symbol.name} stock"
         is_uk = ticker.endswith(".L")
         clean_ticker = ticker.replace(".L", "")
         if is_uk: return f"{clean_ticker} London Stock Exchange stock"
         else: return f"{ticker} stock news"
     
-    def _get_exclude_keywords(self, ticker: str) -> List[str]:
-        exclude_map = {"LLOY.L": ['hapag-lloyd', 'jamie lloyd', 'lloyd webber', 'shipping', 'theater']}
-        return exclude_map.get(ticker, [])
-    
-    def _get_include_keywords(self, ticker: str) -> List[str]:
-        financial_tickers = ["LLOY.L", "BARC.L", "HSBA.L"]
-        if ticker in financial_tickers: return ['bank', 'banking', 'shares', 'stock', 'earnings', 'profit', 'dividend']
-        return []
-    
     def _extract_source(self, url: str) -> str:
         if not url or '/' not in url: return "Unknown"
         try:
@@ -1,24 +1,109 @@
 from interfaces.data_provider import IDataProvider, PriceData, TechnicalData, NewsItem
-from typing import Optional, List
+from connectors.indicators import add_indicators, trend_score, trend_label
+from core.market_hours import exchange_for
+from typing import Optional, List, Dict
 import yfinance as yf
 import pandas as pd
+from dataclasses import replace
 from datetime import datetime, timezone
+import threading
 import time
 
+_SUFFIX_CURRENCY = {'.L': 'GBp', '.TO': 'CAD', '.DE': 'EUR', '.PA': 'EUR', '.HK': 'HKD', '.T': 'JPY'}
+
+def currency_for(ticker: str) -> str:
+    """Quote currency implied by the exchange suffix, for when .info is too costly to fetch"""
+    for suffix, currency in _SUFFIX_CURRENCY.items():
+        if ticker.endswith(suffix):
+            return currency
+    return 'USD'
+
+def technicals_from_history(ticker: str, df: pd.DataFrame, currency: str) -> TechnicalData:
+    """Build TechnicalData from the latest bar of an OHLCV frame (prices in Yahoo's quote currency)"""
+    df = add_indicators(df)
+    convert = lambda v: v / 100 if currency == 'GBp' else v
+    last = df.iloc[-1]
+    
+    current = convert(float(last['Close']))
+    sma20 = convert(float(last['SMA20']))
+    sma50 = convert(float(last['SMA50']))
+    rsi = float(last['RSI'])
+    macd_hist = float(last['MACD_Hist'])
+    
+    return TechnicalData(
+        ticker=ticker,
+        current=current,
+        sma20=sma20,
+        sma50=sma50,
+        rsi=rsi,
+        trend=trend_label(trend_score(current, sma20, sma50, macd_hist, rsi)),
+        support=convert(float(df['Low'].tail(20).min())),
+        resistance=convert(float(df['High'].tail(20).max())),
+        currency='GBP' if currency == 'GBp' else currency,
+        symbol='£' if currency == 'GBp' else '$',
+        macd_line=float(last['MACD']),
+        macd_signal=float(last['MACD_Signal']),
+        macd_histogram=macd_hist,
+        bb_upper=convert(float(last['BB_Upper'])),
+        bb_middle=convert(float(last['BB_Middle'])),
+        bb_lower=convert(float(last['BB_Lower'])),
+        bb_width=float(last['BB_Width']),
+        volume=float(last['Volume']),
+        volume_sma20=float(last['Volume_SMA20']),
+        atr=convert(float(last['ATR'])),
+        stoch_rsi=float(last['Stoch_RSI'])
+    )
+
+# Timeframe -> pandas resample rule
+TIMEFRAME_RULES = {
+    '5m': '5min', '15m': '15min', '30m': '30min', '1h': '1h', '4h': '4h', '1d': '1D', '1wk': 'W-FRI',
+}
+# Downloadable base interval (finest first) -> longest period Yahoo serves at that interval
+BASE_PERIODS = {'5m': '60d', '15m': '60d', '30m': '60d', '1h': '730d', '1d': '2y'}
+_RESAMPLED_FROM = {'4h': '1h', '1wk': '1d'}
+# Served from Yahoo's daily bars, so daily volume and adjustments match get_histories and the backtester
+DAILY_TIMEFRAMES = ('1d', '1wk')
+_OHLCV_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+def base_interval(timeframes: List[str]) -> Optional[str]:
+    """Coarsest intraday download every requested intraday timeframe can be resampled from, or None"""
+    needed = {_RESAMPLED_FROM.get(tf, tf) for tf in timeframes if tf not in DAILY_TIMEFRAMES}
+    return next((interval for interval in BASE_PERIODS if interval in needed), None)
+
+def resample_ohlcv(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    # Bins without trades (nights, weekends) come back empty and are dropped
+    return df[list(_OHLCV_AGG)].resample(rule).agg(_OHLCV_AGG).dropna(subset=['Close'])
+
+def multi_timeframe(ticker: str, df: pd.DataFrame, currency: str, timeframes: List[str],
+                    base: str) -> Dict[str, TechnicalData]:
+    """TechnicalData per timeframe, all resampled from one base-interval frame.
+
+    Timeframes with fewer than 50 bars (not enough for SMA50) are left out,
+    e.g. 4h bars when the base is 5m and Yahoo only serves 60 days.
+    """
+    if df.index.tz is not None:
+        # Bin days and weeks on the exchange's local calendar, not UTC
+        df = df.tz_convert(exchange_for(ticker).tz)
+    result = {}
+    for timeframe in timeframes:
+        frame = df if timeframe == base else resample_ohlcv(df, TIMEFRAME_RULES[timeframe])
+        if len(frame) >= 50:
+            result[timeframe] = technicals_from_history(ticker, frame, currency)
+    return result
+
 class YahooConnector(IDataProvider):
-    def __init__(self):
+    def __init__(self, timeframes: Optional[List[str]] = None):
+        from config import Config
         self._cache = {}
-        self._last_check = None
+        self._cache_lock = threading.Lock()
+        self.timeframes = list(Config.TIMEFRAMES if timeframes is None else timeframes)
+        unknown = set(self.timeframes) - set(TIMEFRAME_RULES)
+        if unknown:
+            raise ValueError(f"Unknown timeframe(s): {', '.join(sorted(unknown))}")
     
     def is_available(self) -> bool:
-        try:
-            stock = yf.Ticker("AAPL")
-            info = stock.info
-            self._last_check = datetime.now()
-            return bool(info)
-        except Exception as e:
-            print(f"Yahoo availability check failed: {e}")
-            return False
+        # Health is tracked passively from real calls (see connectors.health)
+        return True
     
     def get_price(self, ticker: str) -> Optional[PriceData]:
         try:
@@ -46,117 +131,90 @@ class YahooConnector(IDataProvider):
                 change_pct=float(info.get('regularMarketChangePercent', 0))
             )
         except Exception as e:
+            # Raised so provider health counts it; an empty history above is an answer, not a failure
             print(f"Yahoo price error for {ticker}: {e}")
-            return None
+            raise
     
     def get_technicals(self, ticker: str) -> Optional[TechnicalData]:
         try:
             time.sleep(2)  # Rate limiting
             stock = yf.Ticker(ticker)
-            df = stock.history(period="6mo")
             info = stock.info
+            currency = info.get('currency', 'USD')
+            if self.timeframes:
+                technicals = self._multi_timeframe_technicals(ticker, currency)
+                if technicals:
+                    return technicals
+            df = stock.history(period="6mo")
             
             if df.empty or len(df) < 50:
                 print(f"Yahoo: Insufficient data for {ticker} (got {len(df)} days)")
                 return None
             
-            currency = info.get('currency', 'USD')
-            convert = lambda v: v / 100 if currency == 'GBp' else v
-            
-            # Calculate indicators
-            df['SMA20'] = df['Close'].rolling(20).mean()
-            df['SMA50'] = df['Close'].rolling(50).mean()
-            
-            delta = df['Close'].diff()
-            gain = delta.where(delta > 0, 0).rolling(14).mean()
-            loss = -delta.where(delta < 0, 0).rolling(14).mean()
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
-            
-            exp1 = df['Close'].ewm(span=12, adjust=False).mean()
-            exp2 = df['Close'].ewm(span=26, adjust=False).mean()
-            df['MACD'] = exp1 - exp2
-            df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-            df['MACD_Hist'] = df['MACD'] - df['MACD_Signal']
-            
-            df['BB_Middle'] = df['SMA20']
-            bb_std = df['Close'].rolling(20).std()
-            df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-            df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-            df['BB_Width'] = (df['BB_Upper'] - df['BB_Lower']) / df['BB_Middle'] * 100
-            
-            df['Volume_SMA20'] = df['Volume'].rolling(20).mean()
-            
-            high_low = df['High'] - df['Low']
-            high_close = (df['High'] - df['Close'].shift()).abs()
-            low_close = (df['Low'] - df['Close'].shift()).abs()
-            ranges = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            df['ATR'] = ranges.rolling(14).mean()
-            
-            rsi_min = df['RSI'].rolling(14).min()
-            rsi_max = df['RSI'].rolling(14).max()
-            df['Stoch_RSI'] = 100 * (df['RSI'] - rsi_min) / (rsi_max - rsi_min)
-            
-            # Extract values
-            current = convert(float(df['Close'].iloc[-1]))
-            sma20 = convert(float(df['SMA20'].iloc[-1]))
-            sma50 = convert(float(df['SMA50'].iloc[-1]))
-            rsi = float(df['RSI'].iloc[-1])
-            
-            macd_line = float(df['MACD'].iloc[-1])
-            macd_signal = float(df['MACD_Signal'].iloc[-1])
-            macd_hist = float(df['MACD_Hist'].iloc[-1])
-            
-            bb_upper = convert(float(df['BB_Upper'].iloc[-1]))
-            bb_middle = convert(float(df['BB_Middle'].iloc[-1]))
-            bb_lower = convert(float(df['BB_Lower'].iloc[-1]))
-            bb_width = float(df['BB_Width'].iloc[-1])
-            
-            volume = float(df['Volume'].iloc[-1])
-            volume_sma20 = float(df['Volume_SMA20'].iloc[-1])
-            atr = convert(float(df['ATR'].iloc[-1]))
-            stoch_rsi = float(df['Stoch_RSI'].iloc[-1])
-            
-            support = convert(float(df['Low'].tail(20).min()))
-            resistance = convert(float(df['High'].tail(20).max()))
-            
-            # Trend
-            trend_signals = 0
-            if current > sma50: trend_signals += 1
-            if current > sma20: trend_signals += 1
-            if macd_hist > 0: trend_signals += 1
-            if rsi > 50: trend_signals += 1
-            
-            trend = 'Bullish' if trend_signals >= 3 else 'Bearish' if trend_signals <= 1 else 'Neutral'
-            
-            return TechnicalData(
-                ticker=ticker,
-                current=current,
-                sma20=sma20,
-                sma50=sma50,
-                rsi=rsi,
-                trend=trend,
-                support=support,
-                resistance=resistance,
-                currency='GBP' if currency == 'GBp' else currency,
-                symbol='£' if currency == 'GBp' else '$',
-                macd_line=macd_line,
-                macd_signal=macd_signal,
-                macd_histogram=macd_hist,
-                bb_upper=bb_upper,
-                bb_middle=bb_middle,
-                bb_lower=bb_lower,
-                bb_width=bb_width,
-                volume=volume,
-                volume_sma20=volume_sma20,
-                atr=atr,
-                stoch_rsi=stoch_rsi
-            )
+            return technicals_from_history(ticker, df, currency)
         except Exception as e:
             print(f"Yahoo technicals error for {ticker}: {e}")
-            import traceback
-            traceback.print_exc()
+            raise
+    
+    def _multi_timeframe_technicals(self, ticker: str, currency: str) -> Optional[TechnicalData]:
+        """Daily TechnicalData with .timeframes filled: daily and weekly from 1d bars, intraday from one base download"""
+        df = self.get_histories([ticker], period=BASE_PERIODS['1d'], interval='1d').get(ticker)
+        if df is None or df.empty:
+            return None
+        wanted = [tf for tf in DAILY_TIMEFRAMES if tf in self.timeframes or tf == '1d']
+        found = multi_timeframe(ticker, df, currency, wanted, '1d')
+        if '1d' not in found:
             return None
+        base = base_interval(self.timeframes)
+        if base:
+            intraday = self.get_histories([ticker], period=BASE_PERIODS[base], interval=base).get(ticker)
+            if intraday is not None and not intraday.empty:
+                wanted = [tf for tf in self.timeframes if tf not in DAILY_TIMEFRAMES]
+                found.update(multi_timeframe(ticker, intraday, currency, wanted, base))
+        timeframes = {tf: found[tf] for tf in TIMEFRAME_RULES if tf in found}
+        # A copy, so the '1d' entry does not contain itself
+        daily = replace(timeframes['1d'])
+        daily.timeframes = {tf: tech for tf, tech in timeframes.items() if tf in self.timeframes}
+        return daily
+    
+    def get_histories(self, tickers: List[str], period: str = "1y", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """OHLCV frames for many tickers from one batched download, cached for Config.HISTORY_CACHE_TTL.
+
+        Only tickers missing from the cache are downloaded, so growing a
+        watchlist by one name costs one small request, not a full refetch.
+        """
+        from config import Config
+        now = time.monotonic()
+        frames, missing = {}, []
+        with self._cache_lock:
+            for ticker in tickers:
+                cached = self._cache.get((ticker, period, interval))
+                if cached and now - cached[0] < Config.HISTORY_CACHE_TTL:
+                    frames[ticker] = cached[1]
+                else:
+                    missing.append(ticker)
+        if not missing:
+            return frames
+        
+        try:
+            data = yf.download(missing, period=period, interval=interval, group_by='ticker',
+                               auto_adjust=False, progress=False, threads=True)
+        except Exception as e:
+            print(f"Yahoo batch download error: {e}")
+            return frames
+        
+        for ticker in missing:
+            try:
+                df = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+            except KeyError:
+                continue
+            df = df.dropna(subset=['Close'])
+            if df.empty:
+                continue
+            frames[ticker] = df
+            with self._cache_lock:
+                self._cache[(ticker, period, interval)] = (now, df)
+        return frames
     
     def get_news(self, ticker: str, max_items: int = 5) -> List[NewsItem]:
         return []
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Per-run time budgets.
+
+A Deadline is split across the remaining stages by weight each time a
+stage starts, so time a fast stage leaves unused flows to the later ones
+and the last stage (Director) always keeps at least its own share. The
+stage's deadline is exposed through a context variable, so code deeper
+in the call (the Groq request) can pass its remaining time on as a
+timeout instead of being cut off mid-request.
+"""
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, List, Optional
+import asyncio
+import time
+
+_current: ContextVar[Optional['Deadline']] = ContextVar('deadline', default=None)
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def budget(self, stage: str, remaining_stages: List[str], weights: Dict[str, float]) -> float:
+        """This stage's share of the time left, given the stages still to run (including this one)"""
+        total = sum(weights.get(s, weights.get('agent', 1.0)) for s in remaining_stages)
+        share = weights.get(stage, weights.get('agent', 1.0))
+        return self.remaining() * share / total if total else self.remaining()
+
+def current() -> Optional[Deadline]:
+    """Deadline of the stage the caller is running in, if any"""
+    return _current.get()
+
+async def run_stage(coro: Awaitable[Any], budget: float) -> Any:
+    """Await coro for at most budget seconds; raises asyncio.TimeoutError after cancelling it"""
+    token = _current.set(Deadline(budget))
+    try:
+        # wait_for copies the context into the task it creates, so current() sees the stage deadline
+        return await asyncio.wait_for(coro, budget)
+    finally:
+        _current.reset(token)
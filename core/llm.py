@@ -0,0 +1,23 @@
+from typing import Any
+import asyncio
+import weakref
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+def create_client():
+    from groq import AsyncGroq
+    from config import Config
+    return AsyncGroq(api_key=Config.GROQ_API_KEY)
+
+def get_client():
+    """AsyncGroq client shared by everything running on the current event loop.
+
+    The underlying httpx connection pool is bound to the loop it first runs
+    on, so clients are kept per loop rather than globally.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = create_client()
+        _clients[loop] = client
+    return client
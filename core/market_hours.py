@@ -0,0 +1,59 @@
+"""Exchange trading sessions, keyed by the same ticker suffixes GoogleFinanceConnector uses.
+
+Sessions are regular weekday hours in the exchange's local time zone.
+Public holidays and lunch breaks (HKG, TYO) are not modelled, so a
+scheduler may do one redundant refresh on those days.
+"""
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+@dataclass(frozen=True)
+class Exchange:
+    code: str  # Google Finance exchange prefix
+    tz: str
+    open: time
+    close: time
+
+    def local(self, now: Optional[datetime] = None) -> datetime:
+        return (now or datetime.now(timezone.utc)).astimezone(ZoneInfo(self.tz))
+
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        local = self.local(now)
+        return local.weekday() < 5 and self.open <= local.time() < self.close
+
+    def last_close(self, now: Optional[datetime] = None) -> datetime:
+        """The most recent session close at or before now, as an aware UTC datetime"""
+        local = self.local(now)
+        day = local.date()
+        while True:
+            close = datetime.combine(day, self.close, tzinfo=local.tzinfo)
+            if day.weekday() < 5 and close <= local:
+                return close.astimezone(timezone.utc)
+            day -= timedelta(days=1)
+
+US = Exchange('', 'America/New_York', time(9, 30), time(16, 0))
+
+# Ticker suffix -> exchange (Yahoo-style suffixes; no suffix means a US listing)
+EXCHANGES = {
+    '.L': Exchange('LON', 'Europe/London', time(8, 0), time(16, 30)),
+    '.TO': Exchange('TSE', 'America/Toronto', time(9, 30), time(16, 0)),
+    '.DE': Exchange('ETR', 'Europe/Berlin', time(9, 0), time(17, 30)),
+    '.PA': Exchange('EPA', 'Europe/Paris', time(9, 0), time(17, 30)),
+    '.HK': Exchange('HKG', 'Asia/Hong_Kong', time(9, 30), time(16, 0)),
+    '.T': Exchange('TYO', 'Asia/Tokyo', time(9, 0), time(15, 0)),
+}
+
+def split_suffix(ticker: str):
+    """(symbol without suffix, exchange) for a ticker like 'LLOY.L'"""
+    for suffix, exchange in EXCHANGES.items():
+        if ticker.endswith(suffix):
+            return ticker[:-len(suffix)], exchange
+    return ticker, US
+
+def exchange_for(ticker: str) -> Exchange:
+    return split_suffix(ticker)[1]
+
+def is_open(ticker: str, now: Optional[datetime] = None) -> bool:
+    return exchange_for(ticker).is_open(now)
@@ -0,0 +1,206 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+import json
+import threading
+import time
+import uuid
+
+PREFIX = "stock_ai"
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_current_span: ContextVar[Optional[Dict[str, Any]]] = ContextVar('current_span', default=None)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(key: LabelKey, extra: str = '') -> str:
+    parts = ['{}="{}"'.format(k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in key]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+class _Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+
+class Metrics:
+    """Timing spans and counters for the pipeline, exportable as Prometheus text or a JSONL trace.
+
+    span() times a stage; its labels (low-cardinality: stage, agent, provider,
+    model) become Prometheus labels, while annotate() attaches per-record
+    detail such as ticker or token counts that only goes to the trace.
+    """
+
+    def __init__(self, keep: int = 1000):
+        self.records = deque(maxlen=keep)
+        self._durations: Dict[LabelKey, _Histogram] = defaultdict(_Histogram)
+        self._counters: Dict[Tuple[str, LabelKey], float] = defaultdict(float)
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._trace_file = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str, **labels) -> Iterator[Dict[str, Any]]:
+        parent = _current_span.get()
+        record = {
+            'stage': stage,
+            'labels': {k: str(v) for k, v in labels.items()},
+            'attrs': {},
+            'trace_id': parent['trace_id'] if parent else uuid.uuid4().hex[:16],
+            'span_id': uuid.uuid4().hex[:8],
+            'parent_id': parent['span_id'] if parent else None,
+            'start': datetime.now(timezone.utc).isoformat(),
+            'ok': True,
+        }
+        token = _current_span.set(record)
+        self._notify('start', record)
+        started = time.perf_counter()
+        try:
+            yield record['attrs']
+        except BaseException as e:
+            record['ok'] = False
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record['duration'] = time.perf_counter() - started
+            _current_span.reset(token)
+            self._finish(record)
+
+    def annotate(self, **attrs):
+        """Attach attributes to the innermost open span (no-op outside a span)"""
+        record = _current_span.get()
+        if record is not None:
+            record['attrs'].update(attrs)
+
+    def incr(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            self._counters[(name, _label_key(labels))] += value
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """listener(event, record) is called with event 'start' or 'end' for every span"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, record: Dict[str, Any]):
+        for listener in list(self._listeners):
+            try:
+                listener(event, record)
+            except Exception as e:
+                print(f"Metrics listener error: {e}")
+
+    def _finish(self, record: Dict[str, Any]):
+        with self._lock:
+            self.records.append(record)
+            self._durations[_label_key({'stage': record['stage'], **record['labels']})].observe(record['duration'])
+            if not record['ok']:
+                self._counters[('stage_errors_total', _label_key({'stage': record['stage'], **record['labels']}))] += 1
+            if self._trace_file:
+                self._trace_file.write(json.dumps(record, default=str) + "\n")
+                self._trace_file.flush()
+        self._notify('end', record)
+
+    def open_trace(self, path: str):
+        """Append every finished span to path as one JSON object per line"""
+        with self._lock:
+            if self._trace_file:
+                self._trace_file.close()
+            self._trace_file = open(path, 'a', encoding='utf-8')
+
+    def close_trace(self):
+        with self._lock:
+            if self._trace_file:
+                self._trace_file.close()
+                self._trace_file = None
+
+    def render_prometheus(self) -> str:
+        from core import singleflight
+        lines = [f"# HELP {PREFIX}_stage_duration_seconds Wall time per pipeline stage",
+                 f"# TYPE {PREFIX}_stage_duration_seconds histogram"]
+        with self._lock:
+            durations = {k: (list(h.counts), h.total, h.count) for k, h in self._durations.items()}
+            counters = dict(self._counters)
+        name = f"{PREFIX}_stage_duration_seconds"
+        for key, (counts, total, count) in sorted(durations.items()):
+            for bound, bucket in zip(BUCKETS, counts):
+                lines.append(name + "_bucket" + _format_labels(key, 'le="%s"' % bound) + f" {bucket}")
+            lines.append(name + "_bucket" + _format_labels(key, 'le="+Inf"') + f" {count}")
+            lines.append(name + "_sum" + _format_labels(key) + f" {total:.6f}")
+            lines.append(name + "_count" + _format_labels(key) + f" {count}")
+
+        names = sorted({name for name, _ in counters})
+        for name in names:
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            for (counter, key), value in sorted(counters.items()):
+                if counter == name:
+                    lines.append(f"{PREFIX}_{name}{_format_labels(key)} {value:g}")
+
+        lines.append(f"# TYPE {PREFIX}_singleflight_calls_total counter")
+        lines.append(f"# TYPE {PREFIX}_singleflight_coalesced_total counter")
+        for group, stats in sorted(singleflight.stats().items()):
+            lines.append(f'{PREFIX}_singleflight_calls_total{{group="{group}"}} {stats["calls"]}')
+            lines.append(f'{PREFIX}_singleflight_coalesced_total{{group="{group}"}} {stats["coalesced"]}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count / total / mean seconds per stage, for quick console reports"""
+        with self._lock:
+            items = [(dict(k), h.count, h.total) for k, h in self._durations.items()]
+        out = {}
+        for labels, count, total in items:
+            name = labels.pop('stage') + ''.join(f"[{v}]" for _, v in sorted(labels.items()))
+            out[name] = {'count': count, 'total': total, 'mean': total / count if count else 0.0}
+        return out
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """Expose GET /metrics in Prometheus text format from a daemon thread"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        print(f"📈 Metrics at http://{host}:{port}/metrics")
+        return server
+
+metrics = Metrics()
+
+def start_exporters():
+    """Enable the exporters configured via STOCK_AI_TRACE_FILE / STOCK_AI_METRICS_PORT"""
+    from config import Config
+    if Config.TRACE_FILE:
+        metrics.open_trace(Config.TRACE_FILE)
+    if Config.METRICS_PORT:
+        metrics.serve(Config.METRICS_PORT)
@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+
+from core.metrics import metrics
+
+class Profiler:
+    """cProfile + stack sampling + tracemalloc for one profiled run.
+
+    Writes into out_dir:
+    - <name>.pstats      cProfile stats of the event loop and every executor thread
+    - <name>.collapsed   sampled wall-clock stacks ("a;b;c count"), usable with
+                         flamegraph.pl or speedscope; network waits show up as
+                         time in select/recv rather than disappearing
+    - <name>.alloc.txt   per metrics stage (provider, agent.*, ...): peak traced memory
+                         above the stage's starting point, which includes temporaries
+                         freed before it ends, and the top sites of what it kept
+
+    Allocations between two span boundaries are charged to the innermost
+    open span. While spans from unrelated tasks overlap (several tickers at
+    once) they go to "(concurrent)" instead of being guessed; profile a
+    single ticker for a clean per-stage split. Every boundary takes a
+    tracemalloc snapshot, which is O(heap), so this is for profiled runs only.
+    """
+
+    def __init__(self, out_dir: str, sample_interval: float = 0.005, top: int = 10):
+        self.out_dir = out_dir
+        self.sample_interval = sample_interval
+        self.top = top
+        self.name = datetime.now().strftime("profile-%Y%m%d-%H%M%S")
+        self._profiles: List[cProfile.Profile] = []
+        self._profiles_lock = threading.Lock()
+        self._stacks = Counter()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._open: Dict[str, Dict[str, Any]] = {}  # span_id -> record of spans in progress
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._last_traced = 0
+        self._allocations: Dict[str, Counter] = {}
+        self._peaks: Counter = Counter()
+        self._alloc_lock = threading.Lock()
+
+    def _profile_thread(self):
+        """ThreadPoolExecutor initializer: give each worker thread its own cProfile (before 3.12).
+
+        From 3.12 cProfile sits on sys.monitoring, which allows one active
+        profiler per process and already sees every thread, so the main
+        profile covers the executor threads and a second enable() would raise.
+        """
+        if sys.version_info >= (3, 12):
+            return
+        profile = cProfile.Profile()
+        with self._profiles_lock:
+            self._profiles.append(profile)
+        profile.enable()
+
+    def _sample(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.sample_interval):
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, 'thread'))
+                self._stacks[';'.join(reversed(stack))] += 1
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        # Leave out the profiler's own bookkeeping
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+
+    def _stage_key(self, record: Dict[str, Any]) -> str:
+        return record['stage'] + ''.join(f"[{v}]" for _, v in sorted(record['labels'].items()))
+
+    def _charged_stage(self) -> Optional[str]:
+        """Stage the allocations since the last boundary belong to: the innermost open span, if unambiguous"""
+        parents = {record['parent_id'] for record in self._open.values()}
+        leaves = [record for span_id, record in self._open.items() if span_id not in parents]
+        if not leaves:
+            return None
+        return self._stage_key(leaves[0]) if len(leaves) == 1 else '(concurrent)'
+
+    def _boundary(self):
+        # Close the interval since the last span start/end and charge it
+        snapshot = self._snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        stage = self._charged_stage()
+        if stage is not None:
+            self._peaks[stage] = max(self._peaks[stage], peak - self._last_traced)
+            sites = self._allocations.setdefault(stage, Counter())
+            for stat in snapshot.compare_to(self._last_snapshot, 'lineno'):
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    sites[f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+        tracemalloc.reset_peak()
+        self._last_snapshot = snapshot
+        self._last_traced = tracemalloc.get_traced_memory()[0]
+
+    def _on_span(self, event: str, record: Dict[str, Any]):
+        with self._alloc_lock:
+            self._boundary()
+            if event == 'start':
+                self._open[record['span_id']] = record
+            else:
+                self._open.pop(record['span_id'], None)
+
+    def __enter__(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        tracemalloc.start(1)
+        self._last_snapshot = self._snapshot()
+        self._last_traced = tracemalloc.get_traced_memory()[0]
+        metrics.add_listener(self._on_span)
+        self._sampler = threading.Thread(target=self._sample, name='profiler-sampler', daemon=True)
+        self._sampler.start()
+        self._main_profile = cProfile.Profile()
+        self._main_profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._main_profile.disable()
+        self._stop.set()
+        self._sampler.join()
+        metrics.remove_listener(self._on_span)
+        self._last_snapshot = None
+        tracemalloc.stop()
+        self._write()
+        return False
+
+    def _write(self):
+        base = os.path.join(self.out_dir, self.name)
+
+        stats = pstats.Stats(self._main_profile)
+        with self._profiles_lock:
+            for profile in self._profiles:
+                stats.add(profile)
+        stats.dump_stats(base + ".pstats")
+
+        with open(base + ".collapsed", 'w', encoding='utf-8') as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(base + ".alloc.txt", 'w', encoding='utf-8') as f:
+            for stage, sites in sorted(self._allocations.items()):
+                total = sum(sites.values())
+                f.write(f"== {stage}: peak {self._peaks[stage] / 1024:.1f} KiB, net {total / 1024:+.1f} KiB\n")
+                for site, size in sites.most_common(self.top):
+                    f.write(f"  {size / 1024:10.1f} KiB  {site}\n")
+
+        report = io.StringIO()
+        pstats.Stats(base + ".pstats", stream=report).sort_stats('cumulative').print_stats(15)
+        print(report.getvalue())
+        print(f"🔬 Profile written: {base}.pstats, {base}.collapsed, {base}.alloc.txt")
+
+def run_profiled(main: Callable[[], Awaitable[Any]], out_dir: str) -> Any:
+    """asyncio.run(main()) under a Profiler, profiling the loop's executor threads too"""
+    profiler = Profiler(out_dir)
+
+    async def wrapper():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(thread_name_prefix='profiled', initializer=profiler._profile_thread))
+        return await main()
+
+    with profiler:
+        return asyncio.run(wrapper())
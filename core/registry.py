@@ -0,0 +1,64 @@
+from typing import Any, Dict, List, Union
+import importlib
+import threading
+
+class Registry:
+    """Name -> class lookup that imports the implementing module on first use.
+
+    Entries are 'package.module:ClassName' strings, so registering a
+    connector or agent costs nothing until something actually asks for it.
+    Lookups are case-insensitive and also accept the class name itself.
+    """
+
+    def __init__(self, kind: str, entries: Dict[str, str]):
+        self.kind = kind
+        self._entries: Dict[str, Union[str, type]] = {}
+        self._lock = threading.Lock()
+        for name, target in entries.items():
+            self.register(name, target)
+
+    def register(self, name: str, target: Union[str, type]):
+        with self._lock:
+            self._entries[name.lower()] = target
+
+    def _key(self, name: str) -> str:
+        key = name.lower()
+        if key in self._entries:
+            return key
+        for entry, target in self._entries.items():
+            class_name = target.rsplit(':', 1)[-1] if isinstance(target, str) else target.__name__
+            if class_name.lower() == key:
+                return entry
+        raise KeyError(f"Unknown {self.kind} '{name}' (known: {', '.join(self.names())})")
+
+    def resolve(self, name: str) -> type:
+        key = self._key(name)
+        with self._lock:
+            target = self._entries[key]
+            if isinstance(target, str):
+                module_name, class_name = target.split(':')
+                target = getattr(importlib.import_module(module_name), class_name)
+                self._entries[key] = target
+            return target
+
+    def create(self, name: str, **kwargs) -> Any:
+        return self.resolve(name)(**kwargs)
+
+    def names(self) -> List[str]:
+        return sorted(self._entries)
+
+    def is_loaded(self, name: str) -> bool:
+        return not isinstance(self._entries[self._key(name)], str)
+
+connectors = Registry('connector', {
+    'yahoo': 'connectors.yahoo:YahooConnector',
+    'google': 'connectors.google_finance:GoogleFinanceConnector',
+    'news': 'connectors.news:NewsConnector',
+})
+
+agents = Registry('agent', {
+    'chart_master': 'agents.chart_master:ChartMaster',
+    'news_hound': 'agents.news_hound:NewsHound',
+    'signal_pro': 'agents.signal_pro:SignalPro',
+    'director': 'agents.director:Director',
+})
@@ -0,0 +1,240 @@
+"""Long-running analysis service.
+
+Keeps one FullAnalysisPipeline (connectors, agents, caches, circuit
+breakers) and one LLM client resident on an AnalysisWorker loop, accepts
+analyses over a local HTTP/JSON API, and refreshes a watchlist while each
+ticker's exchange is trading.
+
+    POST /analyze        {"ticker": "AAPL", "question": "...", "deadline": 60, "wait": false}
+    GET  /jobs/<id>      job status and, once done, the result record
+    GET  /watchlist      latest watchlist job per ticker
+    GET  /health         queue depth and capacity
+    GET  /stats          provider health and stage timings
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+import asyncio
+import itertools
+import json
+import threading
+import time
+
+from config import Config
+from core import market_hours
+from core.metrics import metrics
+from core.worker import AnalysisWorker
+
+class ServiceBusy(Exception):
+    """Raised when the run queue is full; the API answers 503"""
+
+@dataclass
+class Job:
+    id: str
+    ticker: str
+    question: str
+    source: str = 'api'
+    deadline: Optional[float] = None  # seconds for the run; None uses Config.RUN_DEADLINE
+    status: str = 'queued'  # queued -> running -> done | failed
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    future: Any = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {k: getattr(self, k) for k in ('id', 'ticker', 'question', 'source', 'deadline', 'status',
+                                              'submitted', 'started', 'finished', 'error')}
+        if self.result is not None:
+            data['result'] = self.result.to_record()
+        return data
+
+class AnalysisService:
+    """Queues analyses onto a resident pipeline with bounded concurrency.
+
+    At most `concurrency` runs execute at once; up to `queue_size` more
+    wait for a slot, and anything beyond that is rejected with ServiceBusy
+    instead of piling up behind a slow provider.
+    """
+
+    def __init__(self, pipeline, concurrency: int = None, queue_size: int = None,
+                 watchlist: List[str] = None, refresh_interval: float = None, keep_jobs: int = 1000):
+        self.pipeline = pipeline
+        self.concurrency = concurrency or Config.SERVICE_CONCURRENCY
+        self.queue_size = Config.SERVICE_QUEUE_SIZE if queue_size is None else queue_size
+        self.watchlist = list(watchlist or [])
+        self.refresh_interval = refresh_interval or Config.WATCHLIST_REFRESH_INTERVAL
+        self.keep_jobs = keep_jobs
+        self.worker: Optional[AnalysisWorker] = None
+        self.started = time.time()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._latest: Dict[str, Job] = {}
+        self._active = 0
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def start(self):
+        self.worker = AnalysisWorker('analysis-service')
+        self._slots = asyncio.Semaphore(self.concurrency)
+        if self.watchlist:
+            self.worker.submit(self._refresh_watchlist())
+        return self
+
+    def stop(self):
+        if self.worker:
+            self.worker.run(self._cancel_pending(), timeout=10)
+            self.worker.stop()
+
+    async def _cancel_pending(self):
+        # The refresher and any in-flight analyses, so the loop closes cleanly
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def submit(self, ticker: str, question: str = "Technical outlook", source: str = 'api',
+               deadline: Optional[float] = None) -> Job:
+        with self._lock:
+            if self._active >= self.concurrency + self.queue_size:
+                metrics.incr('service_rejected_total', source=source)
+                raise ServiceBusy(f"{self._active} analyses in flight")
+            self._active += 1
+            job = Job(str(next(self._ids)), ticker.strip().upper(), question, source, deadline)
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.keep_jobs:
+                self._jobs.popitem(last=False)
+            if source == 'watchlist':
+                self._latest[job.ticker] = job
+        job.future = self.worker.submit(self._execute(job))
+        return job
+
+    def job(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def latest(self) -> Dict[str, Job]:
+        with self._lock:
+            return dict(self._latest)
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            running = sum(1 for j in self._jobs.values() if j.status == 'running')
+            active = self._active
+        return {
+            'status': 'ok',
+            'uptime': round(time.time() - self.started, 1),
+            'running': running,
+            'queued': active - running,
+            'concurrency': self.concurrency,
+            'queue_size': self.queue_size,
+        }
+
+    async def _execute(self, job: Job):
+        try:
+            async with self._slots:
+                job.status, job.started = 'running', time.time()
+                job.result = await self.pipeline.run(job.ticker, job.question, job.deadline)
+            job.status = 'done' if job.result.success else 'failed'
+            job.error = job.result.error
+        except Exception as e:
+            job.status, job.error = 'failed', str(e)
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                self._active -= 1
+        return job
+
+    def _refresh_due(self, ticker: str, now: datetime) -> bool:
+        job = self._latest.get(ticker)
+        if job is None:
+            return True
+        if job.finished is None:
+            return False
+        exchange = market_hours.exchange_for(ticker)
+        finished = datetime.fromtimestamp(job.finished, timezone.utc)
+        if exchange.is_open(now):
+            return (now - finished).total_seconds() >= self.refresh_interval
+        # Closed: one more run to capture the closing prices, then idle until the next session
+        return finished < exchange.last_close(now)
+
+    async def _refresh_watchlist(self):
+        while True:
+            now = datetime.now(timezone.utc)
+            for ticker in self.watchlist:
+                with self._lock:
+                    due = self._refresh_due(ticker, now)
+                if due:
+                    try:
+                        self.submit(ticker, Config.WATCHLIST_QUESTION, source='watchlist')
+                    except ServiceBusy:
+                        break  # API traffic has the queue; try again next tick
+            await asyncio.sleep(Config.WATCHLIST_CHECK_INTERVAL)
+
+    def serve(self, host: str = None, port: int = None) -> ThreadingHTTPServer:
+        server = ThreadingHTTPServer((host or Config.SERVICE_HOST, port or Config.SERVICE_PORT), _handler(self))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='service-http', daemon=True).start()
+        return server
+
+def _handler(service: AnalysisService):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+            body = json.dumps(payload, default=str).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = self.path.split('?')[0].rstrip('/')
+            if path == '/health':
+                self._send(200, service.health())
+            elif path == '/stats':
+                self._send(200, {**service.health(), 'providers': service.pipeline.provider_stats(),
+                                 'stages': metrics.summary()})
+            elif path == '/watchlist':
+                self._send(200, {t: job.to_dict() for t, job in service.latest().items()})
+            elif path.startswith('/jobs/'):
+                job = service.job(path[len('/jobs/'):])
+                if job:
+                    self._send(200, job.to_dict())
+                else:
+                    self._send(404, {'error': 'unknown job'})
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path.split('?')[0].rstrip('/') != '/analyze':
+                self._send(404, {'error': 'not found'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                request = json.loads(self.rfile.read(length) or b'{}')
+                ticker = request['ticker']
+                deadline = float(request['deadline']) if request.get('deadline') is not None else None
+            except (ValueError, KeyError, TypeError):
+                self._send(400, {'error': 'expected JSON body with a "ticker"'})
+                return
+            try:
+                job = service.submit(ticker, request.get('question') or "Technical outlook", deadline=deadline)
+            except ServiceBusy as e:
+                self._send(503, {'error': str(e)}, {'Retry-After': '5'})
+                return
+            if request.get('wait'):
+                try:
+                    job.future.result(request.get('timeout') or Config.SERVICE_WAIT_TIMEOUT)
+                except Exception:
+                    pass  # still running (or failed); the job record says which
+            self._send(200 if job.finished else 202, job.to_dict())
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
@@ -0,0 +1,99 @@
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import asyncio
+import threading
+
+class _LeaderCancelled(Exception):
+    """Set on a call's future when its leader was cancelled, so followers retry"""
+
+class SingleFlight:
+    """Coalesces identical in-flight calls so concurrent callers share one result.
+
+    The first caller for a key (the leader) does the work; callers that arrive
+    while it is running wait on the same concurrent.futures.Future. That future
+    is thread-safe, so this works across threads and across event loops, e.g.
+    separate Streamlit sessions each running their own asyncio.run().
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _claim(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            self.calls += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            future.set_running_or_notify_cancel()  # running futures cannot be cancelled by a waiter
+            self._inflight[key] = future
+            return future, True
+
+    def _settle(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None):
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn() once for all concurrent callers of key (blocking)"""
+        future, leader = self._claim(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() once for all concurrent callers of key.
+
+        A cancelled leader (a Streamlit rerun, a service shutdown) does not
+        cancel its followers: they retry, and one of them leads the new call.
+        """
+        while True:
+            future, leader = self._claim(key)
+            if not leader:
+                try:
+                    return await asyncio.shield(asyncio.wrap_future(future))
+                except _LeaderCancelled:
+                    continue
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                self._settle(key, future, error=_LeaderCancelled())
+                raise
+            except BaseException as e:
+                self._settle(key, future, error=e)
+                raise
+            self._settle(key, future, result)
+            return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._inflight)}
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+def group(name: str) -> SingleFlight:
+    """Process-wide SingleFlight shared by everything that uses the same name"""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(name)
+        return _groups[name]
+
+def stats() -> Dict[str, Dict[str, int]]:
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {g.name: g.stats() for g in groups}
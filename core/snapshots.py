@@ -0,0 +1,460 @@
+"""Struct-of-arrays storage for TechnicalData, NewsItem and AgentOutput snapshots.
+
+A universe of thousands of tickers with history is mostly repeated
+strings and boxed floats when kept as dataclasses. Here every field is a
+typed NumPy column: floats as float64 (NaN for None), repeated strings
+(ticker, currency, trend, source, agent name...) as int32 codes into an
+interned vocabulary, free text as one UTF-8 buffer plus offsets. Rows
+are read through __slots__ views that expose the dataclass attributes,
+so agents can take them in place of TechnicalData and friends.
+
+Tables save to a directory of .npy files that load memory-mapped, or to
+an Arrow IPC file (optional pyarrow) whose buffers are the same arrays.
+Several processes may share one store directory: saves take a lock file
+and append this process's new rows to whatever the others saved meanwhile.
+"""
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+import numpy as np
+
+from interfaces.agent import AgentOutput
+from interfaces.data_provider import TechnicalData, NewsItem
+
+FLOAT, INT, BOOL, CATEGORY, TEXT, JSON = 'float', 'int', 'bool', 'category', 'text', 'json'
+
+class _Array:
+    """Append-only typed column with amortised doubling"""
+
+    def __init__(self, dtype, data: Optional[np.ndarray] = None):
+        self.data = np.empty(16, dtype=dtype) if data is None else data
+        self.size = 0 if data is None else len(data)
+
+    def append(self, value):
+        if self.size == len(self.data):
+            # Also copies a read-only memory-mapped column into memory on first append
+            grown = np.empty(max(16, 2 * self.size), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size] = value
+        self.size += 1
+
+    def view(self) -> np.ndarray:
+        return self.data[:self.size]
+
+class FloatColumn(_Array):
+    kind = FLOAT
+
+    def __init__(self, data=None):
+        super().__init__(np.float64, data)
+
+    def append(self, value):
+        super().append(np.nan if value is None else value)
+
+    def get(self, i: int):
+        value = self.data[i]
+        return None if value != value else float(value)
+
+class IntColumn(_Array):
+    kind = INT
+
+    def __init__(self, data=None):
+        super().__init__(np.int32, data)
+
+    def get(self, i: int):
+        return int(self.data[i])
+
+class BoolColumn(_Array):
+    kind = BOOL
+
+    def __init__(self, data=None):
+        super().__init__(np.bool_, data)
+
+    def get(self, i: int):
+        return bool(self.data[i])
+
+class CategoryColumn(_Array):
+    """Interned strings: int32 codes into a shared vocabulary (-1 for None)"""
+    kind = CATEGORY
+
+    def __init__(self, data=None, vocab: List[str] = None):
+        super().__init__(np.int32, data)
+        self.vocab = list(vocab or [])
+        self._codes = {value: code for code, value in enumerate(self.vocab)}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.vocab)
+            self.vocab.append(value)
+        return code
+
+    def append(self, value):
+        super().append(self.code(value))
+
+    def get(self, i: int):
+        code = self.data[i]
+        return None if code < 0 else self.vocab[code]
+
+class TextColumn:
+    """UTF-8 bytes of every value back to back, with int64 offsets (Arrow's large_string layout)"""
+    kind = TEXT
+
+    def __init__(self, offsets: Optional[np.ndarray] = None, buffer: Optional[np.ndarray] = None):
+        self.offsets = _Array(np.int64, offsets if offsets is not None else np.zeros(1, dtype=np.int64))
+        self.buffer = _Array(np.uint8, buffer if buffer is not None else np.empty(0, dtype=np.uint8))
+
+    @property
+    def size(self) -> int:
+        return self.offsets.size - 1
+
+    def append(self, value):
+        encoded = np.frombuffer((value or '').encode('utf-8'), dtype=np.uint8)
+        end = self.buffer.size + len(encoded)
+        if end > len(self.buffer.data):
+            grown = np.empty(max(1024, 2 * end), dtype=np.uint8)
+            grown[:self.buffer.size] = self.buffer.view()
+            self.buffer.data = grown
+        self.buffer.data[self.buffer.size:end] = encoded
+        self.buffer.size = end
+        self.offsets.append(end)
+
+    def get(self, i: int):
+        start, end = self.offsets.data[i], self.offsets.data[i + 1]
+        return bytes(self.buffer.data[start:end]).decode('utf-8')
+
+class JsonColumn(TextColumn):
+    kind = JSON
+
+    def append(self, value):
+        super().append(json.dumps(value or {}, default=str))
+
+    def get(self, i: int):
+        return json.loads(super().get(i))
+
+_COLUMN_TYPES = {c.kind: c for c in (FloatColumn, IntColumn, BoolColumn, CategoryColumn, TextColumn, JsonColumn)}
+
+class _RowView:
+    """Read-only attribute view of one table row"""
+    __slots__ = ('_table', '_index')
+    record_type = None
+
+    def __init__(self, table: 'ColumnarTable', index: int):
+        self._table = table
+        self._index = index
+
+    def to_record(self):
+        """Materialise the row as its original dataclass"""
+        names = {f.name for f in fields(self.record_type)}
+        return self.record_type(**{name: getattr(self, name) for name in self._table.schema if name in names})
+
+    def __repr__(self):
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in self._table.schema)
+        return f"{type(self).__name__}({values})"
+
+def _row_type(name: str, record_type, schema: Dict[str, str], defaults: Dict[str, Any] = None):
+    def column_property(column: str):
+        return property(lambda self: self._table.columns[column].get(self._index))
+
+    namespace = {'__slots__': (), 'record_type': record_type}
+    namespace.update({column: column_property(column) for column in schema})
+    # Dataclass fields the table does not store keep their default
+    namespace.update({field: property(lambda self, value=value: value) for field, value in (defaults or {}).items()})
+    return type(name, (_RowView,), namespace)
+
+@contextmanager
+def _locked(directory: str) -> Iterator[None]:
+    """Exclusive lock on directory/.lock, held across processes for the duration of the block"""
+    with open(os.path.join(directory, '.lock'), 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _replace_npy(path: str, array: np.ndarray):
+    with open(path + '.tmp', 'wb') as f:
+        np.save(f, array)
+    os.replace(path + '.tmp', path)
+
+class ColumnarTable:
+    """Rows of one record type; `at` (epoch seconds) is stored for every row so tables keep history"""
+
+    def __init__(self, schema: Dict[str, str], row_type, columns: Dict[str, Any] = None):
+        self.schema = schema
+        self.row_type = row_type
+        self.columns = columns or {name: _COLUMN_TYPES[kind]() for name, kind in schema.items()}
+        self._latest: Dict[str, int] = {}
+        self.dirty = False  # rows appended since the table was loaded or last saved
+        self.saved_rows = len(self)  # rows that came from (or went to) disk; later ones are this process's
+        codes = self.column('ticker')
+        if len(codes):
+            # Last occurrence of each ticker code, without a Python loop over the rows
+            unique, first_from_end = np.unique(codes[::-1], return_index=True)
+            vocab = self.columns['ticker'].vocab
+            self._latest = {vocab[code]: len(codes) - 1 - i for code, i in zip(unique.tolist(), first_from_end.tolist())}
+
+    def __len__(self) -> int:
+        return self.columns['at'].size
+
+    def append(self, record, at: Optional[float] = None, **extra):
+        self.dirty = True
+        values = {**extra, 'at': time.time() if at is None else at}
+        for name, column in self.columns.items():
+            column.append(values[name] if name in values else getattr(record, name))
+        self._latest[values.get('ticker') or getattr(record, 'ticker')] = len(self) - 1
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.row_type(self, index)
+
+    def __iter__(self):
+        return (self.row_type(self, i) for i in range(len(self)))
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy NumPy view of a numeric/category column (category columns give codes)"""
+        return self.columns[name].view()
+
+    def rows_for(self, ticker: str) -> List[_RowView]:
+        code = self.columns['ticker']._codes.get(ticker)
+        if code is None:
+            return []
+        return [self.row_type(self, i) for i in np.flatnonzero(self.column('ticker') == code)]
+
+    def latest(self, ticker: str):
+        index = self._latest.get(ticker)
+        return None if index is None else self.row_type(self, index)
+
+    def nbytes(self) -> int:
+        total = 0
+        for column in self.columns.values():
+            if isinstance(column, TextColumn):
+                total += column.offsets.view().nbytes + column.buffer.view().nbytes
+            else:
+                total += column.view().nbytes
+        return total
+
+    # --- NumPy files ---
+
+    def save(self, directory: str):
+        """Write every column, each to a temp file then os.replace'd into place.
+
+        The files being replaced may be the ones this table (or another
+        process) has memory-mapped; writing over them in place would
+        truncate the live map and corrupt the store.
+        """
+        os.makedirs(directory, exist_ok=True)
+        vocab = {}
+        for name, column in self.columns.items():
+            if isinstance(column, TextColumn):
+                _replace_npy(os.path.join(directory, f"{name}.offsets.npy"), column.offsets.view())
+                _replace_npy(os.path.join(directory, f"{name}.buffer.npy"), column.buffer.view())
+            else:
+                _replace_npy(os.path.join(directory, f"{name}.npy"), column.view())
+            if isinstance(column, CategoryColumn):
+                vocab[name] = column.vocab
+        path = os.path.join(directory, 'schema.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'schema': self.schema, 'vocab': vocab, 'rows': len(self)}, f)
+        os.replace(path + '.tmp', path)
+        self.dirty = False
+        self.saved_rows = len(self)
+
+    def append_rows(self, other: 'ColumnarTable', start: int = 0):
+        """Append other's rows from start on (same schema), keeping their timestamps"""
+        for i in range(start, len(other)):
+            row = other[i]
+            self.append(row, at=row.at)
+
+    @classmethod
+    def load(cls, directory: str, row_type, mmap: bool = True) -> 'ColumnarTable':
+        with open(os.path.join(directory, 'schema.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        mode = 'r' if mmap else None
+        path = lambda name: os.path.join(directory, name)
+        columns = {}
+        for name, kind in meta['schema'].items():
+            if kind in (TEXT, JSON):
+                columns[name] = _COLUMN_TYPES[kind](np.load(path(f"{name}.offsets.npy"), mmap_mode=mode),
+                                                    np.load(path(f"{name}.buffer.npy"), mmap_mode=mode))
+            elif kind == CATEGORY:
+                columns[name] = CategoryColumn(np.load(path(f"{name}.npy"), mmap_mode=mode), meta['vocab'][name])
+            else:
+                columns[name] = _COLUMN_TYPES[kind](np.load(path(f"{name}.npy"), mmap_mode=mode))
+        return cls(meta['schema'], row_type, columns)
+
+    # --- Arrow (optional pyarrow) ---
+
+    def to_arrow(self):
+        """pyarrow.Table sharing this table's buffers (category columns become dictionary arrays)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for Arrow export (pip install pyarrow)")
+        arrays = {}
+        for name, column in self.columns.items():
+            if isinstance(column, TextColumn):
+                arrays[name] = pa.LargeStringArray.from_buffers(
+                    column.size, pa.py_buffer(column.offsets.view()), pa.py_buffer(column.buffer.view()))
+            elif isinstance(column, CategoryColumn):
+                codes = column.view()
+                indices = pa.array(codes, mask=codes < 0)
+                arrays[name] = pa.DictionaryArray.from_arrays(indices, pa.array(column.vocab, pa.string()))
+            else:
+                arrays[name] = pa.array(column.view())
+        schema_meta = {b'stock_ai.schema': json.dumps(self.schema).encode()}
+        return pa.table(arrays).replace_schema_metadata(schema_meta)
+
+    def save_arrow(self, path: str):
+        import pyarrow as pa
+        table = self.to_arrow()
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    @classmethod
+    def load_arrow(cls, path: str, row_type) -> 'ColumnarTable':
+        """Read an Arrow IPC file memory-mapped; numeric and text columns stay views of the map"""
+        import pyarrow as pa
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        schema = json.loads(table.schema.metadata[b'stock_ai.schema'])
+        columns = {}
+        for name, kind in schema.items():
+            array = table.column(name).combine_chunks()
+            if kind in (TEXT, JSON):
+                _, offsets, data = array.buffers()
+                offsets = np.frombuffer(offsets, dtype=np.int64, count=len(array) + 1, offset=array.offset * 8)
+                columns[name] = _COLUMN_TYPES[kind](offsets, np.frombuffer(data, dtype=np.uint8) if data else None)
+            elif kind == CATEGORY:
+                codes = array.indices.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+                columns[name] = CategoryColumn(codes, array.dictionary.to_pylist())
+            else:
+                columns[name] = _COLUMN_TYPES[kind](array.to_numpy(zero_copy_only=kind != BOOL))
+        return cls(schema, row_type, columns)
+
+TECHNICAL_SCHEMA = {
+    'at': FLOAT, 'ticker': CATEGORY, 'current': FLOAT, 'sma20': FLOAT, 'sma50': FLOAT, 'rsi': FLOAT,
+    'trend': CATEGORY, 'support': FLOAT, 'resistance': FLOAT, 'currency': CATEGORY, 'symbol': CATEGORY,
+    'macd_line': FLOAT, 'macd_signal': FLOAT, 'macd_histogram': FLOAT, 'bb_upper': FLOAT, 'bb_middle': FLOAT,
+    'bb_lower': FLOAT, 'bb_width': FLOAT, 'volume': FLOAT, 'volume_sma20': FLOAT, 'atr': FLOAT, 'stoch_rsi': FLOAT,
+}
+NEWS_SCHEMA = {
+    'at': FLOAT, 'ticker': CATEGORY, 'title': TEXT, 'source': CATEGORY, 'date': TEXT, 'url': TEXT,
+    'sentiment': CATEGORY,
+}
+OUTPUT_SCHEMA = {
+    'at': FLOAT, 'ticker': CATEGORY, 'agent_name': CATEGORY, 'content': TEXT, 'confidence': INT,
+    'metadata': JSON, 'success': BOOL,
+}
+
+# Per-timeframe technicals are not stored; rows report timeframes=None
+TechnicalRow = _row_type('TechnicalRow', TechnicalData, TECHNICAL_SCHEMA, {'timeframes': None})
+NewsRow = _row_type('NewsRow', NewsItem, NEWS_SCHEMA)
+AgentOutputRow = _row_type('AgentOutputRow', AgentOutput, OUTPUT_SCHEMA)
+
+def _saved_rows(directory: str) -> Optional[int]:
+    try:
+        with open(os.path.join(directory, 'schema.json'), encoding='utf-8') as f:
+            return json.load(f)['rows']
+    except FileNotFoundError:
+        return None
+
+_TABLES = {
+    'technicals': (TECHNICAL_SCHEMA, TechnicalRow),
+    'news': (NEWS_SCHEMA, NewsRow),
+    'outputs': (OUTPUT_SCHEMA, AgentOutputRow),
+}
+
+class SnapshotStore:
+    """Technicals, headlines and agent outputs for a universe, one columnar table each"""
+
+    def __init__(self, tables: Dict[str, ColumnarTable] = None):
+        tables = tables or {}
+        self.technicals = tables.get('technicals') or ColumnarTable(TECHNICAL_SCHEMA, TechnicalRow)
+        self.news = tables.get('news') or ColumnarTable(NEWS_SCHEMA, NewsRow)
+        self.outputs = tables.get('outputs') or ColumnarTable(OUTPUT_SCHEMA, AgentOutputRow)
+        self._lock = threading.Lock()
+
+    def _tables(self) -> Dict[str, ColumnarTable]:
+        return {'technicals': self.technicals, 'news': self.news, 'outputs': self.outputs}
+
+    def add(self, ticker: str, technicals: Optional[TechnicalData] = None, news: Iterable[NewsItem] = (),
+            outputs: Iterable[AgentOutput] = (), at: Optional[float] = None):
+        at = time.time() if at is None else at
+        with self._lock:
+            if technicals is not None:
+                self.technicals.append(technicals, at=at)
+            for item in news:
+                self.news.append(item, at=at, ticker=ticker)
+            for output in outputs:
+                self.outputs.append(output, at=at, ticker=ticker)
+
+    def nbytes(self) -> int:
+        return sum(table.nbytes() for table in self._tables().values())
+
+    def save(self, directory: str):
+        """Write the tables that gained rows since they were loaded or last saved.
+
+        Under the directory's lock file: if another process saved a table
+        since this store read it, its rows are reloaded and only the rows
+        added here are appended, so concurrent runs never drop each other's rows.
+        """
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, _locked(directory):
+            for name, table in self._tables().items():
+                if not table.dirty:
+                    continue
+                path = os.path.join(directory, name)
+                on_disk = _saved_rows(path)
+                if on_disk is None or on_disk == table.saved_rows:
+                    table.save(path)
+                    continue
+                merged = ColumnarTable.load(path, _TABLES[name][1])
+                merged.append_rows(table, table.saved_rows)
+                merged.save(path)
+                setattr(self, name, merged)
+
+    @classmethod
+    def open(cls, directory: str) -> 'SnapshotStore':
+        """Load the store saved in directory, or start an empty one"""
+        return cls.load(directory) if os.path.isdir(directory) else cls()
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'SnapshotStore':
+        # Under the lock, so a concurrent save cannot swap some column files mid-read
+        with _locked(directory):
+            return cls({name: ColumnarTable.load(os.path.join(directory, name), row_type, mmap)
+                        for name, (_, row_type) in _TABLES.items() if os.path.isdir(os.path.join(directory, name))})
+
+    def save_arrow(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        for name, table in self._tables().items():
+            table.save_arrow(os.path.join(directory, f"{name}.arrow"))
+
+    @classmethod
+    def load_arrow(cls, directory: str) -> 'SnapshotStore':
+        return cls({name: ColumnarTable.load_arrow(os.path.join(directory, f"{name}.arrow"), row_type)
+                    for name, (_, row_type) in _TABLES.items() if os.path.exists(os.path.join(directory, f"{name}.arrow"))})
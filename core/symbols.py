@@ -0,0 +1,122 @@
+"""Local symbol directory: ticker, company name, exchange, aliases and exclusion terms.
+
+Read from a CSV (Config.SYMBOLS_PATH, data/symbols.csv by default) on first
+use. Exact lookups are a dict hit; prefix search (for autocomplete) bisects
+a sorted list of lower-cased tickers, names and aliases, so both stay fast
+however many symbols the file holds.
+"""
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Tuple
+import csv
+import re
+import threading
+
+@dataclass(frozen=True)
+class Symbol:
+    ticker: str
+    name: str
+    exchange: str
+    aliases: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()  # headline terms that mean a different subject ('hapag-lloyd' for Lloyds)
+
+    @property
+    def mentions(self) -> List[str]:
+        """Lower-cased names a relevant headline is expected to contain"""
+        return list(dict.fromkeys(n.lower() for n in (self.name, *self.aliases)))
+
+    @cached_property
+    def mention_pattern(self) -> Optional[re.Pattern]:
+        """Any of mentions as a whole word ('bp' matches "BP shares", not "50bps")"""
+        return _word_pattern(self.mentions)
+
+    @cached_property
+    def exclude_pattern(self) -> Optional[re.Pattern]:
+        return _word_pattern(self.exclude)
+
+def _word_pattern(terms: Iterable[str]) -> Optional[re.Pattern]:
+    # Lookarounds rather than \b, so terms that start or end in '&' or '.' still match
+    terms = sorted(set(terms), key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile(r'(?<!\w)(?:' + '|'.join(map(re.escape, terms)) + r')(?!\w)', re.IGNORECASE)
+
+def _split(field: Optional[str]) -> Tuple[str, ...]:
+    return tuple(part.strip() for part in (field or '').split('|') if part.strip())
+
+class SymbolDirectory:
+    def __init__(self, path: str):
+        self.path = path
+        self._by_ticker: Optional[Dict[str, Symbol]] = None
+        self._keys: List[str] = []  # sorted search keys, parallel to _targets
+        self._targets: List[str] = []
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Symbol]:
+        if self._by_ticker is not None:
+            return self._by_ticker
+        with self._lock:
+            if self._by_ticker is None:
+                by_ticker = {}
+                with open(self.path, newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        ticker = row['ticker'].strip().upper()
+                        by_ticker[ticker] = Symbol(ticker, row['name'].strip(), row.get('exchange', '').strip(),
+                                                   _split(row.get('aliases')), tuple(t.lower() for t in _split(row.get('exclude'))))
+                entries = sorted({(key.lower(), symbol.ticker)
+                                  for symbol in by_ticker.values()
+                                  for key in (symbol.ticker, symbol.name, *symbol.aliases)})
+                self._keys = [key for key, _ in entries]
+                self._targets = [ticker for _, ticker in entries]
+                self._by_ticker = by_ticker
+        return self._by_ticker
+
+    def get(self, ticker: str) -> Optional[Symbol]:
+        return self._load().get(ticker.strip().upper())
+
+    def __contains__(self, ticker: str) -> bool:
+        return self.get(ticker) is not None
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def search(self, prefix: str, limit: int = 10) -> List[Symbol]:
+        """Symbols whose ticker, name or an alias starts with prefix (case-insensitive), exact tickers first"""
+        by_ticker = self._load()
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        found = {}
+        exact = by_ticker.get(prefix.upper())
+        if exact:
+            found[exact.ticker] = exact
+        for i in range(bisect_left(self._keys, prefix), len(self._keys)):
+            if len(found) >= limit or not self._keys[i].startswith(prefix):
+                break
+            found.setdefault(self._targets[i], by_ticker[self._targets[i]])
+        return list(found.values())
+
+_directory: Optional[SymbolDirectory] = None
+
+def directory() -> SymbolDirectory:
+    """The shared directory for Config.SYMBOLS_PATH (the file is read on the first lookup)"""
+    global _directory
+    if _directory is None:
+        from config import Config
+        _directory = SymbolDirectory(Config.SYMBOLS_PATH)
+    return _directory
+
+def lookup(ticker: str) -> Optional[Symbol]:
+    """Exact symbol for ticker, or None when it is not in the directory (or the file is missing)"""
+    try:
+        return directory().get(ticker)
+    except OSError:
+        return None
+
+def search(prefix: str, limit: int = 10) -> List[Symbol]:
+    """Prefix matches from the shared directory; empty when the file is missing"""
+    try:
+        return directory().search(prefix, limit)
+    except OSError:
+        return []
@@ -0,0 +1,34 @@
+from concurrent.futures import Future
+from typing import Any, Awaitable, Optional
+import asyncio
+import threading
+
+class AnalysisWorker:
+    """A long-lived event loop on a background thread.
+
+    Callers on other threads (the Streamlit script thread, HTTP handler
+    threads) submit coroutines and get a concurrent.futures.Future back, so
+    they can poll or wait without running asyncio themselves. Keeping one
+    loop alive also lets loop-bound clients (httpx/Groq) be reused.
+    """
+
+    def __init__(self, name: str = 'analysis-worker'):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Awaitable[Any]) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Submit and block the calling thread until the result is ready"""
+        return self.submit(coro).result(timeout)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
 @dataclass
@@ -20,6 +20,9 @@ class AgentOutput:
     success: bool
 
 class IAgent(ABC):
+    # Optional AsyncGroq client; when unset a per-event-loop shared client is used
+    client = None
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -38,11 +41,27 @@ class IAgent(ABC):
     def parse_response(self, response: str) -> AgentOutput:
         pass
     
+    # What pipelines.screening asks this agent to judge for each ticker in a batched prompt
+    screen_task: Optional[str] = None
+    
+    def build_compact_block(self, input: AgentInput) -> Optional[str]:
+        """A few lines summarising this ticker's inputs for a multi-ticker screening prompt.
+
+        None when the agent has no compact form or nothing to screen for this
+        ticker; such agents are skipped by pipelines.screening.
+        """
+        return None
+    
     async def execute(self, input: AgentInput) -> AgentOutput:
+        from core.metrics import metrics
         try:
-            prompt = self.build_prompt(input)
-            response = await self._call_groq(prompt)
-            return self.parse_response(response)
+            with metrics.span('agent.prompt', agent=self.name):
+                prompt = self.build_prompt(input)
+            with metrics.span('agent.llm', agent=self.name, model=self.model) as span:
+                span['ticker'] = input.ticker
+                response = await self._call_groq(prompt)
+            with metrics.span('agent.parse', agent=self.name):
+                return self.parse_response(response)
         except Exception as e:
             return AgentOutput(
                 agent_name=self.name,
@@ -52,15 +71,38 @@ class IAgent(ABC):
                 success=False
             )
     
-    async def _call_groq(self, prompt: str) -> str:
-        from groq import AsyncGroq
-        from config import Config
+    async def _call_groq(self, prompt: str, max_tokens: int = 1000) -> str:
+        from core import singleflight
+        from core.metrics import metrics
+        # Identical prompts already in flight for this model share one completion
+        content, usage = await singleflight.group('llm').do_async((self.model, prompt, max_tokens),
+                                                              lambda: self._request_completion(prompt, max_tokens))
+        metrics.annotate(**usage)
+        return content
+    
+    async def _request_completion(self, prompt: str, max_tokens: int = 1000) -> Tuple[str, Dict[str, int]]:
+        from core.llm import get_client
+        from core.metrics import metrics
+        from core.deadline import current
         
-        client = AsyncGroq(api_key=Config.GROQ_API_KEY)
-        response = await client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=1000
-        )
-        return response.choices[0].message.content
\ No newline at end of file
+        client = self.client or get_client()
+        # Inside a pipeline stage, bound the HTTP request by the stage's remaining time rather than the
+        # client default; the extra second leaves the cancellation (and its timed_out record) to the stage
+        deadline = current()
+        extra = {'timeout': deadline.remaining() + 1.0} if deadline else {}
+        with metrics.span('llm.request', model=self.model) as span:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2,
+                max_tokens=max_tokens,
+                **extra
+            )
+            usage = {
+                'prompt_tokens': getattr(response.usage, 'prompt_tokens', 0) or 0,
+                'completion_tokens': getattr(response.usage, 'completion_tokens', 0) or 0,
+            }
+            span.update(usage)
+        metrics.incr('llm_tokens_total', usage['prompt_tokens'], model=self.model, kind='prompt')
+        metrics.incr('llm_tokens_total', usage['completion_tokens'], model=self.model, kind='completion')
+        return response.choices[0].message.content, usage
\ No newline at end of file
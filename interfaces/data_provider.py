@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Dict
 from dataclasses import dataclass
 
 @dataclass
@@ -9,14 +9,20 @@ class PriceData:
     currency: str
     timestamp: str
     change_pct: Optional[float] = None
+    previous_close: Optional[float] = None
+    day_low: Optional[float] = None
+    day_high: Optional[float] = None
+    year_low: Optional[float] = None
+    year_high: Optional[float] = None
+    volume: Optional[float] = None
 
 @dataclass
 class TechnicalData:
     ticker: str
     current: float
-    sma20: float
-    sma50: float
-    rsi: float
+    sma20: Optional[float]
+    sma50: Optional[float]
+    rsi: Optional[float]
     trend: str
     support: float
     resistance: float
@@ -34,6 +40,8 @@ class TechnicalData:
     volume_sma20: Optional[float] = None
     atr: Optional[float] = None
     stoch_rsi: Optional[float] = None
+    # Same indicators on other bar sizes ('1h', '1d', '1wk', ...), when the provider supplies them
+    timeframes: Optional[Dict[str, 'TechnicalData']] = None
 
 @dataclass
 class NewsItem:
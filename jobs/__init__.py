@@ -0,0 +1,3 @@
+from jobs.queue import JobQueue, Job
+
+__all__ = ['JobQueue', 'Job']
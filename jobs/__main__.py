@@ -0,0 +1,72 @@
+"""Job queue CLI.
+
+    python -m jobs enqueue --queue jobs.db --tickers universe.txt --batch nightly
+    python -m jobs work --queue jobs.db --processes 4 --concurrency 3
+    python -m jobs status --queue jobs.db --batch nightly
+    python -m jobs retry --queue jobs.db
+"""
+import argparse
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m jobs', description="Durable analysis job queue")
+    parser.add_argument('--queue', default=Config.JOB_QUEUE_PATH, help="SQLite queue file")
+    parser.add_argument('--no-wal', action='store_true', help="Rollback journal instead of WAL (network filesystems)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = commands.add_parser('enqueue', help="Add analysis jobs")
+    enqueue.add_argument('--tickers', required=True, help="Comma-separated tickers or a file with one per line")
+    enqueue.add_argument('--question', default="Technical outlook")
+    enqueue.add_argument('--batch', help="Label for grouping progress and results")
+    enqueue.add_argument('--max-attempts', type=int, default=Config.JOB_MAX_ATTEMPTS)
+
+    work = commands.add_parser('work', help="Run worker processes against the queue")
+    work.add_argument('--processes', type=int, default=1)
+    work.add_argument('--concurrency', type=int, default=Config.BATCH_CONCURRENCY, help="Analyses in flight per process")
+    work.add_argument('--forever', action='store_true', help="Keep polling after the queue is drained")
+    work.add_argument('--sink', default=Config.OUTPUT_SINK, metavar='KIND:PATH', help="Also write results to a sink")
+    work.add_argument('--batch', help="Report progress for this batch only")
+
+    status = commands.add_parser('status', help="Show queue progress")
+    status.add_argument('--batch')
+    status.add_argument('--json', action='store_true')
+
+    retry = commands.add_parser('retry', help="Re-queue failed jobs")
+    retry.add_argument('--batch')
+
+    args = parser.parse_args(argv)
+    wal = not args.no_wal
+
+    if args.command == 'work':
+        if not Config.validate():
+            return 1
+        from jobs.worker import run_workers
+        run_workers(args.queue, args.processes, args.concurrency, exit_when_empty=not args.forever,
+                    wal=wal, sink=args.sink or None, batch=args.batch)
+        return 0
+
+    from jobs.queue import JobQueue
+    from jobs.worker import format_progress
+    queue = JobQueue(args.queue, wal=wal)
+    try:
+        if args.command == 'enqueue':
+            from main import parse_tickers
+            added = queue.enqueue(parse_tickers(args.tickers), args.question, args.batch, args.max_attempts)
+            print(f"➕ Queued {added} job(s) in {args.queue}")
+        elif args.command == 'status':
+            progress = queue.progress(args.batch)
+            print(json.dumps(progress) if args.json else format_progress(progress))
+        elif args.command == 'retry':
+            print(f"🔁 Re-queued {queue.retry_failed(args.batch)} failed job(s)")
+    finally:
+        queue.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Durable analysis job queue in a single SQLite file.
+
+Workers claim jobs with a lease (BEGIN IMMEDIATE makes the claim atomic
+across processes) and extend it with heartbeats while the analysis runs.
+A worker that crashes simply stops heartbeating; once its lease expires
+the job is claimed again, up to max_attempts. A failed attempt goes back
+to the queue with a not_before time that doubles with each attempt, so a
+burst of 429s or a provider outage does not use up every attempt at once.
+
+WAL mode is used by default. It needs shared memory, so for workers on
+several hosts sharing a network filesystem open the queue with wal=False.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch TEXT,
+    ticker TEXT NOT NULL,
+    question TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_until REAL,
+    not_before REAL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_lease ON jobs (status, lease_until);
+CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs (batch, status);
+"""
+
+@dataclass
+class Job:
+    id: int
+    ticker: str
+    question: str
+    attempts: int
+    max_attempts: int
+    batch: Optional[str] = None
+
+class JobQueue:
+    """One connection per instance, serialised by a lock so worker threads can share it"""
+
+    def __init__(self, path: str, lease_seconds: float = None, wal: bool = True, retry_delay: float = None):
+        from config import Config
+        self.path = path
+        self.lease_seconds = lease_seconds or Config.JOB_LEASE_SECONDS
+        self.retry_delay = Config.JOB_RETRY_DELAY if retry_delay is None else retry_delay
+        # Autocommit mode so transactions are exactly the BEGIN IMMEDIATE blocks below
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode=%s" % ('WAL' if wal else 'DELETE'))
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.executescript(SCHEMA)
+        columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if 'not_before' not in columns:
+            # Queue files created before retry backoff existed
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN not_before REAL")
+
+    def close(self):
+        self._conn.close()
+
+    def _transaction(self):
+        conn, lock = self._conn, self._lock
+
+        class _Tx:
+            def __enter__(self):
+                lock.acquire()
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                except BaseException:
+                    lock.release()
+                    raise
+                return conn
+
+            def __exit__(self, exc_type, *args):
+                try:
+                    conn.execute("ROLLBACK" if exc_type else "COMMIT")
+                finally:
+                    lock.release()
+
+        return _Tx()
+
+    def enqueue(self, tickers: List[str], question: str = "Technical outlook",
+                batch: str = None, max_attempts: int = None) -> int:
+        from config import Config
+        now = time.time()
+        rows = [(batch, t, question, max_attempts or Config.JOB_MAX_ATTEMPTS, now) for t in tickers]
+        with self._transaction() as conn:
+            conn.executemany("INSERT INTO jobs (batch, ticker, question, max_attempts, enqueued_at) "
+                             "VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Lease the oldest queued (or lease-expired) job to worker, or None if there is nothing to do yet"""
+        while True:
+            now = time.time()
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE (status = 'queued' AND (not_before IS NULL OR not_before <= ?)) "
+                    "OR (status = 'running' AND lease_until < ?) ORDER BY id LIMIT 1", (now, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row['attempts'] >= row['max_attempts']:
+                    # Its last worker died mid-run and it has no attempts left
+                    conn.execute("UPDATE jobs SET status = 'failed', finished_at = ?, worker = NULL, "
+                                 "error = COALESCE(error, 'lease expired') WHERE id = ?", (now, row['id']))
+                    continue
+                conn.execute("UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, "
+                             "lease_until = ?, started_at = ? WHERE id = ?",
+                             (worker, now + self.lease_seconds, now, row['id']))
+                return Job(row['id'], row['ticker'], row['question'], row['attempts'] + 1,
+                           row['max_attempts'], row['batch'])
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Extend the lease; False means the job was reclaimed and the result should be dropped"""
+        with self._transaction() as conn:
+            cursor = conn.execute("UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                                  (time.time() + self.lease_seconds, job_id, worker))
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, record: Dict[str, Any]) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, lease_until = NULL, error = NULL, result = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time(), json.dumps(record, default=str), job_id, worker))
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """Record a failed attempt: back to the queue after a backoff while attempts remain, otherwise failed"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+                "finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END, "
+                "not_before = ? + ? * (1 << (attempts - 1)), "
+                "worker = NULL, lease_until = NULL, error = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (now, now, self.retry_delay, error, job_id, worker))
+        return cursor.rowcount == 1
+
+    def retry_failed(self, batch: str = None) -> int:
+        """Give failed jobs a fresh set of attempts"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, finished_at = NULL, not_before = NULL "
+                "WHERE status = 'failed' AND (? IS NULL OR batch = ?)", (batch, batch))
+        return cursor.rowcount
+
+    def counts(self, batch: str = None) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs WHERE ? IS NULL OR batch = ? GROUP BY status", (batch, batch)
+            ).fetchall()
+        counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+        counts.update({row['status']: row['n'] for row in rows})
+        return counts
+
+    def progress(self, batch: str = None) -> Dict[str, Any]:
+        counts = self.counts(batch)
+        total = sum(counts.values())
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(enqueued_at) AS first, MAX(finished_at) AS last, "
+                "COUNT(DISTINCT CASE WHEN status = 'running' THEN worker END) AS workers "
+                "FROM jobs WHERE ? IS NULL OR batch = ?", (batch, batch)
+            ).fetchone()
+        finished = counts['done'] + counts['failed']
+        elapsed = (row['last'] - row['first']) if finished and row['last'] else 0.0
+        rate = finished / elapsed if elapsed > 0 else 0.0
+        remaining = total - finished
+        return {
+            **counts,
+            'total': total,
+            'percent': round(finished / total * 100, 1) if total else 100.0,
+            'rate_per_min': round(rate * 60, 1),
+            'eta_seconds': round(remaining / rate) if rate and remaining else None,
+            'active_workers': row['workers'],
+        }
+
+    def results(self, batch: str = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM jobs WHERE status = 'done' AND (? IS NULL OR batch = ?) ORDER BY id", (batch, batch)
+            ).fetchall()
+        return [json.loads(row['result']) for row in rows]
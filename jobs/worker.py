@@ -0,0 +1,118 @@
+"""Worker processes that drain a JobQueue through FullAnalysisPipeline.
+
+Each process runs one event loop with `concurrency` analyses in flight,
+so total parallelism is processes x concurrency. Start more processes on
+this or another host (pointing at the same queue file) to scale out.
+"""
+from typing import Optional
+import asyncio
+import multiprocessing
+import os
+import socket
+import time
+
+from config import Config
+from jobs.queue import JobQueue, Job
+
+class QueueWorker:
+    def __init__(self, queue_path: str, worker_id: str = None, concurrency: int = None,
+                 exit_when_empty: bool = False, wal: bool = True, sink: str = None):
+        self.queue_path = queue_path
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = concurrency or Config.BATCH_CONCURRENCY
+        self.exit_when_empty = exit_when_empty
+        self.wal = wal
+        self.sink_spec = sink
+        self.processed = 0
+
+    async def run(self):
+        from main import build_pipeline
+        self.queue = JobQueue(self.queue_path, wal=self.wal)
+        sink = None
+        if self.sink_spec:
+            from outputs.sinks import create_sink
+            sink = create_sink(self.sink_spec)
+            if not sink.initialize():
+                sink = None
+        # Results are stored in the queue itself; a sink is an optional extra copy
+        self.pipeline = build_pipeline(sink)
+        try:
+            await asyncio.gather(*[self._slot(i) for i in range(self.concurrency)])
+        finally:
+            if sink:
+                sink.close()
+            self.queue.close()
+
+    async def _slot(self, index: int):
+        worker = f"{self.worker_id}/{index}"
+        while True:
+            job = await asyncio.to_thread(self.queue.claim, worker)
+            if job is None:
+                if self.exit_when_empty and not await asyncio.to_thread(self._pending):
+                    return
+                await asyncio.sleep(Config.JOB_POLL_INTERVAL)
+                continue
+            await self._process(job, worker)
+
+    def _pending(self) -> bool:
+        counts = self.queue.counts()
+        return counts['queued'] + counts['running'] > 0
+
+    async def _process(self, job: Job, worker: str):
+        heartbeat = asyncio.create_task(self._heartbeat(job, worker))
+        try:
+            result = await self.pipeline.run(job.ticker, job.question)
+        except Exception as e:
+            await asyncio.to_thread(self.queue.fail, job.id, worker, f"{type(e).__name__}: {e}")
+            return
+        finally:
+            heartbeat.cancel()
+        if result.success:
+            await asyncio.to_thread(self.queue.complete, job.id, worker, result.to_record())
+        else:
+            await asyncio.to_thread(self.queue.fail, job.id, worker, result.error or 'analysis failed')
+        self.processed += 1
+
+    async def _heartbeat(self, job: Job, worker: str):
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            if not await asyncio.to_thread(self.queue.heartbeat, job.id, worker):
+                return  # reclaimed after a stall; complete()/fail() will be ignored
+
+def _process_main(queue_path: str, concurrency: int, exit_when_empty: bool, wal: bool, sink: Optional[str]):
+    import contextlib
+    worker = QueueWorker(queue_path, concurrency=concurrency, exit_when_empty=exit_when_empty, wal=wal, sink=sink)
+    # Pipeline progress lines from N processes interleave into noise; the parent reports progress instead.
+    # Discarded rather than buffered, so a --forever worker does not accumulate them in memory
+    if Config.JOB_VERBOSE:
+        asyncio.run(worker.run())
+        return
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        asyncio.run(worker.run())
+
+def run_workers(queue_path: str, processes: int = 1, concurrency: int = None, exit_when_empty: bool = True,
+                wal: bool = True, sink: str = None, report_every: float = 5.0, batch: str = None):
+    """Start worker processes and print queue progress until they exit"""
+    children = [multiprocessing.Process(target=_process_main, name=f"analysis-worker-{i}",
+                                        args=(queue_path, concurrency, exit_when_empty, wal, sink))
+                for i in range(processes)]
+    for child in children:
+        child.start()
+    queue = JobQueue(queue_path, wal=wal)
+    try:
+        while any(child.is_alive() for child in children):
+            print(format_progress(queue.progress(batch)))
+            for child in children:
+                child.join(timeout=report_every / len(children))
+        print(format_progress(queue.progress(batch)))
+    except KeyboardInterrupt:
+        for child in children:
+            child.terminate()
+    finally:
+        queue.close()
+
+def format_progress(p) -> str:
+    eta = f", ETA {p['eta_seconds'] // 60}m{p['eta_seconds'] % 60:02d}s" if p['eta_seconds'] else ''
+    return (f"📦 {p['done'] + p['failed']}/{p['total']} ({p['percent']}%) - "
+            f"{p['done']} done, {p['failed']} failed, {p['running']} running on {p['active_workers']} slot(s), "
+            f"{p['queued']} queued - {p['rate_per_min']}/min{eta}")
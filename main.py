@@ -1,56 +1,210 @@
+import argparse
 import asyncio
+import os
+from typing import List
 from config import Config
-
-from connectors.yahoo import YahooConnector
-from connectors.google_finance import GoogleFinanceConnector
-from connectors.news import NewsConnector
-from agents.chart_master import ChartMaster
-from agents.news_hound import NewsHound
-from agents.signal_pro import SignalPro
-from agents.director import Director
-from pipelines.full_analysis import FullAnalysisPipeline
 from outputs.console import ConsoleOutput
+from interfaces.output_handler import IOutputHandler
+
+# Connectors, agents and the pipeline are resolved through core.registry and
+# imported only when an analysis actually runs, so the menu (and "Exit")
+# never pays for yfinance/pandas.
+
+def build_pipeline(output_handler: IOutputHandler = None, snapshot_store=None):
+    from core import registry
+    from pipelines.full_analysis import FullAnalysisPipeline
+    data_providers = [registry.connectors.create(name) for name in Config.DEFAULT_CONNECTORS]
+    agents = [registry.agents.create(name) for name in Config.DEFAULT_AGENTS]
+    change_gate = None
+    if Config.CHANGE_GATE:
+        from pipelines.change_gate import ChangeGate
+        change_gate = ChangeGate()
+    portfolio = None
+    history_source = next((p for p in data_providers if hasattr(p, 'get_histories')), None)
+    if Config.PORTFOLIO_CONTEXT and Config.WATCHLIST and history_source:
+        from portfolio import PortfolioContext
+        portfolio = PortfolioContext(Config.WATCHLIST, history_source.get_histories)
+    return FullAnalysisPipeline(data_providers, agents, output_handler or ConsoleOutput(), change_gate, snapshot_store,
+                                portfolio)
 
-async def run_full_analysis():
+def print_stage_timings():
+    from core.metrics import metrics
+    print("⏱ Stage timings:")
+    for stage, stat in sorted(metrics.summary().items()):
+        print(f"  {stage}: {stat['total']:.2f}s over {stat['count']} call(s)")
+
+async def run_full_analysis(ticker: str, question: str, output_handler: IOutputHandler = None, snapshot_store=None,
+                            deadline: float = None):
     print("\n" + "="*60)
     print("FULL 4-AGENT ANALYSIS")
     print("="*60)
-    
-    data_providers = [YahooConnector(), NewsConnector()]
-    agents = [ChartMaster(), NewsHound(), SignalPro(), Director()]
-    
-    pipeline = FullAnalysisPipeline(data_providers, agents, ConsoleOutput())
-    
-    ticker = input("\nEnter ticker: ").strip() or "LLOY.L"
-    question = input("Your question: ").strip() or "Technical outlook"
-    
-    result = await pipeline.run(ticker, question)
-    
+
+    pipeline = build_pipeline(output_handler, snapshot_store)
+    result = await pipeline.run(ticker, question, deadline)
+
+    if result.timed_out:
+        print(f"\n⏱ Timed out: {', '.join(result.timed_out)}")
     if result.success:
         print(f"\n✅ Analysis complete for {ticker}")
         ConsoleOutput.print_director_box(result.outputs['Director'].content, ticker)
     else:
         print(f"\n❌ Error: {result.error}")
 
-def main():
+    print_stage_timings()
+
+async def run_batch(tickers: List[str], question: str, output_handler: IOutputHandler = None, snapshot_store=None,
+                    deadline: float = None):
+    print("\n" + "="*60)
+    print(f"BATCH ANALYSIS - {len(tickers)} tickers")
+    print("="*60)
+
+    pipeline = build_pipeline(output_handler, snapshot_store)
+    limit = asyncio.Semaphore(Config.BATCH_CONCURRENCY)
+
+    async def analyse(ticker: str):
+        async with limit:
+            return await pipeline.run(ticker, question, deadline)
+
+    results = await asyncio.gather(*[analyse(t) for t in tickers])
+    for result in results:
+        director = result.outputs.get('Director')
+        if result.success and director:
+            answer = next((line for line in director.content.splitlines() if line.startswith('Answer:')), 'Answer: n/a')
+            late = f" [timed out: {', '.join(result.timed_out)}]" if result.timed_out else ''
+            print(f"✅ {result.ticker}: {answer[7:].strip()} ({director.confidence}/10){late}")
+        else:
+            print(f"❌ {result.ticker}: {result.error}")
+
+    print_stage_timings()
+
+async def run_screen(tickers: List[str], question: str, output_handler: IOutputHandler = None):
+    from core import registry
+    from pipelines.screening import ScreeningPipeline
+    print("\n" + "="*60)
+    print(f"SCREENING - {len(tickers)} tickers")
+    print("="*60)
+
+    pipeline = ScreeningPipeline([registry.connectors.create(name) for name in Config.DEFAULT_CONNECTORS],
+                                 [registry.agents.create(name) for name in Config.SCREEN_AGENTS], output_handler)
+    for result in await pipeline.screen(tickers, question):
+        if not result.success:
+            print(f"❌ {result.ticker}: {result.error}")
+            continue
+        for name, output in result.outputs.items():
+            summary = next((line for line in output.content.splitlines() if line.startswith('[SUMMARY]')), '[SUMMARY] n/a')
+            print(f"✅ {result.ticker} {name}: {summary[9:].strip()} ({output.confidence}/10)")
+
+    print_stage_timings()
+
+def parse_tickers(spec: str) -> List[str]:
+    """Comma-separated tickers, or a file path with one ticker per line"""
+    if os.path.isfile(spec):
+        with open(spec, encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return [t.strip() for t in spec.split(',') if t.strip()]
+
+def run(coro_factory, profile_dir: str = None):
+    if profile_dir:
+        from core.profiling import run_profiled
+        return run_profiled(coro_factory, profile_dir)
+    return asyncio.run(coro_factory())
+
+def run_service(port: int, watchlist: List[str], output_handler: IOutputHandler = None, snapshot_store=None):
+    import threading
+    from core.service import AnalysisService
+    service = AnalysisService(build_pipeline(output_handler, snapshot_store), watchlist=watchlist).start()
+    server = service.serve(port=port)
+    print(f"🛰 Serving analyses at http://{Config.SERVICE_HOST}:{port} "
+          f"(concurrency {service.concurrency}, queue {service.queue_size})")
+    if watchlist:
+        print(f"🔁 Refreshing watchlist: {', '.join(watchlist)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.shutdown()
+        service.stop()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="4-Agent Stock AI")
+    parser.add_argument('--ticker', help="Analyse one ticker without the menu")
+    parser.add_argument('--question', default="Technical outlook")
+    parser.add_argument('--batch', metavar='TICKERS', help="Comma-separated tickers or a file with one per line")
+    parser.add_argument('--screen', metavar='TICKERS',
+                        help="Screen many tickers with batched ChartMaster/NewsHound prompts (comma-separated or a file)")
+    parser.add_argument('--sink', default=Config.OUTPUT_SINK, metavar='KIND:PATH',
+                        help="Persist results: sqlite:, jsonl:, parquet:<dir>, sheets:<spreadsheet key> or sheets-local:<csv>")
+    parser.add_argument('--serve', action='store_true', help="Run the analysis service (local HTTP/JSON API)")
+    parser.add_argument('--port', type=int, default=Config.SERVICE_PORT)
+    parser.add_argument('--watchlist', metavar='TICKERS',
+                        help="Tickers the service refreshes while their exchange is open (default: STOCK_AI_WATCHLIST)")
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                        help="Time limit per analysis, split across data and agent stages (default: STOCK_AI_DEADLINE, 0 for none)")
+    parser.add_argument('--profile', nargs='?', const='profiles', metavar='DIR',
+                        help="Run under cProfile/tracemalloc and write reports to DIR (default: profiles)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
     print("\n" + "="*60)
     print("🤖 4-AGENT STOCK AI - MODULAR EDITION")
     print("="*60)
-    
+
     if not Config.validate():
         print("\n⚠️ Configuration error. Check .env file.")
         return
-    
+
+    from core.metrics import start_exporters
+    start_exporters()
+
+    sink = None
+    if args.sink:
+        from outputs.sinks import create_sink
+        sink = create_sink(args.sink)
+        if not sink.initialize():
+            return
+    snapshots = None
+    if Config.SNAPSHOT_DIR:
+        from core.snapshots import SnapshotStore
+        snapshots = SnapshotStore.open(Config.SNAPSHOT_DIR)
+    try:
+        dispatch(args, sink, snapshots)
+    finally:
+        if sink:
+            sink.close()
+        if snapshots:
+            snapshots.save(Config.SNAPSHOT_DIR)
+
+def dispatch(args, sink: IOutputHandler = None, snapshots=None):
+    if args.serve:
+        watchlist = parse_tickers(args.watchlist) if args.watchlist else Config.WATCHLIST
+        run_service(args.port, watchlist, sink, snapshots)
+        return
+    if args.screen:
+        tickers = parse_tickers(args.screen)
+        run(lambda: run_screen(tickers, args.question, sink), args.profile)
+        return
+    if args.batch:
+        tickers = parse_tickers(args.batch)
+        run(lambda: run_batch(tickers, args.question, sink, snapshots, args.deadline), args.profile)
+        return
+    if args.ticker:
+        run(lambda: run_full_analysis(args.ticker, args.question, sink, snapshots, args.deadline), args.profile)
+        return
+
     print("\n1. Full Analysis (4 Agents)")
     print("2. Run Streamlit Web App")
     print("3. Exit")
-    
+
     choice = input("\nSelect option: ").strip()
-    
+
     if choice == "1":
-        asyncio.run(run_full_analysis())
+        ticker = input("\nEnter ticker: ").strip() or "LLOY.L"
+        question = input("Your question: ").strip() or "Technical outlook"
+        run(lambda: run_full_analysis(ticker, question, sink, snapshots, args.deadline), args.profile)
     elif choice == "2":
-        import os
         os.system("streamlit run presentation/streamlit_app.py")
     elif choice == "3":
         print("\nGoodbye!")
@@ -58,4 +212,4 @@ def main():
         print("\nInvalid option")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
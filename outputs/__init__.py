@@ -0,0 +1,10 @@
+from outputs.console import ConsoleOutput
+from outputs.buffered import BufferedOutputHandler
+from outputs.jsonl import JsonlOutput
+from outputs.sqlite import SQLiteOutput
+from outputs.parquet import ParquetOutput
+from outputs.google_sheets import GoogleSheetsOutput, GspreadBackend, LocalSheetBackend
+from outputs.sinks import create_sink
+
+__all__ = ['ConsoleOutput', 'BufferedOutputHandler', 'JsonlOutput', 'SQLiteOutput', 'ParquetOutput',
+           'GoogleSheetsOutput', 'GspreadBackend', 'LocalSheetBackend', 'create_sink']
\ No newline at end of file
@@ -1,3 +0,0 @@
-from outputs.console import ConsoleOutput
-
-__all__ = ['ConsoleOutput']
\ No newline at end of file
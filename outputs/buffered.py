@@ -0,0 +1,111 @@
+from interfaces.output_handler import IOutputHandler
+from typing import List, Dict, Any, Optional
+from abc import abstractmethod
+import queue
+import threading
+import time
+
+_STOP = object()
+
+class BufferedOutputHandler(IOutputHandler):
+    """Base for sinks that persist records in batches from a background thread.
+
+    write()/write_batch() only enqueue, so callers on the event loop never
+    wait on disk. The flusher thread owns the underlying file or connection
+    (_open/_flush/_close all run on it) and flushes whenever batch_size
+    records are pending or flush_interval seconds have passed.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, flush_interval: Optional[float] = None):
+        from config import Config
+        self.batch_size = batch_size or Config.SINK_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.SINK_FLUSH_INTERVAL
+        self._queue = queue.Queue()
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+        self.written = 0
+
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    @abstractmethod
+    def _open(self):
+        pass
+
+    @abstractmethod
+    def _flush(self, records: List[Dict[str, Any]]):
+        pass
+
+    def _close(self):
+        pass
+
+    def initialize(self) -> bool:
+        if self._thread:
+            return self._error is None
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-flusher", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            print(f"✗ {self.name} failed to open: {self._error}")
+            return False
+        return True
+
+    def write(self, ticker: str, data: Dict[str, Any]) -> bool:
+        if not self._thread and not self.initialize():
+            return False
+        if self._error is not None or not self._thread.is_alive():
+            # The flusher failed to open (or has stopped); nothing would ever drain the queue
+            return False
+        self._queue.put({'ticker': ticker, **data})
+        return True
+
+    def write_batch(self, data: List[Dict[str, Any]]) -> bool:
+        return all([self.write(record.get('ticker', ''), record) for record in data])
+
+    def close(self):
+        if not self._thread:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        try:
+            self._open()
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        pending = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is _STOP:
+                    stopping = True
+                else:
+                    pending.append(item)
+            except queue.Empty:
+                pass
+            if pending and (stopping or len(pending) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush_pending(pending)
+                pending = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+        try:
+            self._close()
+        except Exception as e:
+            print(f"✗ {self.name} close failed: {e}")
+
+    def _flush_pending(self, records: List[Dict[str, Any]]):
+        try:
+            self._flush(records)
+            self.written += len(records)
+        except Exception as e:
+            print(f"✗ {self.name} dropped {len(records)} records: {e}")
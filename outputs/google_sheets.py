@@ -0,0 +1,177 @@
+from outputs.buffered import BufferedOutputHandler
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+import csv
+import os
+import re
+import time
+
+def column_letter(index: int) -> str:
+    """1-based column index to A1 letters (1 -> A, 27 -> AA)"""
+    letters = ''
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+class QuotaExceeded(Exception):
+    """Raised by a backend when the Sheets API answers 429"""
+
+class SheetsBackend(ABC):
+    @abstractmethod
+    def open(self):
+        pass
+
+    @abstractmethod
+    def used_rows(self) -> int:
+        """Number of rows already holding data (header included)"""
+        pass
+
+    @abstractmethod
+    def ensure_rows(self, rows: int):
+        """Grow the sheet grid so it has at least this many rows"""
+        pass
+
+    @abstractmethod
+    def update(self, range_a1: str, values: List[List[Any]]):
+        pass
+
+class GspreadBackend(SheetsBackend):
+    """Real Google Sheets via gspread and a service-account credentials file"""
+
+    def __init__(self, spreadsheet_key: str, worksheet: str, credentials_file: str):
+        self.spreadsheet_key = spreadsheet_key
+        self.worksheet_name = worksheet
+        self.credentials_file = credentials_file
+        self._ws = None
+
+    def open(self):
+        import gspread
+        client = gspread.service_account(filename=self.credentials_file)
+        spreadsheet = client.open_by_key(self.spreadsheet_key)
+        try:
+            self._ws = spreadsheet.worksheet(self.worksheet_name)
+        except gspread.exceptions.WorksheetNotFound:
+            self._ws = spreadsheet.add_worksheet(title=self.worksheet_name, rows=1000, cols=26)
+
+    def used_rows(self) -> int:
+        return len(self._ws.col_values(1))
+
+    def ensure_rows(self, rows: int):
+        if rows > self._ws.row_count:
+            self._ws.add_rows(max(rows - self._ws.row_count, 1000))
+
+    def update(self, range_a1: str, values: List[List[Any]]):
+        import gspread
+        try:
+            self._ws.update(range_name=range_a1, values=values, value_input_option='RAW')
+        except gspread.exceptions.APIError as e:
+            if getattr(e, 'code', None) == 429 or '429' in str(e):
+                raise QuotaExceeded(str(e))
+            raise
+
+class LocalSheetBackend(SheetsBackend):
+    """Offline stand-in: an in-memory grid, optionally mirrored to a CSV file.
+
+    Counts update calls so tests can assert that a flush is one request.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.rows: List[List[Any]] = []
+        self.update_calls = 0
+
+    def open(self):
+        if self.path and os.path.exists(self.path):
+            with open(self.path, newline='', encoding='utf-8') as f:
+                self.rows = [row for row in csv.reader(f)]
+
+    def used_rows(self) -> int:
+        return len(self.rows)
+
+    def ensure_rows(self, rows: int):
+        pass
+
+    def update(self, range_a1: str, values: List[List[Any]]):
+        self.update_calls += 1
+        start = int(re.match(r'[A-Z]+(\d+)', range_a1).group(1))
+        while len(self.rows) < start - 1 + len(values):
+            self.rows.append([])
+        for offset, row in enumerate(values):
+            self.rows[start - 1 + offset] = list(row)
+        if self.path:
+            with open(self.path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows(self.rows)
+
+class GoogleSheetsOutput(BufferedOutputHandler):
+    """Publishes analysis results to a sheet, one range update per flush.
+
+    Rows are buffered and written as a single contiguous block below the
+    last used row, so a 300-ticker run costs a handful of API requests.
+    Writes are spaced to stay under Config.SHEETS_WRITES_PER_MINUTE and
+    retried with backoff when the API still reports quota exhaustion.
+    """
+
+    COLUMNS = ['Timestamp', 'Ticker', 'Recommendation', 'Confidence', 'ChartMaster',
+               'NewsHound', 'SignalPro', 'Director', 'Question', 'Error']
+    MAX_CELL_CHARS = 500
+
+    def __init__(self, backend: SheetsBackend, writes_per_minute: Optional[int] = None, **kwargs):
+        from config import Config
+        kwargs.setdefault('batch_size', Config.SHEETS_BATCH_SIZE)
+        super().__init__(**kwargs)
+        self.backend = backend
+        self.min_interval = 60.0 / (writes_per_minute or Config.SHEETS_WRITES_PER_MINUTE)
+        self.max_retries = Config.MAX_RETRIES
+        self.retry_delay = Config.RETRY_DELAY
+        self._next_row = 1
+        self._last_write = 0.0
+
+    def _open(self):
+        self.backend.open()
+        used = self.backend.used_rows()
+        if used == 0:
+            self._write_rows(1, [self.COLUMNS])
+            used = 1
+        self._next_row = used + 1
+
+    def _summary(self, content: str) -> str:
+        match = re.search(r'\[SUMMARY\]\s*(.+)|Answer:\s*(.+)', content or '')
+        text = (match.group(1) or match.group(2)) if match else (content or '')
+        return text.strip()[:self.MAX_CELL_CHARS]
+
+    def _row(self, record: Dict[str, Any]) -> List[Any]:
+        outputs = {o['agent_name']: o for o in record.get('outputs', [])}
+        return [
+            record.get('timestamp', ''),
+            record['ticker'],
+            record.get('recommendation') or '',
+            record.get('confidence') if record.get('confidence') is not None else '',
+            *[self._summary(outputs[name]['content']) if name in outputs else '' for name in self.COLUMNS[4:8]],
+            record.get('question') or '',
+            (record.get('error') or '')[:self.MAX_CELL_CHARS],
+        ]
+
+    def _write_rows(self, start_row: int, rows: List[List[Any]]):
+        end_row = start_row + len(rows) - 1
+        range_a1 = f"A{start_row}:{column_letter(len(self.COLUMNS))}{end_row}"
+        self.backend.ensure_rows(end_row)
+        for attempt in range(self.max_retries + 1):
+            wait = self._last_write + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_write = time.monotonic()
+            try:
+                self.backend.update(range_a1, rows)
+                return
+            except QuotaExceeded:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.retry_delay * (2 ** attempt)
+                print(f"⏳ Sheets quota hit, retrying in {delay}s")
+                time.sleep(delay)
+
+    def _flush(self, records: List[Dict[str, Any]]):
+        rows = [self._row(record) for record in records]
+        self._write_rows(self._next_row, rows)
+        self._next_row += len(rows)
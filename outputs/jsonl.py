@@ -0,0 +1,27 @@
+from outputs.buffered import BufferedOutputHandler
+from typing import List, Dict, Any
+import json
+import os
+
+class JsonlOutput(BufferedOutputHandler):
+    """Appends one JSON object per analysis to a .jsonl file"""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._file = None
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _flush(self, records: List[Dict[str, Any]]):
+        self._file.write(''.join(json.dumps(r, default=str) + "\n" for r in records))
+        self._file.flush()
+
+    def _close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,64 @@
+from outputs.buffered import BufferedOutputHandler
+from datetime import datetime, timezone
+from typing import List, Dict, Any
+import json
+import os
+
+class ParquetOutput(BufferedOutputHandler):
+    """Writes one row per agent output to a Parquet dataset directory, one part file per flush (needs pyarrow).
+
+    Each flush becomes a complete part-<timestamp>-<pid>-<n>.parquet, written
+    under a dot-name and renamed into place, so in --serve or worker mode
+    results are readable as soon as they are flushed and readers never see a
+    half-written file. pyarrow.dataset and pandas.read_parquet read the
+    directory as one table.
+    """
+
+    COLUMNS = ('ticker', 'timestamp', 'question', 'success', 'error', 'recommendation',
+               'agent_name', 'content', 'confidence', 'agent_success', 'metadata')
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._prefix = None
+        self._parts = 0
+
+    def _open(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("pyarrow is required for Parquet output (pip install pyarrow)")
+        self._pa = pa
+        self._pq = pq
+        self._schema = pa.schema([
+            ('ticker', pa.string()), ('timestamp', pa.string()), ('question', pa.string()),
+            ('success', pa.bool_()), ('error', pa.string()), ('recommendation', pa.string()),
+            ('agent_name', pa.string()), ('content', pa.string()), ('confidence', pa.int32()),
+            ('agent_success', pa.bool_()), ('metadata', pa.string()),
+        ])
+        os.makedirs(self.path, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        self._prefix = f"part-{stamp}-{os.getpid()}"
+
+    def _flush(self, records: List[Dict[str, Any]]):
+        columns = {name: [] for name in self.COLUMNS}
+        for record in records:
+            for output in record.get('outputs') or [{}]:
+                columns['ticker'].append(record['ticker'])
+                columns['timestamp'].append(record.get('timestamp'))
+                columns['question'].append(record.get('question'))
+                columns['success'].append(bool(record.get('success')))
+                columns['error'].append(record.get('error'))
+                columns['recommendation'].append(record.get('recommendation'))
+                columns['agent_name'].append(output.get('agent_name'))
+                columns['content'].append(output.get('content'))
+                columns['confidence'].append(output.get('confidence'))
+                columns['agent_success'].append(output.get('success'))
+                columns['metadata'].append(json.dumps(output.get('metadata', {}), default=str) if output else None)
+        self._parts += 1
+        name = f"{self._prefix}-{self._parts:05d}.parquet"
+        # Dot-files are skipped by dataset readers until the rename publishes the finished part
+        staging = os.path.join(self.path, '.' + name)
+        self._pq.write_table(self._pa.table(columns, schema=self._schema), staging)
+        os.replace(staging, os.path.join(self.path, name))
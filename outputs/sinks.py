@@ -0,0 +1,30 @@
+from interfaces.output_handler import IOutputHandler
+
+def create_sink(spec: str) -> IOutputHandler:
+    """Build a sink from '<kind>:<target>'.
+
+    sqlite:results.db, jsonl:results.jsonl, parquet:results.parquet (a directory of part files),
+    sheets:<spreadsheet key> (Google Sheets) or sheets-local:results.csv
+    (offline stand-in for the Sheets writer).
+    """
+    kind, _, path = spec.partition(':')
+    if not path:
+        raise ValueError(f"Sink spec must look like kind:path, got '{spec}'")
+    kind = kind.lower()
+    if kind == 'jsonl':
+        from outputs.jsonl import JsonlOutput
+        return JsonlOutput(path)
+    if kind == 'sqlite':
+        from outputs.sqlite import SQLiteOutput
+        return SQLiteOutput(path)
+    if kind == 'parquet':
+        from outputs.parquet import ParquetOutput
+        return ParquetOutput(path)
+    if kind == 'sheets':
+        from config import Config
+        from outputs.google_sheets import GoogleSheetsOutput, GspreadBackend
+        return GoogleSheetsOutput(GspreadBackend(path, Config.SHEETS_WORKSHEET, Config.GOOGLE_CREDENTIALS_FILE))
+    if kind == 'sheets-local':
+        from outputs.google_sheets import GoogleSheetsOutput, LocalSheetBackend
+        return GoogleSheetsOutput(LocalSheetBackend(path), writes_per_minute=6000)
+    raise ValueError(f"Unknown sink '{kind}' (expected jsonl, sqlite, parquet, sheets or sheets-local)")
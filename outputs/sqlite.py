@@ -0,0 +1,75 @@
+from outputs.buffered import BufferedOutputHandler
+from typing import List, Dict, Any
+import json
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    question TEXT,
+    success INTEGER NOT NULL,
+    error TEXT,
+    recommendation TEXT,
+    confidence INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_ticker_timestamp ON analyses (ticker, timestamp);
+CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses (timestamp);
+CREATE TABLE IF NOT EXISTS agent_outputs (
+    analysis_id INTEGER NOT NULL REFERENCES analyses (id),
+    agent_name TEXT NOT NULL,
+    content TEXT,
+    confidence INTEGER,
+    success INTEGER NOT NULL,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_agent_outputs_analysis ON agent_outputs (analysis_id);
+"""
+
+class SQLiteOutput(BufferedOutputHandler):
+    """Stores analyses and their per-agent outputs in SQLite, indexed by ticker and timestamp"""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._conn = None
+
+    def _open(self):
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def _flush(self, records: List[Dict[str, Any]]):
+        with self._conn:
+            for record in records:
+                cursor = self._conn.execute(
+                    "INSERT INTO analyses (ticker, timestamp, question, success, error, recommendation, confidence) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (record['ticker'], record.get('timestamp', ''), record.get('question'), int(bool(record.get('success'))),
+                     record.get('error'), record.get('recommendation'), record.get('confidence'))
+                )
+                self._conn.executemany(
+                    "INSERT INTO agent_outputs (analysis_id, agent_name, content, confidence, success, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(cursor.lastrowid, o['agent_name'], o['content'], o['confidence'], int(bool(o['success'])),
+                      json.dumps(o.get('metadata', {}), default=str)) for o in record.get('outputs', [])]
+                )
+
+    def _close(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def history(self, ticker: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent stored recommendations for ticker (reads on the caller's own connection)"""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(
+                "SELECT ticker, timestamp, question, success, error, recommendation, confidence FROM analyses "
+                "WHERE ticker = ? ORDER BY timestamp DESC LIMIT ?", (ticker, limit)
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
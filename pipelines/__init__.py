@@ -0,0 +1,4 @@
+from pipelines.full_analysis import FullAnalysisPipeline, AnalysisResult
+from pipelines.screening import ScreeningPipeline
+
+__all__ = ['FullAnalysisPipeline', 'AnalysisResult', 'ScreeningPipeline']
\ No newline at end of file
@@ -1,3 +0,0 @@
-from pipelines.full_analysis import FullAnalysisPipeline, AnalysisResult
-
-__all__ = ['FullAnalysisPipeline', 'AnalysisResult']
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""Change detection between refreshes, so unchanged inputs cost no LLM calls.
+
+Each agent remembers the technicals and headlines (and, for Director, the
+portfolio summary) it last ran on. On the next run the new snapshot is
+compared with that baseline and the agent is re-run only if one of its
+inputs moved materially; otherwise its stored AgentOutput is reused. Agents that read earlier agents' analyses
+(SignalPro, Director) are re-run whenever one of those was.
+"""
+from dataclasses import dataclass, replace
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+import hashlib
+import re
+import threading
+import time
+
+from config import Config
+from interfaces.agent import AgentOutput
+from interfaces.data_provider import TechnicalData, NewsItem
+
+TECHNICALS = 'technicals'
+NEWS = 'news'
+PORTFOLIO = 'portfolio'
+
+# Which snapshot inputs each agent reads, and whether it also reads upstream analyses
+AGENT_INPUTS: Dict[str, Tuple[FrozenSet[str], bool]] = {
+    'ChartMaster': (frozenset({TECHNICALS}), False),
+    'NewsHound': (frozenset({NEWS}), False),
+    'SignalPro': (frozenset({TECHNICALS, NEWS}), True),
+    'Director': (frozenset({TECHNICALS, NEWS, PORTFOLIO}), True),
+}
+
+def rsi_zone(rsi: Optional[float]) -> Optional[str]:
+    if rsi is None:
+        return None
+    return 'oversold' if rsi < 30 else 'overbought' if rsi > 70 else 'neutral'
+
+def macd_zone(histogram: Optional[float]) -> Optional[str]:
+    if histogram is None:
+        return None
+    return 'bullish' if histogram > 0 else 'bearish'
+
+def bollinger_zone(tech: TechnicalData) -> Optional[str]:
+    if tech.bb_upper is None or tech.bb_lower is None:
+        return None
+    return 'above' if tech.current > tech.bb_upper else 'below' if tech.current < tech.bb_lower else 'inside'
+
+def _sma_side(current: float, sma: Optional[float]) -> Optional[str]:
+    return None if sma is None else 'above' if current > sma else 'below'
+
+def _pct(old: Optional[float], new: Optional[float]) -> float:
+    if not old or new is None:
+        return 0.0
+    return abs(new - old) / abs(old) * 100
+
+def technical_changes(old: TechnicalData, new: TechnicalData) -> List[str]:
+    """Reasons the new technicals differ materially from the old ones (empty if they don't)"""
+    reasons = []
+    move = _pct(old.current, new.current)
+    if move >= Config.GATE_PRICE_MOVE_PCT:
+        reasons.append(f"price moved {move:.1f}%")
+    if old.rsi is not None and new.rsi is not None and abs(new.rsi - old.rsi) >= Config.GATE_RSI_POINTS:
+        reasons.append(f"RSI {old.rsi:.0f} -> {new.rsi:.0f}")
+    zones = (
+        ('RSI zone', rsi_zone(old.rsi), rsi_zone(new.rsi)),
+        ('MACD', macd_zone(old.macd_histogram), macd_zone(new.macd_histogram)),
+        ('Bollinger', bollinger_zone(old), bollinger_zone(new)),
+        ('SMA20', _sma_side(old.current, old.sma20), _sma_side(new.current, new.sma20)),
+        ('SMA50', _sma_side(old.current, old.sma50), _sma_side(new.current, new.sma50)),
+        ('trend', old.trend, new.trend),
+    )
+    for label, before, after in zones:
+        if before != after:
+            reasons.append(f"{label} {before} -> {after}")
+    return reasons
+
+_WORDS = re.compile(r'\W+')
+
+def headline_keys(news: List[NewsItem]) -> FrozenSet[str]:
+    # Case/punctuation-insensitive so the same story from two feeds counts once
+    return frozenset(_WORDS.sub(' ', item.title.lower()).strip() for item in news)
+
+def news_changes(old: FrozenSet[str], new: FrozenSet[str]) -> List[str]:
+    fresh = len(new - old)
+    return [f"{fresh} new headline(s)"] if fresh >= Config.GATE_NEW_HEADLINES else []
+
+def portfolio_digest(summary: Optional[str]) -> Optional[str]:
+    return hashlib.sha1(summary.encode()).hexdigest() if summary else None
+
+@dataclass
+class _Baseline:
+    technicals: TechnicalData
+    headlines: FrozenSet[str]
+    output: AgentOutput
+    at: float
+    portfolio: Optional[str] = None  # portfolio_digest of the summary the agent saw
+
+class ChangeGate:
+    """Per (ticker, question, data sources, agent) baselines and the re-run decision.
+
+    The sources are the data providers the run was configured with, so an
+    output built from one source (Google's quote-only technicals) is never
+    reused for a run on another (Yahoo) that happens to show the same numbers.
+    """
+
+    def __init__(self, max_age: float = None):
+        self.max_age = Config.GATE_MAX_AGE if max_age is None else max_age
+        self._baselines: Dict[Tuple[str, str, Tuple[str, ...], str], _Baseline] = {}
+        self._lock = threading.Lock()
+
+    def check(self, ticker: str, question: str, sources: Tuple[str, ...], agent_name: str,
+              technicals: TechnicalData, news: List[NewsItem], upstream_rerun: bool,
+              portfolio: Optional[str] = None) -> Tuple[Optional[AgentOutput], List[str]]:
+        """(stored output to reuse, []) or (None, reasons the agent must run)"""
+        with self._lock:
+            baseline = self._baselines.get((ticker, question, sources, agent_name))
+        if baseline is None:
+            return None, ['no previous analysis']
+        if time.time() - baseline.at >= self.max_age:
+            return None, ['previous analysis expired']
+        if agent_name not in AGENT_INPUTS:
+            return None, ['unknown inputs']
+        inputs, reads_upstream = AGENT_INPUTS[agent_name]
+        reasons = []
+        if reads_upstream and upstream_rerun:
+            reasons.append('upstream analysis changed')
+        if TECHNICALS in inputs:
+            reasons += technical_changes(baseline.technicals, technicals)
+        if NEWS in inputs:
+            reasons += news_changes(baseline.headlines, headline_keys(news))
+        if PORTFOLIO in inputs and baseline.portfolio != portfolio_digest(portfolio):
+            reasons.append('portfolio summary changed')
+        if reasons:
+            return None, reasons
+        return replace(baseline.output, metadata={**baseline.output.metadata, 'reused': True}), []
+
+    def record(self, ticker: str, question: str, sources: Tuple[str, ...], output: AgentOutput,
+               technicals: TechnicalData, news: List[NewsItem], portfolio: Optional[str] = None):
+        if not output.success:
+            return
+        baseline = _Baseline(technicals, headline_keys(news), output, time.time(), portfolio_digest(portfolio))
+        with self._lock:
+            self._baselines[(ticker, question, sources, output.agent_name)] = baseline
+
+    def clear(self, ticker: Optional[str] = None):
+        with self._lock:
+            for key in [k for k in self._baselines if ticker is None or k[0] == ticker]:
+                del self._baselines[key]
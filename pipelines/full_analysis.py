@@ -1,9 +1,26 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from interfaces.agent import IAgent, AgentInput, AgentOutput
 from interfaces.data_provider import IDataProvider
 from interfaces.output_handler import IOutputHandler
-from dataclasses import dataclass
-from datetime import datetime
+from connectors.health import MonitoredProvider
+from pipelines.change_gate import ChangeGate
+from core import singleflight
+from core.deadline import Deadline, run_stage
+from core.metrics import metrics
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timezone
+import asyncio
+import re
+
+# agent_input.context key each agent's output is passed on under (what SignalPro and Director read)
+CONTEXT_KEYS = {'ChartMaster': 'chart_analysis', 'NewsHound': 'news_analysis', 'SignalPro': 'signal_analysis'}
+
+def context_key(agent_name: str) -> str:
+    return CONTEXT_KEYS.get(agent_name, f"{agent_name.lower()}_analysis")
+
+def has_indicators(technicals) -> bool:
+    """Whether a TechnicalData carries the moving averages and RSI the agents read"""
+    return technicals is not None and None not in (technicals.sma20, technicals.sma50, technicals.rsi)
 
 @dataclass
 class AnalysisResult:
@@ -11,57 +28,177 @@ class AnalysisResult:
     success: bool
     outputs: Dict[str, AgentOutput]
     error: str = None
+    question: str = None
+    timestamp: str = None
+    timed_out: List[str] = field(default_factory=list)  # stages cut off by the run deadline ('data', agent names)
+    
+    def to_record(self) -> Dict[str, Any]:
+        """Flat, JSON-serialisable form used by the output sinks"""
+        director = self.outputs.get('Director')
+        recommendation = None
+        if director and director.success:
+            answer = re.search(r'Answer:\s*\[?(Buy|Hold|Sell|Wait)', director.content, re.IGNORECASE)
+            recommendation = answer.group(1).title() if answer else None
+        return {
+            'ticker': self.ticker,
+            'timestamp': self.timestamp,
+            'question': self.question,
+            'success': self.success,
+            'error': self.error,
+            'recommendation': recommendation,
+            'confidence': director.confidence if director else None,
+            'timed_out': list(self.timed_out),
+            'outputs': [asdict(o) for o in self.outputs.values()],
+        }
 
 class FullAnalysisPipeline:
-    def __init__(self, data_providers: List[IDataProvider], agents: List[IAgent], output_handler: IOutputHandler):
-        self.data_providers = data_providers
+    def __init__(self, data_providers: List[IDataProvider], agents: List[IAgent], output_handler: IOutputHandler,
+                 change_gate: ChangeGate = None, snapshot_store=None, portfolio=None):
+        self.data_providers = [p if isinstance(p, MonitoredProvider) else MonitoredProvider(p) for p in data_providers]
         self.agents = agents
         self.output_handler = output_handler
+        self.change_gate = change_gate
+        self.snapshot_store = snapshot_store  # core.snapshots.SnapshotStore, history of every run's inputs/outputs
+        self.portfolio = portfolio  # portfolio.PortfolioContext, watchlist-wide summary for Director
+    
+    def ordered_providers(self, op: str) -> List[MonitoredProvider]:
+        """Providers ordered by their recent p50 latency for one operation (price, technicals, news).
+
+        Unmeasured providers follow the measured ones in their configured
+        order, so a fallback is not promoted just because it has not run yet.
+        """
+        def latency(provider: MonitoredProvider) -> float:
+            p50 = provider.op_latency(op)
+            return float('inf') if p50 is None else p50
+        return sorted(self.data_providers, key=latency)
+    
+    def provider_stats(self) -> List[Dict[str, Any]]:
+        return [p.stats() for p in self.data_providers]
     
-    async def run(self, ticker: str, question: str = "Technical outlook") -> AnalysisResult:
+    async def run(self, ticker: str, question: str = "Technical outlook",
+                  deadline: Optional[float] = None) -> AnalysisResult:
+        """Analyse ticker within deadline seconds (default Config.RUN_DEADLINE, 0 for no limit).
+
+        The deadline is split into data and per-agent budgets; a stage that
+        overruns is cancelled, recorded in result.timed_out, and the run
+        continues with what finished in time.
+        """
+        from config import Config
+        deadline = Config.RUN_DEADLINE if deadline is None else deadline
+        # Concurrent identical analyses (same ticker, question, deadline, providers, agents, change gate,
+        # snapshot store and portfolio) share one run; each caller then writes the result to its own sink
+        key = (ticker, question, deadline, tuple(p.name for p in self.data_providers),
+               tuple(a.name for a in self.agents), id(self.change_gate), id(self.snapshot_store),
+               id(self.portfolio))
+        result = await singleflight.group('pipeline').do_async(
+            key, lambda: self._run(ticker, question, Deadline(deadline) if deadline else None))
+        self._persist(result)
+        return result
+    
+    async def _run(self, ticker: str, question: str, deadline: Optional[Deadline] = None) -> AnalysisResult:
+        with metrics.span('pipeline') as span:
+            span['ticker'] = ticker
+            result = await self._analyse(ticker, question, deadline)
+            result.question = question
+            result.timestamp = datetime.now(timezone.utc).isoformat()
+            span['success'] = result.success
+            if result.timed_out:
+                span['timed_out'] = result.timed_out
+        return result
+    
+    def _persist(self, result: AnalysisResult):
+        if not isinstance(self.output_handler, IOutputHandler):
+            return
         try:
-            price_data = None
-            technical_data = None
-            news_data = []
+            self.output_handler.write(result.ticker, result.to_record())
+        except Exception as e:
+            print(f"✗ Output failed for {result.ticker}: {e}")
+    
+    def _stage_budget(self, deadline: Optional[Deadline], stage: str, remaining_stages: List[str]) -> Optional[float]:
+        from config import Config
+        if deadline is None:
+            return None
+        return deadline.budget(stage, remaining_stages, Config.DEADLINE_WEIGHTS)
+    
+    async def _within(self, coro, budget: Optional[float]):
+        return await (coro if budget is None else run_stage(coro, budget))
+    
+    async def _collect_data(self, ticker: str, data: Dict[str, Any]):
+        """Fill data['price'], data['technicals'] and data['news'], trying providers fastest-first per operation.
+
+        Writes as it goes, so a data-stage timeout keeps whatever already
+        arrived. Provider calls run in threads, which a timeout abandons
+        rather than stops.
+        """
+        for provider in self.ordered_providers('price'):
+            if data['price'] is not None:
+                break
+            if not provider.op_available('price'):
+                print(f"⏭ Skipping {provider.name} price (circuit open)")
+                continue
+            try:
+                data['price'] = await asyncio.to_thread(provider.get_price, ticker)
+                if data['price']:
+                    print(f"✓ Got price from {provider.name}")
+            except Exception as e:
+                print(f"✗ Price failed from {provider.name}: {e}")
+        
+        for provider in self.ordered_providers('technicals'):
+            if has_indicators(data['technicals']):
+                break
+            if not provider.op_available('technicals'):
+                print(f"⏭ Skipping {provider.name} technicals (circuit open)")
+                continue
+            try:
+                technicals = await asyncio.to_thread(provider.get_technicals, ticker)
+                # A quote-only snapshot (no SMA/RSI) is kept only until a provider with indicators answers
+                if technicals and (data['technicals'] is None or has_indicators(technicals)):
+                    data['technicals'] = technicals
+                    print(f"✓ Got technicals from {provider.name}"
+                          + ("" if has_indicators(technicals) else " (no indicators, trying next provider)"))
+            except Exception as e:
+                print(f"✗ Technicals failed from {provider.name}: {e}")
+        
+        for provider in self.ordered_providers('news'):
+            if not provider.op_available('news'):
+                print(f"⏭ Skipping {provider.name} news (circuit open)")
+                continue
+            try:
+                provider_news = await asyncio.to_thread(provider.get_news, ticker, 5)
+                if provider_news:
+                    data['news'].extend(provider_news)
+                    print(f"✓ Got {len(provider_news)} news from {provider.name}")
+            except Exception as e:
+                print(f"✗ News failed from {provider.name}: {e}")
+    
+    async def _analyse(self, ticker: str, question: str, deadline: Optional[Deadline] = None) -> AnalysisResult:
+        try:
+            timed_out = []
+            stages = ['data'] + [agent.name for agent in self.agents]
+            data = {'price': None, 'technicals': None, 'news': []}
             
-            # Try each data provider
-            for provider in self.data_providers:
-                provider_name = provider.__class__.__name__
-                print(f"Trying {provider_name}...")
-                
-                if price_data is None:
-                    try:
-                        price_data = provider.get_price(ticker)
-                        if price_
-                            print(f"✓ Got price from {provider_name}")
-                    except Exception as e:
-                        print(f"✗ Price failed from {provider_name}: {e}")
-                
-                if technical_data is None:
-                    try:
-                        technical_data = provider.get_technicals(ticker)
-                        if technical_
-                            print(f"✓ Got technicals from {provider_name}")
-                    except Exception as e:
-                        print(f"✗ Technicals failed from {provider_name}: {e}")
-                
-                try:
-                    provider_news = provider.get_news(ticker, max_items=5)
-                    if provider_news:
-                        news_data.extend(provider_news)
-                        print(f"✓ Got {len(provider_news)} news from {provider_name}")
-                except Exception as e:
-                    print(f"✗ News failed from {provider_name}: {e}")
+            budget = self._stage_budget(deadline, 'data', stages)
+            try:
+                await self._within(self._collect_data(ticker, data), budget)
+            except asyncio.TimeoutError:
+                timed_out.append('data')
+                metrics.incr('stage_timeouts_total', stage='data')
+                print(f"⏱ Data stage timed out after {budget:.1f}s, continuing with what arrived")
+            stages.remove('data')
+            price_data, technical_data, news_data = data['price'], data['technicals'], list(data['news'])
             
             # Check if we got data
-            if not technical_
+            if not technical_data:
                 error_msg = "Could not fetch technical data from any source"
+                if timed_out:
+                    error_msg = "Timed out fetching technical data"
                 print(f"ERROR: {error_msg}")
                 return AnalysisResult(
                     ticker=ticker,
                     success=False,
                     outputs={},
-                    error=error_msg
+                    error=error_msg,
+                    timed_out=timed_out
                 )
             
             # Build agent input
@@ -73,16 +210,54 @@ class FullAnalysisPipeline:
                 news_data=news_data,
                 context={}
             )
+            if self.portfolio:
+                try:
+                    agent_input.context['portfolio_summary'] = await asyncio.to_thread(self.portfolio.summary, ticker)
+                except Exception as e:
+                    print(f"✗ Portfolio summary failed: {e}")
             
-            # Run agents
+            # Run agents (or reuse their last output when the change gate says nothing moved)
             outputs = {}
+            upstream_rerun = False
+            sources = tuple(p.name for p in self.data_providers)
+            portfolio_summary = agent_input.context.get('portfolio_summary')
             for agent in self.agents:
-                print(f"[{agent.name}] Processing...")
+                budget = self._stage_budget(deadline, agent.name, stages)
+                stages.remove(agent.name)
+                if self.change_gate:
+                    output, reasons = self.change_gate.check(ticker, question, sources, agent.name, technical_data,
+                                                             news_data, upstream_rerun, portfolio_summary)
+                    if output:
+                        metrics.incr('agent_runs_total', agent=agent.name, result='reused')
+                        outputs[agent.name] = output
+                        agent_input.context[context_key(agent.name)] = output.content
+                        print(f"♻ {agent.name} reused (no material change)")
+                        continue
+                    print(f"[{agent.name}] Processing ({'; '.join(reasons)})...")
+                else:
+                    print(f"[{agent.name}] Processing...")
+                upstream_rerun = True
                 try:
-                    output = await agent.execute(agent_input)
+                    output = await self._within(agent.execute(agent_input), budget)
                     outputs[agent.name] = output
-                    agent_input.context[f"{agent.name.lower()}_analysis"] = output.content
+                    agent_input.context[context_key(agent.name)] = output.content
+                    metrics.incr('agent_runs_total', agent=agent.name, result='run')
+                    if self.change_gate:
+                        self.change_gate.record(ticker, question, sources, output, technical_data, news_data,
+                                                portfolio_summary)
                     print(f"✓ {agent.name} complete")
+                except asyncio.TimeoutError:
+                    # Later agents (Director) run on the outputs that did finish
+                    timed_out.append(agent.name)
+                    metrics.incr('stage_timeouts_total', stage=agent.name)
+                    print(f"⏱ {agent.name} timed out after {budget:.1f}s")
+                    outputs[agent.name] = AgentOutput(
+                        agent_name=agent.name,
+                        content=f"Error: timed out after {budget:.1f}s",
+                        confidence=0,
+                        metadata={'timed_out': True},
+                        success=False
+                    )
                 except Exception as e:
                     print(f"✗ {agent.name} failed: {e}")
                     outputs[agent.name] = AgentOutput(
@@ -93,10 +268,16 @@ class FullAnalysisPipeline:
                         success=False
                     )
             
+            if self.snapshot_store is not None:
+                # Reused outputs are not stored again; they are already in the history
+                fresh = [o for o in outputs.values() if not o.metadata.get('reused')]
+                self.snapshot_store.add(ticker, technical_data, news_data, fresh)
+            
             return AnalysisResult(
                 ticker=ticker,
                 success=True,
-                outputs=outputs
+                outputs=outputs,
+                timed_out=timed_out
             )
             
         except Exception as e:
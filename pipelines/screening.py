@@ -0,0 +1,174 @@
+"""Screening mode: one fast-model request covers many tickers.
+
+For a large watchlist, one ChartMaster and one NewsHound call per ticker
+spends most of its time (and requests-per-minute allowance) on request
+overhead. Here each agent's compact block for every ticker is packed into
+as few prompts as the token budget allows, the reply is split back into
+per-ticker AgentOutputs by its "### TICKER" headers, and any entry that is
+missing or malformed is retried on its own with the agent's full prompt.
+A request that fails outright is retried as a whole batch, with backoff.
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import re
+
+from config import Config
+from interfaces.agent import IAgent, AgentInput, AgentOutput
+from pipelines.full_analysis import FullAnalysisPipeline, AnalysisResult
+from core.metrics import metrics
+
+_ENTRY = re.compile(r'^#{2,}\s*\[?([A-Za-z0-9.\-^=]+)\]?\s*$', re.MULTILINE)
+_CONFIDENCE = re.compile(r'\[CONFIDENCE\]\s*(\d+)', re.IGNORECASE)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English and numbers)"""
+    return len(text) // 4 + 1
+
+def pack(blocks: List[Tuple[str, str]], budget: int, per_ticker: int, max_batch: int,
+         overhead: int = 0) -> List[List[Tuple[str, str]]]:
+    """Greedily group (ticker, block) pairs so each group's prompt plus reserved reply fits budget"""
+    batches, batch, used = [], [], overhead
+    for ticker, block in blocks:
+        cost = estimate_tokens(block) + estimate_tokens(ticker) + 2 + per_ticker
+        if batch and (used + cost > budget or len(batch) >= max_batch):
+            batches.append(batch)
+            batch, used = [], overhead
+        batch.append((ticker, block))
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+def build_batch_prompt(agent: IAgent, question: str, batch: List[Tuple[str, str]]) -> str:
+    sections = "\n\n".join(f"=== {ticker} ===\n{block}" for ticker, block in batch)
+    return f"""{agent.name} screening: {agent.screen_task} for {len(batch)} tickers
+
+QUESTION: {question}
+
+{sections}
+
+For EVERY ticker above, in the same order, reply with exactly this block and nothing else:
+### <TICKER>
+[SUMMARY] One line: bias + key reason
+[BIAS] Bullish|Bearish|Neutral
+[CONFIDENCE] 1-10"""
+
+def split_response(response: str) -> Dict[str, str]:
+    """Reply text per ticker, keyed by the upper-cased ticker of each '### TICKER' header"""
+    parts = _ENTRY.split(response or '')
+    return {ticker.upper(): body.strip() for ticker, body in zip(parts[1::2], parts[2::2])}
+
+def parse_entry(agent: IAgent, entry: Optional[str], batch_size: int) -> Optional[AgentOutput]:
+    """AgentOutput for one ticker's entry, or None when it is missing or incomplete"""
+    if not entry or '[SUMMARY]' not in entry.upper():
+        return None
+    confidence = _CONFIDENCE.search(entry)
+    if not confidence:
+        return None
+    return AgentOutput(agent_name=agent.name, content=entry, confidence=min(int(confidence.group(1)), 10),
+                       metadata={'type': 'screening', 'batch_size': batch_size}, success=True)
+
+class ScreeningPipeline(FullAnalysisPipeline):
+    """Screens many tickers with batched prompts for the agents that have a compact form.
+
+    Data is fetched per ticker through the same providers (and circuit
+    breakers) as a full analysis; only the LLM step is batched.
+    """
+
+    def __init__(self, data_providers, agents: List[IAgent], output_handler=None,
+                 token_budget: int = None, max_batch: int = None):
+        super().__init__(data_providers, agents, output_handler)
+        self.token_budget = token_budget or Config.SCREEN_TOKEN_BUDGET
+        self.max_batch = max_batch or Config.SCREEN_MAX_BATCH
+        self._limit = asyncio.Semaphore(Config.BATCH_CONCURRENCY)
+
+    async def screen(self, tickers: List[str], question: str = "Technical outlook") -> List[AnalysisResult]:
+        with metrics.span('screening') as span:
+            span['tickers'] = len(tickers)
+            inputs = await asyncio.gather(*[self._fetch(ticker, question) for ticker in tickers])
+            inputs = {agent_input.ticker: agent_input for agent_input in inputs if agent_input}
+            outputs: Dict[str, Dict[str, AgentOutput]] = {ticker: {} for ticker in inputs}
+            for agent in self.agents:
+                for ticker, output in (await self._screen_agent(agent, question, inputs)).items():
+                    outputs[ticker][agent.name] = output
+        results = []
+        for ticker in tickers:
+            if ticker in inputs:
+                result = AnalysisResult(ticker=ticker, success=True, outputs=outputs[ticker])
+            else:
+                result = AnalysisResult(ticker=ticker, success=False, outputs={},
+                                        error="Could not fetch technical data from any source")
+            result.question = question
+            result.timestamp = datetime.now(timezone.utc).isoformat()
+            self._persist(result)
+            results.append(result)
+        return results
+
+    async def _fetch(self, ticker: str, question: str) -> Optional[AgentInput]:
+        data = {'price': None, 'technicals': None, 'news': []}
+        async with self._limit:
+            await self._collect_data(ticker, data)
+        if not data['technicals']:
+            return None
+        return AgentInput(ticker=ticker, question=question, price_data=data['price'],
+                          technical_data=data['technicals'], news_data=data['news'], context={})
+
+    async def _screen_agent(self, agent: IAgent, question: str,
+                            inputs: Dict[str, AgentInput]) -> Dict[str, AgentOutput]:
+        blocks = [(ticker, agent.build_compact_block(agent_input)) for ticker, agent_input in inputs.items()]
+        blocks = [(ticker, block) for ticker, block in blocks if block]
+        if not blocks:
+            return {}
+        overhead = estimate_tokens(build_batch_prompt(agent, question, []))
+        batches = pack(blocks, self.token_budget, Config.SCREEN_TOKENS_PER_TICKER, self.max_batch, overhead)
+        print(f"[{agent.name}] Screening {len(blocks)} tickers in {len(batches)} request(s)")
+        results = await asyncio.gather(*[self._run_batch(agent, question, batch) for batch in batches])
+        outputs = {ticker: output for result in results for ticker, output in result.items()}
+
+        # Entries a successful reply dropped or mangled get the agent's normal single-ticker prompt
+        retry = [ticker for ticker, _ in blocks if ticker not in outputs]
+        if retry:
+            print(f"[{agent.name}] Retrying {len(retry)} ticker(s) individually")
+            metrics.incr('screening_retries_total', len(retry), agent=agent.name)
+            for ticker, output in zip(retry, await asyncio.gather(*[self._run_single(agent, inputs[t]) for t in retry])):
+                outputs[ticker] = output
+        return outputs
+
+    async def _run_batch(self, agent: IAgent, question: str, batch: List[Tuple[str, str]]) -> Dict[str, AgentOutput]:
+        """Outputs for the entries the reply got right; a failed request is retried as a batch with backoff.
+
+        Once the retries are spent every ticker in the batch gets a failed
+        output rather than a request of its own, so a rate-limited batch
+        never turns into one request per ticker.
+        """
+        prompt = build_batch_prompt(agent, question, batch)
+        for attempt in range(Config.MAX_RETRIES + 1):
+            try:
+                async with self._limit:
+                    with metrics.span('screening.batch', agent=agent.name, model=agent.model) as span:
+                        span['size'] = len(batch)
+                        response = await agent._call_groq(prompt, max_tokens=Config.SCREEN_TOKENS_PER_TICKER * len(batch) + 100)
+                break
+            except Exception as e:
+                if attempt == Config.MAX_RETRIES:
+                    print(f"✗ {agent.name} batch of {len(batch)} failed: {e}")
+                    metrics.incr('screening_entries_total', len(batch), agent=agent.name, result='failed')
+                    return {ticker: AgentOutput(agent_name=agent.name, content=f"Error: {e}", confidence=0,
+                                                metadata={'type': 'screening', 'batch_size': len(batch)}, success=False)
+                            for ticker, _ in batch}
+                delay = Config.RETRY_DELAY * (2 ** attempt)
+                print(f"⏳ {agent.name} batch of {len(batch)} failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+        entries = split_response(response)
+        outputs = {}
+        for ticker, _ in batch:
+            output = parse_entry(agent, entries.get(ticker.upper()), len(batch))
+            if output:
+                outputs[ticker] = output
+        metrics.incr('screening_entries_total', len(outputs), agent=agent.name, result='parsed')
+        return outputs
+
+    async def _run_single(self, agent: IAgent, agent_input: AgentInput) -> AgentOutput:
+        async with self._limit:
+            return await agent.execute(agent_input)
@@ -0,0 +1,4 @@
+from portfolio.correlation import RollingCovariance, cluster
+from portfolio.context import PortfolioContext
+
+__all__ = ['RollingCovariance', 'cluster', 'PortfolioContext']
@@ -0,0 +1,119 @@
+"""Watchlist-wide statistics for the Director prompt.
+
+PortfolioContext owns one RollingCovariance over the watchlist plus a
+benchmark index. refresh() pulls daily closes through the shared batched
+history download and feeds only the bars it has not seen yet, so keeping
+the matrices current is one row update per new trading day rather than a
+recomputation. summary(ticker) turns them into a few lines of text that
+let Director answer portfolio questions ("am I overexposed to UK banks?").
+"""
+from typing import Callable, Dict, List, Optional
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from portfolio.correlation import RollingCovariance, cluster, members
+
+HistorySource = Callable[[List[str], str], Dict[str, pd.DataFrame]]
+
+def daily_returns(histories: Dict[str, pd.DataFrame], columns: List[str]) -> pd.DataFrame:
+    """Close-to-close returns, date x ticker, with dates aligned across exchanges and timezones.
+
+    Uses Adj Close when the history has it, so splits and dividends do not
+    show up as returns.
+    """
+    closes = {}
+    for ticker in columns:
+        df = histories.get(ticker)
+        if df is None or df.empty:
+            continue
+        index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+        close = df['Adj Close'] if 'Adj Close' in df else df['Close']
+        closes[ticker] = pd.Series(close.to_numpy(), index=index.normalize())
+    frame = pd.DataFrame(closes).reindex(columns=columns).sort_index()
+    # fill_method=None keeps a missing bar missing instead of inventing a zero return
+    return frame.pct_change(fill_method=None).iloc[1:]
+
+class PortfolioContext:
+    def __init__(self, tickers: List[str], history_source: HistorySource, benchmark: str = None,
+                 window: int = None, min_corr: float = None):
+        from config import Config
+        self.benchmark = benchmark or Config.PORTFOLIO_BENCHMARK
+        self.tickers = [t for t in dict.fromkeys(tickers) if t != self.benchmark]
+        self.history_source = history_source
+        self.window = window or Config.PORTFOLIO_WINDOW
+        self.min_corr = min_corr if min_corr is not None else Config.PORTFOLIO_CLUSTER_CORR
+        self.columns = self.tickers + [self.benchmark]
+        self.stats = RollingCovariance(self.columns, self.window)
+        self._last_bar: Optional[pd.Timestamp] = None
+        self._refreshed = 0.0
+        self._lock = threading.Lock()
+        self._labels: Optional[np.ndarray] = None
+        self._corr: Optional[np.ndarray] = None
+
+    def refresh(self, force: bool = False) -> int:
+        """Feed bars newer than the last one seen; returns how many were added"""
+        from config import Config
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed < Config.HISTORY_CACHE_TTL:
+                return 0
+            histories = self.history_source(self.columns, Config.PORTFOLIO_PERIOD)
+            returns = daily_returns(histories, self.columns)
+            if self._last_bar is not None:
+                returns = returns[returns.index > self._last_bar]
+            else:
+                returns = returns.iloc[-self.window:]
+            # Today's bar is still forming; leave it for the next refresh after the close
+            returns = returns[returns.index < pd.Timestamp.now().normalize()]
+            # Rows fed now are never revisited, so stop at the last bar the benchmark has: a failed
+            # benchmark download is retried next refresh instead of leaving a hole in every beta
+            benchmark_bars = returns.index[returns[self.benchmark].notna()]
+            returns = returns[returns.index <= benchmark_bars[-1]] if len(benchmark_bars) else returns.iloc[:0]
+            if len(returns):
+                self.stats.extend(returns.to_numpy())
+                self._last_bar = returns.index[-1]
+                self._corr = self.stats.correlation()
+                self._labels = None
+            self._refreshed = time.monotonic()
+            return len(returns)
+
+    def clusters(self) -> np.ndarray:
+        if self._labels is None:
+            n = len(self.tickers)
+            self._labels = cluster(self._corr[:n, :n], self.min_corr)
+        return self._labels
+
+    def summary(self, ticker: Optional[str] = None, top: int = 3) -> str:
+        """Compact text: watchlist shape, the largest clusters and, if it is listed, the ticker's exposure"""
+        self.refresh()
+        with self._lock:
+            if self._corr is None or self.stats.bars < 2 or not self.tickers:
+                return ""
+            n = len(self.tickers)
+            corr = self._corr[:n, :n]
+            labels = self.clusters()
+            beta = self.stats.beta(self.benchmark)[:n]
+            off_diagonal = corr[~np.eye(n, dtype=bool)]
+            lines = [f"Watchlist: {n} names, {self.stats.bars} daily bars, benchmark {self.benchmark}, "
+                     f"avg pairwise corr {np.nanmean(off_diagonal):.2f}" if n > 1 else
+                     f"Watchlist: 1 name, {self.stats.bars} daily bars, benchmark {self.benchmark}"]
+            for label in range(min(top, labels.max() + 1)):
+                names = members(labels, self.tickers, label)
+                if len(names) < 2:
+                    break
+                idx = np.flatnonzero(labels == label)
+                block = corr[np.ix_(idx, idx)][~np.eye(len(idx), dtype=bool)]
+                shown = ", ".join(names[:6]) + (f" +{len(names) - 6}" if len(names) > 6 else "")
+                lines.append(f"Cluster {label + 1}: {len(names)} names ({len(names) / n:.0%}), "
+                             f"avg corr {np.nanmean(block):.2f}, avg beta {np.nanmean(beta[idx]):.2f}: {shown}")
+            if ticker in self.stats.index and ticker != self.benchmark:
+                i = self.stats.index[ticker]
+                peers = np.argsort(-np.nan_to_num(corr[i], nan=-2.0))
+                peers = [j for j in peers if j != i][:top]
+                peer_text = ", ".join(f"{self.tickers[j]} {corr[i, j]:.2f}" for j in peers)
+                size = int((labels == labels[i]).sum())
+                group = f"cluster {labels[i] + 1} ({size} names)" if size > 1 else "no cluster"
+                lines.append(f"{ticker}: beta {beta[i]:.2f}, {group}, most correlated: {peer_text or 'n/a'}")
+            return "\n".join(lines)
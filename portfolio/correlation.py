@@ -0,0 +1,130 @@
+"""Incremental rolling covariance/correlation and correlation clustering, numpy only.
+
+RollingCovariance keeps running sums over the last `window` return rows,
+so a new bar costs a few N x N outer products (add the new row, subtract
+the one leaving the window) instead of recomputing every pair from the
+whole window. Sums are pairwise: a pair only counts the rows where both
+tickers have a return, so names on different exchange holidays or with
+short histories still get correct statistics.
+"""
+from typing import List, Optional, Sequence
+import numpy as np
+
+class RollingCovariance:
+    def __init__(self, columns: Sequence[str], window: int, resync_every: Optional[int] = None):
+        self.columns = list(columns)
+        self.index = {column: i for i, column in enumerate(self.columns)}
+        self.window = window
+        # Subtracting what was once added drifts in floating point; rebuild from the buffer now and then
+        self.resync_every = resync_every or window * 10
+        n = len(self.columns)
+        self._rows = np.full((window, n), np.nan)
+        self._next = 0
+        self._filled = 0
+        self._updates = 0
+        self._cross = np.zeros((n, n))    # sum of x_i * x_j
+        self._sum = np.zeros((n, n))      # sum of x_i over rows where j is valid too
+        self._square = np.zeros((n, n))   # sum of x_i^2 over rows where j is valid too
+        self._count = np.zeros((n, n))    # rows where both i and j are valid
+
+    def _accumulate(self, row: np.ndarray, sign: float):
+        valid = ~np.isnan(row)
+        x = np.where(valid, row, 0.0)
+        m = valid.astype(float)
+        self._cross += sign * np.outer(x, x)
+        self._sum += sign * np.outer(x, m)
+        self._square += sign * np.outer(x * x, m)
+        self._count += sign * np.outer(m, m)
+
+    def update(self, row: Sequence[float]):
+        """Add one bar of returns (NaN for a missing ticker), dropping the oldest once the window is full"""
+        row = np.asarray(row, dtype=float)
+        if self._filled == self.window:
+            self._accumulate(self._rows[self._next], -1.0)
+        else:
+            self._filled += 1
+        self._rows[self._next] = row
+        self._next = (self._next + 1) % self.window
+        self._accumulate(row, 1.0)
+        self._updates += 1
+        if self._updates % self.resync_every == 0:
+            self.resync()
+
+    def extend(self, rows: np.ndarray):
+        for row in rows:
+            self.update(row)
+
+    def resync(self):
+        """Recompute the running sums exactly from the rows in the window"""
+        rows = self._rows[:self._filled] if self._filled < self.window else self._rows
+        valid = ~np.isnan(rows)
+        x = np.where(valid, rows, 0.0)
+        m = valid.astype(float)
+        self._cross = x.T @ x
+        self._sum = x.T @ m
+        self._square = (x * x).T @ m
+        self._count = m.T @ m
+
+    @property
+    def bars(self) -> int:
+        return self._filled
+
+    def _centered(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            n = np.where(self._count > 1, self._count, np.nan)
+            cross = self._cross - self._sum * self._sum.T / n
+            square = self._square - self._sum * self._sum / n
+        return n, cross, square
+
+    def covariance(self) -> np.ndarray:
+        n, cross, _ = self._centered()
+        with np.errstate(invalid='ignore'):
+            return cross / (n - 1)
+
+    def correlation(self) -> np.ndarray:
+        _, cross, square = self._centered()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cross / np.sqrt(square * square.T)
+        np.fill_diagonal(corr, 1.0)
+        return np.clip(corr, -1.0, 1.0)
+
+    def beta(self, benchmark: str) -> np.ndarray:
+        """Each column's beta against the benchmark column, over the rows both have"""
+        b = self.index[benchmark]
+        n, cross, square = self._centered()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # square[b, i] is the benchmark's variance over the rows shared with i
+            return cross[:, b] / square[b, :]
+
+def cluster(corr: np.ndarray, min_corr: float) -> np.ndarray:
+    """Average-linkage clusters of names whose mutual correlation averages at least min_corr.
+
+    Returns a label per row, 0 for the largest cluster. Each merge is a
+    vectorized row/column update of the distance matrix (Lance-Williams),
+    so hundreds of names cluster without per-pair Python loops.
+    """
+    n = len(corr)
+    distance = 1.0 - np.where(np.isnan(corr), -1.0, corr)
+    np.fill_diagonal(distance, np.inf)
+    sizes = np.ones(n)
+    labels = np.arange(n)
+    limit = 1.0 - min_corr
+    for _ in range(n - 1):
+        i, j = np.unravel_index(np.argmin(distance), distance.shape)
+        if distance[i, j] > limit:
+            break
+        merged = (distance[i] * sizes[i] + distance[j] * sizes[j]) / (sizes[i] + sizes[j])
+        distance[i, :] = merged
+        distance[:, i] = merged
+        distance[i, i] = np.inf
+        distance[j, :] = np.inf
+        distance[:, j] = np.inf
+        sizes[i] += sizes[j]
+        labels[labels == j] = i
+    roots, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    rank = np.empty(len(roots), dtype=int)
+    rank[np.argsort(-counts, kind='stable')] = np.arange(len(roots))
+    return rank[inverse]
+
+def members(labels: np.ndarray, columns: List[str], label: int) -> List[str]:
+    return [columns[i] for i in np.flatnonzero(labels == label)]
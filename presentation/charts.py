@@ -0,0 +1,43 @@
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from connectors.indicators import add_indicators
+from presentation.downsample import downsample_line, downsample_ohlc
+
+def indicator_chart(ticker: str, history: pd.DataFrame, max_points: int = 400) -> go.Figure:
+    """Candles with SMA/Bollinger overlays, volume, RSI and MACD panels.
+
+    Indicators are computed on the full history first; only what is sent to
+    the browser is downsampled (OHLC bars merged, indicator lines by LTTB).
+    """
+    df = add_indicators(history)
+    candles = downsample_ohlc(df, max_points)
+    line = lambda column: downsample_line(df[column].dropna(), max_points)
+
+    fig = make_subplots(rows=4, cols=1, shared_xaxes=True, vertical_spacing=0.03,
+                        row_heights=[0.55, 0.15, 0.15, 0.15])
+    fig.add_trace(go.Candlestick(x=candles.index, open=candles['Open'], high=candles['High'],
+                                 low=candles['Low'], close=candles['Close'], name=ticker), row=1, col=1)
+    for column, color in (('SMA20', '#1a73e8'), ('SMA50', '#f9ab00')):
+        series = line(column)
+        fig.add_trace(go.Scatter(x=series.index, y=series, name=column, line=dict(width=1.2, color=color)), row=1, col=1)
+    for column in ('BB_Upper', 'BB_Lower'):
+        series = line(column)
+        fig.add_trace(go.Scatter(x=series.index, y=series, name=column, line=dict(width=0.8, dash='dot', color='#999')), row=1, col=1)
+
+    fig.add_trace(go.Bar(x=candles.index, y=candles['Volume'], name='Volume', marker_color='#9aa0a6'), row=2, col=1)
+
+    rsi = line('RSI')
+    fig.add_trace(go.Scatter(x=rsi.index, y=rsi, name='RSI', line=dict(width=1, color='#8e24aa')), row=3, col=1)
+    for level in (30, 70):
+        fig.add_hline(y=level, line=dict(width=0.6, dash='dash', color='#bbb'), row=3, col=1)
+
+    hist = line('MACD_Hist')
+    macd_line, signal = line('MACD'), line('MACD_Signal')
+    fig.add_trace(go.Bar(x=hist.index, y=hist, name='MACD Hist', marker_color='#cfd8dc'), row=4, col=1)
+    fig.add_trace(go.Scatter(x=macd_line.index, y=macd_line, name='MACD', line=dict(width=1, color='#1a73e8')), row=4, col=1)
+    fig.add_trace(go.Scatter(x=signal.index, y=signal, name='Signal', line=dict(width=1, color='#d93025')), row=4, col=1)
+
+    fig.update_layout(height=760, margin=dict(l=10, r=10, t=30, b=10), xaxis_rangeslider_visible=False,
+                      showlegend=False, title=f"{ticker} ({len(history)} bars, {len(candles)} drawn)")
+    return fig
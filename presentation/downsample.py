@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out points that keep the visual shape of y.
+
+    x is taken as the sample position, which is what a bar-indexed price
+    series needs. The first and last points are always kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+    x = np.arange(n, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = np.nanmean(y[next_start:next_end]) if next_end > next_start else y[-1]
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev]) - (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        selected[i + 1] = prev
+    return selected
+
+def downsample_line(series: pd.Series, max_points: int) -> pd.Series:
+    if len(series) <= max_points:
+        return series
+    return series.iloc[lttb_indices(series.to_numpy(), max_points)]
+
+def downsample_ohlc(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """Merge consecutive bars into at most max_points candles (first open, max high, min low, last close, summed volume)"""
+    if len(df) <= max_points:
+        return df
+    groups = np.arange(len(df)) * max_points // len(df)
+    grouped = df.groupby(groups)
+    out = pd.DataFrame({
+        'Open': grouped['Open'].first(),
+        'High': grouped['High'].max(),
+        'Low': grouped['Low'].min(),
+        'Close': grouped['Close'].last(),
+        'Volume': grouped['Volume'].sum(),
+    })
+    out.index = df.index[np.flatnonzero(np.diff(groups, prepend=-1))]  # each candle starts at its first bar
+    return out
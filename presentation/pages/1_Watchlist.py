@@ -0,0 +1,46 @@
+import streamlit as st
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from presentation.resources import get_histories, watchlist_snapshot
+from presentation.charts import indicator_chart
+
+st.set_page_config(page_title="Watchlist - 4-Agent Stock AI", page_icon="📋", layout="wide")
+st.markdown('<p style="font-size: 2rem; color: #1a73e8; font-weight: bold;">📋 Watchlist</p>', unsafe_allow_html=True)
+
+DEFAULT_WATCHLIST = "AAPL, MSFT, GOOGL, TSLA, NVDA, LLOY.L, BARC.L, HSBA.L"
+
+with st.sidebar:
+    st.title("⚙️ Watchlist")
+    watchlist_text = st.text_area("Tickers (comma or newline separated)", value=DEFAULT_WATCHLIST, height=150)
+    period = st.selectbox("History", ["6mo", "1y", "2y", "5y", "10y"], index=1)
+    max_points = st.slider("Max points per chart", 100, 2000, 400, step=100)
+
+tickers = tuple(dict.fromkeys(t.strip().upper() for t in watchlist_text.replace("\n", ",").split(",") if t.strip()))
+if not tickers:
+    st.info("Add some tickers in the sidebar.")
+    st.stop()
+
+with st.spinner(f"Loading {len(tickers)} tickers..."):
+    table = watchlist_snapshot(tickers, period)
+
+if table.empty:
+    st.error("❌ No data for these tickers.")
+    st.stop()
+
+missing = sorted(set(tickers) - set(table['Ticker']))
+if missing:
+    st.warning(f"No usable history for: {', '.join(missing)}")
+
+st.dataframe(table, hide_index=True, use_container_width=True,
+             column_config={'RSI': st.column_config.ProgressColumn('RSI', min_value=0, max_value=100, format="%.1f")})
+
+selected = st.selectbox("Chart", list(table['Ticker']))
+history = get_histories((selected,), period).get(selected)
+if history is not None:
+    st.plotly_chart(indicator_chart(selected, history, max_points), use_container_width=True)
+
+st.divider()
+st.markdown("<div style='text-align: center; color: #666;'>⚠️ Not financial advice | Data delayed ~15 min</div>", unsafe_allow_html=True)
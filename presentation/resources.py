@@ -0,0 +1,162 @@
+import streamlit as st
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from interfaces.agent import IAgent
+from interfaces.data_provider import IDataProvider, PriceData, TechnicalData, NewsItem
+from core.worker import AnalysisWorker
+
+# Long-lived objects shared by every session (st.cache_resource) and
+# short-lived market data shared by every session (st.cache_data with TTL).
+
+@st.cache_resource
+def get_worker() -> AnalysisWorker:
+    return AnalysisWorker('streamlit-analysis')
+
+@st.cache_resource
+def get_llm_client():
+    # Only ever used on the worker loop, so one client (and connection pool) serves all sessions
+    from core.llm import create_client
+    return create_client()
+
+@st.cache_resource
+def get_connectors() -> Dict[str, IDataProvider]:
+    from core import registry
+    return {name: CachedProvider(registry.connectors.create(name)) for name in ('yahoo', 'google', 'news')}
+
+@st.cache_resource
+def get_agents() -> Dict[str, IAgent]:
+    from core import registry
+    client = get_llm_client()
+    agents = {}
+    for name in registry.agents.names():
+        agent = registry.agents.create(name)
+        agent.client = client
+        agents[agent.name] = agent
+    return agents
+
+@st.cache_resource
+def get_output_sink():
+    if not Config.OUTPUT_SINK:
+        return None
+    from outputs.sinks import create_sink
+    sink = create_sink(Config.OUTPUT_SINK)
+    return sink if sink.initialize() else None
+
+@st.cache_resource
+def get_change_gate():
+    # Shared by every pipeline so re-analysing an unchanged ticker reuses the stored agent outputs
+    if not Config.CHANGE_GATE:
+        return None
+    from pipelines.change_gate import ChangeGate
+    return ChangeGate()
+
+@st.cache_resource
+def get_portfolio():
+    # One rolling correlation window over the watchlist, updated in place as new daily bars arrive
+    if not (Config.PORTFOLIO_CONTEXT and Config.WATCHLIST):
+        return None
+    from portfolio import PortfolioContext
+    return PortfolioContext(Config.WATCHLIST, get_connectors()['yahoo'].provider.get_histories)
+
+DATA_SOURCES = {
+    "Yahoo Finance": ('yahoo', 'news'),
+    "Google Finance": ('google', 'news'),
+    "Both (Auto-Fallback)": ('yahoo', 'google', 'news'),
+}
+
+@st.cache_resource
+def get_pipeline(data_source: str, agent_names: Tuple[str, ...]):
+    from pipelines.full_analysis import FullAnalysisPipeline
+    connectors = get_connectors()
+    agents = get_agents()
+    return FullAnalysisPipeline(
+        [connectors[key] for key in DATA_SOURCES[data_source]],
+        [agents[name] for name in agent_names],
+        get_output_sink(),
+        get_change_gate(),
+        portfolio=get_portfolio()
+    )
+
+# Failures raise inside the cached functions so they are not cached
+
+@st.cache_data(ttl=Config.TECHNICALS_CACHE_TTL, show_spinner=False)
+def _cached_price(provider_name: str, ticker: str, _provider: IDataProvider) -> PriceData:
+    data = _provider.get_price(ticker)
+    if data is None:
+        raise LookupError(f"No price for {ticker}")
+    return data
+
+@st.cache_data(ttl=Config.TECHNICALS_CACHE_TTL, show_spinner=False)
+def _cached_technicals(provider_name: str, ticker: str, _provider: IDataProvider) -> TechnicalData:
+    data = _provider.get_technicals(ticker)
+    if data is None:
+        raise LookupError(f"No technicals for {ticker}")
+    return data
+
+@st.cache_data(ttl=Config.NEWS_CACHE_TTL, show_spinner=False)
+def _cached_news(provider_name: str, ticker: str, max_items: int, _provider: IDataProvider) -> List[NewsItem]:
+    data = _provider.get_news(ticker, max_items=max_items)
+    if not data:
+        raise LookupError(f"No news for {ticker}")
+    return data
+
+def get_histories(tickers: Tuple[str, ...], period: str) -> Dict[str, pd.DataFrame]:
+    """OHLCV per ticker from the shared YahooConnector history cache (one batched download for misses)"""
+    return get_connectors()['yahoo'].provider.get_histories(list(tickers), period=period)
+
+@st.cache_data(ttl=Config.HISTORY_CACHE_TTL, show_spinner=False)
+def watchlist_snapshot(tickers: Tuple[str, ...], period: str) -> pd.DataFrame:
+    """One row of indicator values per ticker, for the sortable watchlist table"""
+    from connectors.yahoo import technicals_from_history, currency_for
+    rows = []
+    for ticker, history in get_histories(tickers, period).items():
+        if len(history) < 50:
+            continue
+        tech = technicals_from_history(ticker, history, currency_for(ticker))
+        prev_close = float(history['Close'].iloc[-2])
+        rows.append({
+            'Ticker': ticker,
+            'Price': round(tech.current, 2),
+            'Change %': round((float(history['Close'].iloc[-1]) / prev_close - 1) * 100, 2) if prev_close else None,
+            'Trend': tech.trend,
+            'RSI': round(tech.rsi, 1),
+            'Stoch RSI': round(tech.stoch_rsi, 1),
+            'MACD Hist': round(tech.macd_histogram, 3),
+            'BB Width %': round(tech.bb_width, 1),
+            'vs SMA50 %': round((tech.current / tech.sma50 - 1) * 100, 2),
+            'ATR %': round(tech.atr / tech.current * 100, 2),
+            'Volume / Avg': round(tech.volume / tech.volume_sma20, 2) if tech.volume_sma20 else None,
+        })
+    return pd.DataFrame(rows)
+
+class CachedProvider(IDataProvider):
+    """Serves a provider's results from the shared Streamlit data cache"""
+
+    def __init__(self, provider: IDataProvider):
+        self.provider = provider
+
+    @property
+    def name(self) -> str:
+        return self.provider.__class__.__name__
+
+    def is_available(self) -> bool:
+        return self.provider.is_available()
+
+    def get_price(self, ticker: str) -> Optional[PriceData]:
+        try:
+            return _cached_price(self.name, ticker, self.provider)
+        except LookupError:
+            return None
+
+    def get_technicals(self, ticker: str) -> Optional[TechnicalData]:
+        try:
+            return _cached_technicals(self.name, ticker, self.provider)
+        except LookupError:
+            return None
+
+    def get_news(self, ticker: str, max_items: int = 5) -> List[NewsItem]:
+        try:
+            return _cached_news(self.name, ticker, max_items, self.provider)
+        except LookupError:
+            return []
@@ -1,22 +1,25 @@
 import streamlit as st
-import asyncio
 import os
 import sys
-from datetime import datetime
+import time
 
 # Add project root to path so imports work
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from presentation.resources import get_worker, get_pipeline, DATA_SOURCES
+from core import symbols
+
 st.set_page_config(page_title="4-Agent Stock AI", page_icon="📊", layout="wide")
 
 st.markdown('<p style="font-size: 2.5rem; color: #1a73e8; font-weight: bold;">📈 4-Agent Stock AI</p>', unsafe_allow_html=True)
 
-if 'analysis_result' not in st.session_state:
-    st.session_state.analysis_result = None
+for key in ('analysis_result', 'result_params', 'job', 'job_params', 'job_error'):
+    if key not in st.session_state:
+        st.session_state[key] = None
 
 with st.sidebar:
     st.title("⚙️ Settings")
-    data_source = st.selectbox("Data Source", ["Yahoo Finance", "Google Finance", "Both (Auto-Fallback)"])
+    data_source = st.selectbox("Data Source", list(DATA_SOURCES))
     use_chart = st.checkbox("ChartMaster", value=True)
     use_news = st.checkbox("NewsHound", value=True)
     use_signal = st.checkbox("SignalPro", value=True)
@@ -32,66 +35,73 @@ with col2:
 st.markdown("### ⚡ Quick Select")
 cols = st.columns(6)
 quick_tickers = ["AAPL", "MSFT", "GOOGL", "TSLA", "NVDA", "LLOY.L"]
+quick_pick = None
 for i, col in enumerate(cols):
     with col:
         if st.button(quick_tickers[i], use_container_width=True):
-            ticker = quick_tickers[i]
-
-async def run_analysis_async(ticker, question, data_source, use_chart, use_news, use_signal, use_director):
-    """Async function to run analysis"""
-    from connectors.yahoo import YahooConnector
-    from connectors.google_finance import GoogleFinanceConnector
-    from connectors.news import NewsConnector
-    from agents.chart_master import ChartMaster
-    from agents.news_hound import NewsHound
-    from agents.signal_pro import SignalPro
-    from agents.director import Director
-    from pipelines.full_analysis import FullAnalysisPipeline
-    
-    # Setup data providers
-    if data_source == "Yahoo Finance":
-        data_providers = [YahooConnector(), NewsConnector()]
-    elif data_source == "Google Finance":
-        data_providers = [GoogleFinanceConnector(), NewsConnector()]
+            quick_pick = quick_tickers[i]
+
+# Autocomplete: prefix matches on ticker, company name or alias from the local symbol directory
+matches = [] if symbols.lookup(ticker) else symbols.search(ticker, limit=6)
+if matches:
+    st.caption("Did you mean:")
+    for col, match in zip(st.columns(6), matches):
+        with col:
+            if st.button(match.ticker, key=f"match_{match.ticker}", help=f"{match.name} ({match.exchange})",
+                         use_container_width=True):
+                quick_pick = match.ticker
+
+def start_analysis(ticker, question, data_source, use_chart, use_news, use_signal, use_director):
+    """Hand the run to the shared background worker; the page polls for the result"""
+    agent_names = tuple(name for name, used in (
+        ("ChartMaster", use_chart), ("NewsHound", use_news), ("SignalPro", use_signal), ("Director", use_director)
+    ) if used)
+    pipeline = get_pipeline(data_source, agent_names)
+    st.session_state.job = get_worker().submit(pipeline.run(ticker, question))
+    st.session_state.job_params = {'ticker': ticker, 'data_source': data_source, 'started': time.monotonic()}
+    st.session_state.job_error = None
+
+requested = quick_pick or (ticker if analyze_btn else None)
+if requested:
+    if st.session_state.job is not None and not st.session_state.job.done():
+        st.warning(f"⏳ Still analysing {st.session_state.job_params['ticker']} - please wait for it to finish.")
     else:
-        data_providers = [YahooConnector(), GoogleFinanceConnector(), NewsConnector()]
-    
-    # Setup agents
-    agents = []
-    if use_chart: agents.append(ChartMaster())
-    if use_news: agents.append(NewsHound())
-    if use_signal: agents.append(SignalPro())
-    if use_director: agents.append(Director())
-    
-    # Run pipeline
-    pipeline = FullAnalysisPipeline(data_providers, agents, None)
-    return await pipeline.run(ticker, question)
-
-def run_analysis(ticker, question, data_source, use_chart, use_news, use_signal, use_director):
-    """Wrapper to run async code"""
-    return asyncio.run(run_analysis_async(ticker, question, data_source, use_chart, use_news, use_signal, use_director))
-
-if analyze_btn:
-    with st.spinner('🤖 Running analysis... This may take 30-60 seconds.'):
-        try:
-            # Run analysis
-            result = run_analysis(ticker, question, data_source, use_chart, use_news, use_signal, use_director)
-            st.session_state.analysis_result = result
-            
-        except Exception as e:
-            st.error(f"❌ Error: {str(e)}")
-            import traceback
-            st.code(traceback.format_exc())
+        start_analysis(requested, question, data_source, use_chart, use_news, use_signal, use_director)
+
+@st.fragment(run_every=1.0)
+def job_status():
+    job = st.session_state.job
+    if job is None:
+        return
+    params = st.session_state.job_params
+    if not job.done():
+        st.info(f"🤖 Analysing {params['ticker']}... {time.monotonic() - params['started']:.0f}s (usually 30-60 seconds)")
+        return
+    try:
+        st.session_state.analysis_result = job.result()
+        st.session_state.result_params = params
+    except Exception as e:
+        st.session_state.job_error = str(e)
+    st.session_state.job = None
+    st.rerun()
+
+job_status()
+
+if st.session_state.job_error:
+    st.error(f"❌ Error: {st.session_state.job_error}")
 
 if st.session_state.analysis_result:
     result = st.session_state.analysis_result
+    params = st.session_state.result_params
     if result.success:
         st.success("✅ Analysis Complete!")
-        
+        if result.timed_out:
+            st.warning(f"⏱ Timed out: {', '.join(result.timed_out)} - the rest of the analysis used what finished in time")
+
         if 'Director' in result.outputs:
             st.markdown("### 🎯 Director's Recommendation")
             st.info(result.outputs['Director'].content.replace("\n", "\n\n"))
-        
+
         cols = st.columns(4)
         with cols[0]:
             st.metric("Agents Used", len(result.outputs))
@@ -99,10 +109,10 @@ if st.session_state.analysis_result:
             if 'Director' in result.outputs:
                 st.metric("Confidence", f"{result.outputs['Director'].confidence}/10")
         with cols[2]:
-            st.metric("Data Source", data_source)
+            st.metric("Data Source", params['data_source'])
         with cols[3]:
-            st.metric("Ticker", ticker)
-        
+            st.metric("Ticker", result.ticker)
+
         for agent_name, output in result.outputs.items():
             with st.expander(f"{agent_name} Analysis", expanded=False):
                 st.write(output.content)
@@ -112,4 +122,4 @@ if st.session_state.analysis_result:
         st.info("💡 **Try these:**\n- Use 'Google Finance' instead of Yahoo Finance\n- Try a different ticker (e.g., AAPL, MSFT)\n- Check your internet connection\n- Wait a few minutes and try again (rate limiting)")
 
 st.divider()
-st.markdown("<div style='text-align: center; color: #666;'>⚠️ Not financial advice | Data delayed ~15 min</div>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<div style='text-align: center; color: #666;'>⚠️ Not financial advice | Data delayed ~15 min</div>", unsafe_allow_html=True)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose
+
+from portfolio.correlation import RollingCovariance, cluster, members
+
+COLUMNS = ['A', 'B', 'C', 'D', 'SPY']
+
+def _returns(rows=200, seed=7):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, rows)
+    data = np.column_stack([market * beta + rng.normal(0, 0.01, rows) for beta in (0.5, 1.0, 1.5, 0.0)] + [market])
+    # Holidays and late listings: scattered missing bars plus a name with no early history
+    data[rng.random(data.shape) < 0.1] = np.nan
+    data[:40, 3] = np.nan
+    return data
+
+def _window(data, end, window):
+    return pd.DataFrame(data[max(0, end - window):end], columns=COLUMNS)
+
+def test_matches_pandas_over_a_rolling_window_with_gaps():
+    data, window = _returns(), 30
+    stats = RollingCovariance(COLUMNS, window)
+    for end in range(1, len(data) + 1):
+        stats.update(data[end - 1])
+        if end in (2, 10, 30, 31, 45, 120, 200):
+            frame = _window(data, end, window)
+            assert_allclose(stats.covariance(), frame.cov().to_numpy(), atol=1e-12, equal_nan=True)
+            expected = frame.corr().to_numpy().copy()
+            np.fill_diagonal(expected, 1.0)
+            assert_allclose(stats.correlation(), expected, atol=1e-12, equal_nan=True)
+
+def test_matches_pandas_across_resync_boundaries():
+    data, window = _returns(rows=300, seed=11), 25
+    stats = RollingCovariance(COLUMNS, window, resync_every=7)
+    drifting = RollingCovariance(COLUMNS, window, resync_every=10 ** 9)
+    stats.extend(data)
+    drifting.extend(data)
+    frame = _window(data, len(data), window)
+    assert_allclose(stats.covariance(), frame.cov().to_numpy(), atol=1e-12, equal_nan=True)
+    assert_allclose(stats.covariance(), drifting.covariance(), atol=1e-12, equal_nan=True)
+    assert stats.bars == window
+
+def test_beta_uses_the_rows_both_names_have():
+    data, window = _returns(), 60
+    stats = RollingCovariance(COLUMNS, window)
+    stats.extend(data)
+    frame = _window(data, len(data), window)
+    for column in COLUMNS[:-1]:
+        both = frame[[column, 'SPY']].dropna()
+        expected = both[column].cov(both['SPY']) / both['SPY'].var()
+        assert_allclose(stats.beta('SPY')[stats.index[column]], expected, atol=1e-12)
+
+def test_cluster_groups_correlated_blocks():
+    rng = np.random.default_rng(3)
+    banks, miners = rng.normal(size=(2, 250))
+    data = np.column_stack([banks + rng.normal(0, 0.3, 250) for _ in range(3)] +
+                           [miners + rng.normal(0, 0.3, 250) for _ in range(2)] +
+                           [rng.normal(size=250)])
+    columns = ['HSBA', 'LLOY', 'BARC', 'RIO', 'AAL', 'TSCO']
+    labels = cluster(np.corrcoef(data, rowvar=False), min_corr=0.6)
+    assert members(labels, columns, 0) == ['HSBA', 'LLOY', 'BARC']
+    assert members(labels, columns, 1) == ['RIO', 'AAL']
+    assert members(labels, columns, 2) == ['TSCO']
@@ -0,0 +1,65 @@
+import time
+
+from outputs.google_sheets import GoogleSheetsOutput, LocalSheetBackend, QuotaExceeded
+
+class _TimedBackend(LocalSheetBackend):
+    """LocalSheetBackend that remembers when each range update arrived, optionally refusing some with 429"""
+
+    def __init__(self, quota_errors=0):
+        super().__init__()
+        self.calls = []
+        self.quota_errors = quota_errors
+
+    def update(self, range_a1, values):
+        self.calls.append((time.monotonic(), range_a1, len(values)))
+        if self.quota_errors:
+            self.quota_errors -= 1
+            raise QuotaExceeded("429 RESOURCE_EXHAUSTED")
+        super().update(range_a1, values)
+
+def _record(i):
+    return {'timestamp': '2024-01-01T00:00:00', 'recommendation': 'Hold', 'confidence': 5, 'question': 'q',
+            'outputs': [{'agent_name': 'Director', 'content': f"Answer: Hold {i}"}]}
+
+def _sink(backend, **kwargs):
+    return GoogleSheetsOutput(backend, writes_per_minute=600, batch_size=10, flush_interval=60, **kwargs)
+
+def test_one_range_update_per_flush():
+    backend = _TimedBackend()
+    sink = _sink(backend)
+    assert sink.initialize()
+    for i in range(25):
+        assert sink.write(f"T{i}", _record(i))
+    sink.close()
+
+    # Header, then batches of 10, 10 and the 5 left at close, each a single contiguous range
+    assert [(r, n) for _, r, n in backend.calls] == [('A1:J1', 1), ('A2:J11', 10), ('A12:J21', 10), ('A22:J26', 5)]
+    assert backend.update_calls == 4
+    assert len(backend.rows) == 26
+    assert [row[1] for row in backend.rows[1:]] == [f"T{i}" for i in range(25)]
+    assert backend.rows[25][7] == "Hold 24"
+
+def test_writes_are_paced_under_the_quota():
+    backend = _TimedBackend()
+    sink = _sink(backend)
+    sink.initialize()
+    for i in range(30):
+        sink.write(f"T{i}", _record(i))
+    sink.close()
+    gaps = [b[0] - a[0] for a, b in zip(backend.calls, backend.calls[1:])]
+    # 600 writes per minute is one every 0.1 s
+    assert len(gaps) == 3
+    assert min(gaps) >= 0.099
+
+def test_quota_errors_are_retried_with_the_same_range():
+    backend = _TimedBackend()
+    sink = _sink(backend)
+    sink.retry_delay = 0.01
+    sink.initialize()
+    backend.quota_errors = 2
+    for i in range(10):
+        sink.write(f"T{i}", _record(i))
+    sink.close()
+    assert [r for _, r, _ in backend.calls[1:]] == ['A2:J11'] * 3
+    assert sink.written == 10
+    assert len(backend.rows) == 11
@@ -0,0 +1,37 @@
+import pytest
+
+from connectors.health import CLOSED, OPEN, MonitoredProvider
+from interfaces.data_provider import IDataProvider
+
+class _Provider(IDataProvider):
+    def __init__(self, fail):
+        self.fail = fail
+
+    def is_available(self):
+        return True
+
+    def get_price(self, ticker):
+        return None
+
+    def get_technicals(self, ticker):
+        return None
+
+    def get_news(self, ticker, max_items=5):
+        if self.fail:
+            raise ConnectionError("feed down")
+        return []
+
+def test_empty_answers_do_not_open_the_breaker():
+    provider = MonitoredProvider(_Provider(fail=False), failure_threshold=3)
+    for i in range(10):
+        assert provider.get_news(f"QUIET{i}") == []
+        assert provider.get_technicals(f"QUIET{i}") is None
+    assert provider.health['news'].state == CLOSED
+    assert provider.health['technicals'].state == CLOSED
+
+def test_errors_open_the_breaker():
+    provider = MonitoredProvider(_Provider(fail=True), failure_threshold=3)
+    for i in range(3):
+        with pytest.raises(ConnectionError):
+            provider.get_news(f"T{i}")
+    assert provider.health['news'].state == OPEN
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from jobs.queue import JobQueue
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Claims every job it can, then exits; with CRASH it dies holding its first lease
+_CLAIMER = """
+import os, sys
+from jobs.queue import JobQueue
+queue = JobQueue(sys.argv[1], lease_seconds=float(sys.argv[3]))
+while True:
+    job = queue.claim(sys.argv[2])
+    if job is None:
+        break
+    print(job.id, flush=True)
+    if os.environ.get('CRASH'):
+        os._exit(1)
+    queue.complete(job.id, sys.argv[2], {'ticker': job.ticker})
+"""
+
+def _claimer(path, worker, lease=60.0, crash=False):
+    env = {**os.environ, **({'CRASH': '1'} if crash else {})}
+    return subprocess.Popen([sys.executable, '-c', _CLAIMER, path, worker, str(lease)],
+                            cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'jobs.db')
+
+def test_processes_never_claim_the_same_job(path):
+    queue = JobQueue(path)
+    queue.enqueue([f"T{i}" for i in range(60)], batch='b')
+    workers = [_claimer(path, f"w{i}") for i in range(3)]
+    claimed = [int(line) for worker in workers for line in worker.communicate(timeout=60)[0].split()]
+    assert sorted(claimed) == list(range(1, 61))
+    assert queue.counts('b')['done'] == 60
+
+def test_job_of_a_crashed_worker_is_reclaimed_after_its_lease(path):
+    queue = JobQueue(path, lease_seconds=0.3)
+    queue.enqueue(['AAPL'])
+    crashed = _claimer(path, 'crashed', lease=0.3, crash=True)
+    assert crashed.communicate(timeout=60)[0].split() == ['1']
+    assert queue.claim('other') is None
+    time.sleep(0.4)
+    job = queue.claim('other')
+    assert (job.id, job.attempts) == (1, 2)
+    # The dead worker's late result is refused
+    assert not queue.heartbeat(1, 'crashed')
+    assert not queue.complete(1, 'crashed', {})
+    assert queue.complete(1, 'other', {'ticker': 'AAPL'})
+
+def test_failed_attempts_back_off_until_exhausted(path):
+    queue = JobQueue(path, retry_delay=0.2)
+    other = JobQueue(path, retry_delay=0.2)
+    queue.enqueue(['AAPL'], max_attempts=2)
+    job = queue.claim('w1')
+    assert queue.fail(job.id, 'w1', 'HTTP 429')
+    # Queued again, but not before the backoff has passed
+    assert other.counts()['queued'] == 1
+    assert other.claim('w2') is None
+    time.sleep(0.25)
+    job = other.claim('w2')
+    assert job.attempts == 2
+    assert other.fail(job.id, 'w2', 'HTTP 429')
+    assert queue.counts()['failed'] == 1
+    assert queue.claim('w1') is None
+
+def test_backoff_doubles_with_each_attempt(path):
+    queue = JobQueue(path, retry_delay=10)
+    queue.enqueue(['AAPL'], max_attempts=5)
+    delays = []
+    for attempt in range(3):
+        queue._conn.execute("UPDATE jobs SET not_before = NULL")
+        job = queue.claim('w')
+        before = time.time()
+        queue.fail(job.id, 'w', 'boom')
+        not_before = queue._conn.execute("SELECT not_before FROM jobs").fetchone()[0]
+        delays.append(round(not_before - before))
+    assert delays == [10, 20, 40]
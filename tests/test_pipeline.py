@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from agents.chart_master import ChartMaster
+from agents.director import Director
+from agents.news_hound import NewsHound
+from agents.signal_pro import SignalPro
+from interfaces.data_provider import IDataProvider, NewsItem, TechnicalData
+from pipelines.full_analysis import FullAnalysisPipeline
+
+class _Provider(IDataProvider):
+    name = 'stub'
+
+    def is_available(self):
+        return True
+
+    def get_price(self, ticker):
+        return None
+
+    def get_technicals(self, ticker):
+        return TechnicalData(ticker=ticker, current=100.0, sma20=98.0, sma50=95.0, rsi=55.0, trend='Bullish',
+                             support=96.0, resistance=104.0, currency='USD', symbol='$')
+
+    def get_news(self, ticker, max_items=5):
+        return [NewsItem(f"{ticker} beats estimates", "Reuters", "2024-01-01", "https://x/", "Bullish")]
+
+class _Client:
+    """Stand-in for AsyncGroq: canned replies per agent, and a NewsHound that never answers in time"""
+
+    def __init__(self):
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, **kwargs):
+        prompt = messages[0]['content']
+        self.prompts.append(prompt)
+        if prompt.startswith('NewsHound'):
+            await asyncio.sleep(30)
+        reply = ("[SUMMARY] chart reply from stub\n[CONFIDENCE] 7" if prompt.startswith('ChartMaster') else
+                 "[SUMMARY] signal reply from stub\nConfidence: 6" if prompt.startswith('SignalPro') else
+                 "Answer: Hold - stub\nConfidence: 5/10")
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))], usage=usage)
+
+def test_director_sees_the_outputs_that_finished_in_time():
+    client = _Client()
+    agents = [ChartMaster(), NewsHound(), SignalPro(), Director()]
+    for agent in agents:
+        agent.client = client
+    pipeline = FullAnalysisPipeline([_Provider()], agents, None)
+
+    result = asyncio.run(pipeline.run('AAPL', deadline=3.0))
+
+    assert result.timed_out == ['NewsHound']
+    assert result.outputs['Director'].success
+    director_prompt = next(p for p in client.prompts if p.startswith('Director'))
+    assert 'CHARTMASTER: [SUMMARY] chart reply from stub' in director_prompt
+    assert 'SIGNALPRO: [SUMMARY] signal reply from stub' in director_prompt
+    assert 'NEWSHOUND: N/A' in director_prompt
+    signal_prompt = next(p for p in client.prompts if p.startswith('SignalPro'))
+    assert 'chart reply from stub' in signal_prompt
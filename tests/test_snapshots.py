@@ -0,0 +1,90 @@
+import os
+
+from core.snapshots import SnapshotStore
+from interfaces.agent import AgentOutput
+from interfaces.data_provider import NewsItem
+
+def _add(store, ticker, n):
+    for i in range(n):
+        store.add(ticker, news=[NewsItem(f"{ticker} headline {i}", "Reuters", "2024-01-01", "https://x/", "Neutral")],
+                  outputs=[AgentOutput("ChartMaster", f"{ticker} output {i}", 5, {'i': i}, True)])
+
+def test_save_load_save_round_trip(tmp_path):
+    directory = str(tmp_path / 'snapshots')
+    store = SnapshotStore()
+    _add(store, 'AAPL', 50)
+    store.save(directory)
+
+    # Reopened memory-mapped, grown and saved over the mapped files
+    store = SnapshotStore.open(directory)
+    _add(store, 'MSFT', 30)
+    store.save(directory)
+
+    # A table written straight back over the files it is mapped from
+    store = SnapshotStore.open(directory)
+    store.outputs.save(os.path.join(directory, 'outputs'))
+
+    store = SnapshotStore.open(directory)
+    assert len(store.outputs) == 80
+    assert store.news[0].title == "AAPL headline 0"
+    assert store.outputs.latest('MSFT').content == "MSFT output 29"
+    assert store.outputs[-1].metadata == {'i': 29}
+
+def test_save_without_new_rows_leaves_files_untouched(tmp_path):
+    directory = str(tmp_path / 'snapshots')
+    store = SnapshotStore()
+    _add(store, 'AAPL', 5)
+    store.save(directory)
+    path = os.path.join(directory, 'outputs', 'content.buffer.npy')
+    before = os.stat(path).st_mtime_ns
+
+    store = SnapshotStore.open(directory)
+    store.save(directory)
+    assert os.stat(path).st_mtime_ns == before
+    assert len(SnapshotStore.open(directory).outputs) == 5
+
+def test_stores_sharing_a_directory_keep_each_others_rows(tmp_path):
+    directory = str(tmp_path / 'snapshots')
+    store = SnapshotStore()
+    _add(store, 'AAPL', 5)
+    store.save(directory)
+
+    # Two runs open the same store, each add rows, and save one after the other
+    first, second = SnapshotStore.open(directory), SnapshotStore.open(directory)
+    _add(first, 'MSFT', 3)
+    _add(second, 'TSLA', 4)
+    first.save(directory)
+    second.save(directory)
+
+    store = SnapshotStore.open(directory)
+    assert len(store.outputs) == 12
+    assert store.outputs.latest('MSFT').content == "MSFT output 2"
+    assert store.outputs.latest('TSLA').content == "TSLA output 3"
+    assert [row.title for row in store.news.rows_for('AAPL')] == [f"AAPL headline {i}" for i in range(5)]
+    # The merged store keeps saving incrementally
+    _add(second, 'TSLA', 1)
+    second.save(directory)
+    assert len(SnapshotStore.open(directory).outputs) == 13
+
+_SAVER = """
+import sys
+sys.path.insert(0, sys.argv[3])
+from tests.test_snapshots import _add
+from core.snapshots import SnapshotStore
+for _ in range(5):
+    store = SnapshotStore.open(sys.argv[1])
+    _add(store, sys.argv[2], 2)
+    store.save(sys.argv[1])
+"""
+
+def test_concurrent_processes_do_not_lose_rows(tmp_path):
+    import subprocess, sys
+    directory = str(tmp_path / 'snapshots')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    workers = [subprocess.Popen([sys.executable, '-c', _SAVER, directory, ticker, root], cwd=root)
+               for ticker in ('AAPL', 'MSFT', 'TSLA')]
+    assert [worker.wait(timeout=120) for worker in workers] == [0, 0, 0]
+    store = SnapshotStore.open(directory)
+    assert len(store.outputs) == 30
+    assert {ticker: len(store.outputs.rows_for(ticker)) for ticker in ('AAPL', 'MSFT', 'TSLA')} == \
+        {'AAPL': 10, 'MSFT': 10, 'TSLA': 10}
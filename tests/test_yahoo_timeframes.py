@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from connectors.yahoo import YahooConnector, base_interval
+
+def _bars(freq, periods, volume):
+    index = pd.date_range('2024-01-01 14:30', periods=periods, freq=freq, tz='UTC')
+    close = np.linspace(100, 120, periods)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Adj Close': close, 'Volume': np.full(periods, volume)}, index=index)
+
+class _Connector(YahooConnector):
+    def __init__(self, timeframes):
+        super().__init__(timeframes)
+        self.requests = []
+
+    def get_histories(self, tickers, period="1y", interval="1d"):
+        self.requests.append(interval)
+        if interval == '1d':
+            return {tickers[0]: _bars('B', 500, 1_000_000.0)}
+        return {tickers[0]: _bars('h', 3000, 10.0)}
+
+def test_base_interval_is_intraday_only():
+    assert base_interval(['1d', '1wk']) is None
+    assert base_interval(['4h', '1d']) == '1h'
+    assert base_interval(['5m', '1h', '1wk']) == '5m'
+
+def test_daily_view_comes_from_daily_bars():
+    connector = _Connector(['1h', '4h', '1d', '1wk'])
+    daily = connector._multi_timeframe_technicals('AAPL', 'USD')
+    assert sorted(connector.requests) == ['1d', '1h']
+    # Yahoo's daily volume, not a sum of hourly bars
+    assert daily.volume == 1_000_000.0
+    assert list(daily.timeframes) == ['1h', '4h', '1d', '1wk']
+    assert daily.timeframes['1h'].volume == 10.0
+    assert daily.timeframes['1wk'].volume == 5_000_000.0
+
+def test_daily_only_timeframes_skip_the_intraday_download():
+    connector = _Connector(['1d', '1wk'])
+    assert connector._multi_timeframe_technicals('AAPL', 'USD') is not None
+    assert connector.requests == ['1d']